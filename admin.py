@@ -2,7 +2,9 @@ import streamlit as st
 from user_management import load_users, save_users, get_total_user_count
 import pandas as pd
 import datetime
+import json
 from collections import Counter
+from tracing import TRACE_RECORDER, timing_rows, to_otlp
 
 def is_admin():
     """Check if the current user is an admin"""
@@ -82,6 +84,10 @@ def admin_panel():
                 st.success(f"User {selected_user} deleted successfully")
                 st.rerun()
     
+    # Request timing breakdowns
+    st.markdown("---")
+    render_performance_traces()
+    
     # Return to home button
     st.markdown("---")
     if st.button("Return to Stock Search", type="primary", use_container_width=True):
@@ -89,4 +95,49 @@ def admin_panel():
         st.rerun()
     
     # Add vertical buffer at the bottom
-    st.markdown("<div style='height: 100px;'></div>", unsafe_allow_html=True)
\ No newline at end of file
+    st.markdown("<div style='height: 100px;'></div>", unsafe_allow_html=True)
+
+def render_performance_traces():
+    """Show recent request traces as timing trees, with JSON and OpenTelemetry downloads"""
+    st.header("Performance Traces")
+    
+    traces = TRACE_RECORDER.recent()
+    if not traces:
+        st.info("No traces recorded yet. Page runs and index scans are traced as they happen.")
+        return
+    
+    # Page runs far outnumber scans, so filter by request type first
+    names = sorted({trace['name'] for trace in traces})
+    selected_name = st.selectbox("Request type", names, index=names.index('scan') if 'scan' in names else 0)
+    matching = [trace for trace in traces if trace['name'] == selected_name]
+    
+    def describe(trace):
+        started = datetime.datetime.fromtimestamp(trace['start_time']).strftime('%Y-%m-%d %H:%M:%S')
+        details = ", ".join(f"{key}={value}" for key, value in trace.get('attributes', {}).items())
+        return f"{started} - {trace.get('duration_ms') or 0:.0f} ms" + (f" ({details})" if details else "")
+    
+    selected = st.selectbox("Trace", range(len(matching)), format_func=lambda i: describe(matching[i]))
+    trace = matching[selected]
+    
+    # Repeated steps (one per ticker in a scan) are merged into one row
+    st.dataframe(pd.DataFrame(timing_rows(trace)), use_container_width=True, hide_index=True)
+    if trace.get('dropped_spans'):
+        st.caption(f"{trace['dropped_spans']} spans beyond the per-trace limit are not shown")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "Download JSON",
+            data=json.dumps(trace, default=str, indent=2),
+            file_name=f"trace-{trace['trace_id']}.json",
+            mime="application/json",
+            use_container_width=True
+        )
+    with col2:
+        st.download_button(
+            "Download OpenTelemetry (OTLP/JSON)",
+            data=json.dumps(to_otlp(trace)),
+            file_name=f"trace-{trace['trace_id']}.otlp.json",
+            mime="application/json",
+            use_container_width=True
+        )
@@ -5,8 +5,11 @@ Generates personalized buy/hold/sell recommendations with authentic financial da
 
 import json
 import os
+import time
 from openai import OpenAI
-import yfinance as yf
+from info_cache import get_company_info
+from tracing import span
+from metrics import OPENAI_LATENCY, OPENAI_TOKENS
 
 # Initialize OpenAI client
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
@@ -59,9 +62,8 @@ def generate_ai_buy_analysis(ticker, analyzer, rating_components):
         AI-generated analysis text
     """
     try:
-        # Get comprehensive stock data
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        # Reuse the company info the analyzer already fetched
+        info = analyzer.get_company_info() if analyzer else get_company_info(ticker)
         
         # Get financial metrics
         current_price = analyzer.get_current_price()
@@ -141,21 +143,32 @@ Keep it conversational, data-driven, and actionable. Do not use generic language
 """
 
         # Generate AI analysis using GPT-4o
-        response = openai.chat.completions.create(
-            model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. do not change this unless explicitly requested by the user
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "You are a professional financial analyst providing precise, data-driven stock analysis. Use specific numbers and avoid generic statements."
-                },
-                {
-                    "role": "user", 
-                    "content": prompt
-                }
-            ],
-            max_tokens=300,
-            temperature=0.3  # Lower temperature for more consistent, factual analysis
-        )
+        with span('openai.buy_analysis', ticker=ticker, model="gpt-4o"):
+            started = time.perf_counter()
+            try:
+                response = openai.chat.completions.create(
+                    model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. do not change this unless explicitly requested by the user
+                    messages=[
+                        {
+                            "role": "system", 
+                            "content": "You are a professional financial analyst providing precise, data-driven stock analysis. Use specific numbers and avoid generic statements."
+                        },
+                        {
+                            "role": "user", 
+                            "content": prompt
+                        }
+                    ],
+                    max_tokens=300,
+                    temperature=0.3  # Lower temperature for more consistent, factual analysis
+                )
+            except Exception:
+                OPENAI_LATENCY.observe(time.perf_counter() - started, model="gpt-4o", outcome='error')
+                raise
+            OPENAI_LATENCY.observe(time.perf_counter() - started, model="gpt-4o", outcome='ok')
+        
+        if response.usage is not None:
+            OPENAI_TOKENS.inc(response.usage.prompt_tokens, model="gpt-4o", type='prompt')
+            OPENAI_TOKENS.inc(response.usage.completion_tokens, model="gpt-4o", type='completion')
         
         analysis = response.choices[0].message.content.strip()
         return analysis
@@ -164,8 +177,7 @@ Keep it conversational, data-driven, and actionable. Do not use generic language
         print(f"Error generating AI analysis for {ticker}: {str(e)}")
         # Enhanced fallback analysis with actual financial data
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = analyzer.get_company_info() if analyzer else get_company_info(ticker)
             company_name = info.get('longName', ticker)
             sector = info.get('sector', 'Unknown')
             
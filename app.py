@@ -6,10 +6,17 @@ Clean Streamlit interface without complex HTML
 import streamlit as st
 from user_management import is_authenticated, register_user, authenticate_user, get_total_user_count, logout_user, get_session_user
 from stock_analyzer import StockAnalyzer
-from power_plays import get_top_stocks
+from power_plays import get_top_stocks, leaderboard_display, scan_index
+from scan_store import ScanStore, SCAN_STORE_PATH
+from scan_scheduler import ScanScheduler, SCAN_STATUS_POLL_SECONDS
 from search_utils import search_stocks
+from remote_search import REMOTE_SEARCH, REMOTE_SEARCH_POLL_SECONDS
 from ai_analysis import generate_ai_buy_analysis, get_recommendation_color, get_recommendation_text
+from tracing import trace, span
+from metrics import start_metrics_server, record_session
 import plotly.graph_objects as go
+import time
+from datetime import datetime
 
 # Page configuration
 st.set_page_config(
@@ -193,6 +200,13 @@ def render_auth_page():
         </div>
         """, unsafe_allow_html=True)
 
+@st.fragment(run_every=REMOTE_SEARCH_POLL_SECONDS)
+def refresh_when_remote_search_done(query):
+    """Rerun the page once the background symbol search for a query finishes, so its matches show up"""
+    if not REMOTE_SEARCH.is_pending(query):
+        st.rerun()
+
+@span('render.stock_analyzer')
 def render_stock_analyzer():
     """Render Stock Analyzer section"""
     st.markdown("## 📊 Stock Analyzer")
@@ -230,7 +244,12 @@ def render_stock_analyzer():
             st.session_state.selected_ticker and 
             st.session_state.selected_ticker in search_input
         ):
-            results = search_stocks(search_input)
+            with span('search', query=search_input):
+                results = search_stocks(search_input)
+            
+            # Remote matches still on their way are shown by a rerun when they arrive
+            if REMOTE_SEARCH.is_pending(search_input):
+                refresh_when_remote_search_done(search_input)
             if results:
                 st.markdown("**Search Results:**")
                 for i, stock in enumerate(results[:3]):
@@ -255,14 +274,15 @@ def render_stock_analyzer():
     if analyze_clicked and st.session_state.selected_ticker:
         with st.spinner("Analyzing stock..."):
             try:
-                analyzer = StockAnalyzer(st.session_state.selected_ticker)
-                
-                # Get basic info
-                current_price = analyzer.get_current_price()
-                price_change = analyzer.get_price_change()
-                market_cap = analyzer.get_market_cap()
-                pe_ratio = analyzer.get_pe_ratio()
-                buy_rating, rating_breakdown = analyzer.calculate_buy_rating()
+                with span('analyze', ticker=st.session_state.selected_ticker):
+                    analyzer = StockAnalyzer(st.session_state.selected_ticker)
+                    
+                    # Get basic info
+                    current_price = analyzer.get_current_price()
+                    price_change = analyzer.get_price_change()
+                    market_cap = analyzer.get_market_cap()
+                    pe_ratio = analyzer.get_pe_ratio()
+                    buy_rating, rating_breakdown = analyzer.calculate_buy_rating()
                 
                 # Store results
                 st.session_state.analysis_results = {
@@ -284,6 +304,7 @@ def render_stock_analyzer():
     if st.session_state.analysis_results:
         render_analysis_results(st.session_state.analysis_results)
 
+@span('render.analysis_results')
 def render_analysis_results(results):
     """Render comprehensive analysis results"""
     ticker = results['ticker']
@@ -350,7 +371,7 @@ def render_analysis_results(results):
     # Rating components section
     col1, col2 = st.columns([1, 1.5])
     
-    with col1:
+    with col1, span('render.chart', chart='rating_gauge'):
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
@@ -445,7 +466,7 @@ def render_analysis_results(results):
     
     try:
         # Get additional financial data
-        info = analyzer.stock.info if analyzer else {}
+        info = analyzer.get_company_info() if analyzer else {}
         
         # First row of metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -510,6 +531,7 @@ def render_analysis_results(results):
     # Detailed Analysis Tabs
     render_detailed_analysis_tabs(ticker, analyzer)
 
+@span('render.detailed_analysis')
 def render_detailed_analysis_tabs(ticker, analyzer):
     """Render comprehensive analysis tabs"""
     tab1, tab2, tab3 = st.tabs(["📊 Sector Analysis", "📈 Historical Performance", "🔍 Upcoming Earnings"])
@@ -523,10 +545,11 @@ def render_detailed_analysis_tabs(ticker, analyzer):
     with tab3:
         render_earnings_section(ticker, analyzer)
 
+@span('render.sector_analysis')
 def render_sector_analysis(ticker, analyzer):
     """Render sector analysis section"""
     try:
-        info = analyzer.stock.info
+        info = analyzer.get_company_info()
         sector = info.get('sector', 'N/A')
         industry = info.get('industry', 'N/A')
         
@@ -545,7 +568,7 @@ def render_sector_analysis(ticker, analyzer):
                 for peer in sector_peers[:3]:  # Show top 3 peers
                     try:
                         peer_analyzer = StockAnalyzer(peer['ticker'])
-                        peer_info = peer_analyzer.stock.info
+                        peer_info = peer_analyzer.get_company_info()
                         peer_price = peer_analyzer.get_current_price()
                         peer_market_cap = peer_analyzer.get_market_cap()
                         peer_pe = peer_analyzer.get_pe_ratio()
@@ -652,6 +675,7 @@ def get_sector_peers(ticker, sector):
         # Return a mix for other sectors
         return [peer for peer in tech_peers[:3] + financial_peers[:3] if peer['ticker'] != ticker]
 
+@span('render.historical_performance')
 def render_historical_performance(ticker, analyzer):
     """Render historical performance section"""
     st.markdown("#### Select Time Period")
@@ -707,7 +731,8 @@ def render_historical_performance(ticker, analyzer):
                 hovermode='x unified'
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            with span('render.chart', chart='price_history'):
+                st.plotly_chart(fig, use_container_width=True)
             
             # Performance metrics
             st.markdown("#### Performance Metrics")
@@ -744,12 +769,13 @@ def render_historical_performance(ticker, analyzer):
 
 
 
+@span('render.earnings')
 def render_earnings_section(ticker, analyzer):
     """Render earnings section"""
     st.markdown("#### Earnings Information")
     
     try:
-        info = analyzer.stock.info
+        info = analyzer.get_company_info()
         
         # Earnings data
         earnings_date = info.get('earningsDate')
@@ -805,16 +831,49 @@ def format_market_cap(market_cap):
     else:
         return f"${market_cap:,.0f}"
 
+@st.cache_resource
+def get_scan_service():
+    """Process-wide scan store and background scheduler, shared by every session"""
+    if not SCAN_STORE_PATH:
+        return None, None
+    
+    store = ScanStore()
+    scheduler = ScanScheduler(store, lambda index_name: scan_index(index_name, store=store))
+    scheduler.start()
+    return store, scheduler
+
+def load_latest_scan(store, index_name):
+    """Latest stored scan of an index in the power_plays_results format, or None"""
+    if store is None:
+        return None
+    return store.latest_scan(index_name)
+
+@st.fragment(run_every=SCAN_STATUS_POLL_SECONDS)
+def render_scan_status(store, scheduler, index_name):
+    """Status of a background rescan, swapping in its results once the scheduler has stored them"""
+    if scheduler.is_scanning(index_name):
+        st.info(f"Scanning {index_name} in the background. The results will appear here when it finishes.")
+        return
+    
+    st.session_state.power_plays_pending = None
+    st.session_state.power_plays_results = load_latest_scan(store, index_name)
+    st.rerun()
+
+@span('render.power_plays')
 def render_power_plays():
     """Render Power Plays section"""
     st.markdown("## 🚀 Power Plays")
     st.markdown("Discover top investment opportunities from major stock indices")
     
-    # Initialize session state
-    if 'power_plays_results' not in st.session_state:
-        st.session_state.power_plays_results = None
+    store, scheduler = get_scan_service()
+    
+    # Initialize session state, starting from the latest precomputed scan
     if 'power_plays_index' not in st.session_state:
         st.session_state.power_plays_index = "Fortune 500"
+    if 'power_plays_results' not in st.session_state:
+        st.session_state.power_plays_results = load_latest_scan(store, st.session_state.power_plays_index)
+    if 'power_plays_pending' not in st.session_state:
+        st.session_state.power_plays_pending = None
     
     # Index selection
     col1, col2 = st.columns([3, 1.5])
@@ -830,21 +889,38 @@ def render_power_plays():
         
         if selected_index != st.session_state.power_plays_index:
             st.session_state.power_plays_index = selected_index
-            st.session_state.power_plays_results = None
+            st.session_state.power_plays_results = load_latest_scan(store, selected_index)
     
     with col2:
-        scan_clicked = st.button("Scan Index", type="primary", use_container_width=True)
+        scan_label = "Rescan now" if st.session_state.power_plays_results else "Scan Index"
+        scan_clicked = st.button(
+            scan_label,
+            type="primary",
+            use_container_width=True,
+            disabled=scheduler is not None and scheduler.is_scanning(selected_index)
+        )
         if st.button("Reset", use_container_width=True):
             st.session_state.power_plays_results = None
+            st.session_state.power_plays_pending = None
             st.rerun()
     
-    # Perform scanning
-    if scan_clicked:
+    # With the scheduler running, a rescan is queued on it rather than run on
+    # this page, so it never overlaps a scheduled scan of the same index
+    if scan_clicked and scheduler is not None:
+        scheduler.trigger(selected_index)
+        st.session_state.power_plays_pending = selected_index
+    
+    if scheduler is not None and st.session_state.power_plays_pending == selected_index:
+        render_scan_status(store, scheduler, selected_index)
+    
+    # Without a scan store, scan in the foreground
+    if scan_clicked and scheduler is None:
         with st.spinner(f"Scanning {selected_index} for top opportunities..."):
             try:
                 # Create progress display
                 progress_bar = st.progress(0)
                 status_text = st.empty()
+                leaderboard_placeholder = st.empty()
                 
                 def progress_callback(progress_percentage):
                     progress_bar.progress(progress_percentage)
@@ -854,17 +930,20 @@ def render_power_plays():
                 top_stocks = get_top_stocks(
                     max_stocks=5,
                     progress_callback=progress_callback,
-                    index_name=selected_index
+                    index_name=selected_index,
+                    leaderboard_callback=leaderboard_display(leaderboard_placeholder)
                 )
                 
                 st.session_state.power_plays_results = {
                     'index': selected_index,
-                    'stocks': top_stocks
+                    'stocks': top_stocks,
+                    'created_at': time.time()
                 }
                 
                 # Clear progress indicators
                 progress_bar.empty()
                 status_text.empty()
+                leaderboard_placeholder.empty()
                 
             except Exception as e:
                 st.error(f"Error scanning {selected_index}: {str(e)}")
@@ -873,6 +952,15 @@ def render_power_plays():
     if st.session_state.power_plays_results:
         render_power_plays_results(st.session_state.power_plays_results)
 
+# Indicator frames of a scan result drawn in its details: title, plotted columns and dashed reference levels
+INDICATOR_CHARTS = {
+    'moving_averages': ("Moving Averages", ['Close', 'MA20', 'MA50', 'MA200'], []),
+    'bollinger_bands': ("Bollinger Bands", ['Close', 'Upper Band', 'Middle Band', 'Lower Band'], []),
+    'rsi': ("RSI", ['RSI'], [30, 70]),
+    'macd': ("MACD", ['MACD', 'Signal'], [0]),
+}
+
+@span('render.power_plays_results')
 def render_power_plays_results(results):
     """Render Power Plays results"""
     index_name = results['index']
@@ -880,6 +968,12 @@ def render_power_plays_results(results):
     
     st.markdown(f"### Top 5 Opportunities - {index_name}")
     
+    created_at = results.get('created_at')
+    if created_at:
+        age_minutes = int((time.time() - created_at) // 60)
+        scanned = datetime.fromtimestamp(created_at).strftime('%b %d, %H:%M')
+        st.caption(f"Scanned {scanned} ({age_minutes} min ago)")
+    
     if stocks:
         for i, stock in enumerate(stocks, 1):
             ticker = stock.get('ticker', 'N/A')
@@ -909,6 +1003,34 @@ def render_power_plays_results(results):
                     </div>
                     """, unsafe_allow_html=True)
                 
+                # Details come from the scan result itself, so opening them fetches nothing
+                with st.expander(f"Details for {ticker}"):
+                    for component, data in stock.get('rating_components', {}).items():
+                        st.write(f"**{component}:** {data['score']:.1f}/10 - {data['reason']}")
+                    
+                    indicators = stock.get('indicators', {})
+                    for chart, (title, columns, levels) in INDICATOR_CHARTS.items():
+                        frame = indicators.get(chart)
+                        if frame is None or frame.empty:
+                            continue
+                        fig = go.Figure()
+                        for column in columns:
+                            fig.add_trace(go.Scatter(x=frame.index, y=frame[column], mode='lines', name=column))
+                        for level in levels:
+                            fig.add_hline(y=level, line_dash="dash", line_color="#94a3b8")
+                        fig.update_layout(
+                            title=title,
+                            height=300,
+                            margin=dict(l=20, r=20, t=40, b=20),
+                            paper_bgcolor="rgba(0,0,0,0)",
+                            plot_bgcolor="rgba(0,0,0,0)"
+                        )
+                        with span('render.chart', chart=chart):
+                            st.plotly_chart(fig, use_container_width=True)
+                    
+                    if stock.get('analysis'):
+                        st.markdown(stock['analysis'])
+                
                 st.markdown("---")
     else:
         st.info("No results found. Try scanning a different index.")
@@ -916,6 +1038,10 @@ def render_power_plays_results(results):
 def main():
     """Main application entry point"""
     
+    # Serve /metrics on the side port (once per process) and count this session as active
+    start_metrics_server()
+    record_session()
+    
     # Add global darker background styling
     st.markdown("""
     <style>
@@ -937,20 +1063,23 @@ def main():
         st.session_state.auth_action = None
         st.rerun()
     
-    # Route to appropriate interface
-    if is_authenticated():
-        # Show main application for authenticated users
-        user_data = get_session_user()
-        render_header(is_authenticated=True, user_data=user_data)
-        
-        # Main content sections
-        render_stock_analyzer()
-        st.markdown("---")
-        render_power_plays()
-        
-    else:
-        # Show authentication interface for non-authenticated users
-        render_auth_page()
+    # Route to appropriate interface; each script run is one trace
+    with trace('page') as page_span:
+        if is_authenticated():
+            # Show main application for authenticated users
+            page_span.set_attribute('page', 'main')
+            user_data = get_session_user()
+            render_header(is_authenticated=True, user_data=user_data)
+            
+            # Main content sections
+            render_stock_analyzer()
+            st.markdown("---")
+            render_power_plays()
+            
+        else:
+            # Show authentication interface for non-authenticated users
+            page_span.set_attribute('page', 'auth')
+            render_auth_page()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,425 @@
+"""
+Benchmark harness for the analysis and scan hot paths
+Runs against recorded fixtures and writes JSON results that can be compared between commits
+
+Usage:
+    python benchmark.py --generate                 # build a synthetic fixture set for the bundled index lists
+    python benchmark.py --output bench.json        # run every case
+    python benchmark.py --cases scan --repeat 5    # run cases whose name starts with 'scan'
+    python benchmark.py --compare old.json new.json
+
+Fixtures recorded from live data (TICKER_AI_DATA_BACKEND=record) work the
+same way; tickers without fixtures show up as scan errors.
+"""
+import os
+import sys
+import json
+import time
+import zlib
+import argparse
+import platform
+import resource
+import statistics
+import subprocess
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# Indices scanned by the scan cases
+BENCHMARK_INDICES = ["Fortune 500", "S&P 500", "NASDAQ 100"]
+
+# Queries timed by the search case
+SEARCH_QUERIES = ["AAPL", "apple", "micro", "bank", "NV", "tesla", "berk", "health", "energy", "z"]
+
+# TechnicalAnalysis methods timed one by one
+INDICATOR_METHODS = [
+    'get_moving_averages',
+    'get_rsi',
+    'get_macd',
+    'get_bollinger_bands',
+    'interpret_moving_averages',
+    'interpret_macd',
+    'interpret_bollinger_bands',
+    'get_technical_signals',
+    'get_signal_history',
+]
+
+# Last bar of the synthetic histories, fixed so generated fixtures are identical on every machine
+SYNTHETIC_END_DATE = "2025-12-31"
+
+def configure_environment(fixture_dir, workdir, scan_mode=None):
+    """
+    Point the app modules at the fixtures and away from every cache that outlives a run
+
+    Must run before any app module is imported, since they read their
+    configuration at import time.
+    """
+    os.makedirs(workdir, exist_ok=True)
+    os.environ["TICKER_AI_DATA_BACKEND"] = "fixture"
+    os.environ["TICKER_AI_FIXTURE_DIR"] = os.path.abspath(fixture_dir)
+    os.environ["TICKER_AI_PRICE_STORE"] = ""
+    os.environ["TICKER_AI_SCAN_STORE"] = ""
+    os.environ["TICKER_AI_LISTINGS_FILE"] = ""
+    os.environ["TICKER_AI_CONSTITUENTS_CACHE"] = os.path.abspath(os.path.join(workdir, "constituents.json"))
+    os.environ["TICKER_AI_CONSTITUENTS_TTL"] = str(10 ** 9)
+    if scan_mode:
+        os.environ["TICKER_AI_SCAN_MODE"] = scan_mode
+
+def write_constituents_cache():
+    """Serve the bundled index lists as the cached constituents, so scans never scrape"""
+    from power_plays import INDEX_SNAPSHOTS
+
+    entries = {name: {'tickers': tickers, 'fetched_at': time.time()} for name, tickers in INDEX_SNAPSHOTS.items()}
+    with open(os.environ["TICKER_AI_CONSTITUENTS_CACHE"], 'w') as f:
+        json.dump(entries, f)
+
+def benchmark_tickers():
+    """Every ticker the benchmark touches, in a stable order"""
+    from power_plays import INDEX_SNAPSHOTS
+
+    return sorted({ticker for tickers in INDEX_SNAPSHOTS.values() for ticker in tickers})
+
+def sample_tickers(count):
+    """Tickers used by the per-ticker cases"""
+    from power_plays import INDEX_SNAPSHOTS
+
+    return list(dict.fromkeys(INDEX_SNAPSHOTS["S&P 500"]))[:count]
+
+def _synthetic_backend_class():
+    """DataBackend producing deterministic pseudo-random data (defined lazily to keep imports after configuration)"""
+    import numpy as np
+    import pandas as pd
+    from data_backend import DataBackend
+
+    class SyntheticBackend(DataBackend):
+        """Seeded random-walk prices and plausible company info per ticker"""
+
+        name = 'synthetic'
+
+        def _rng(self, ticker, salt=''):
+            return np.random.default_rng(zlib.crc32(f"{ticker}{salt}".encode('utf-8')))
+
+        def history(self, ticker, **kwargs):
+            rng = self._rng(ticker)
+            index = pd.bdate_range(end=SYNTHETIC_END_DATE, periods=3 * 252, tz='America/New_York')
+            drift = rng.normal(0.0003, 0.0005)
+            close = rng.uniform(20, 500) * np.exp(np.cumsum(rng.normal(drift, 0.015, len(index))))
+            spread = np.abs(rng.normal(0, 0.01, len(index)))
+            return pd.DataFrame({
+                'Open': close * (1 + rng.normal(0, 0.005, len(index))),
+                'High': close * (1 + spread),
+                'Low': close * (1 - spread),
+                'Close': close,
+                'Volume': rng.integers(1_000_000, 50_000_000, len(index)).astype(float),
+                'Dividends': 0.0,
+                'Stock Splits': 0.0,
+            }, index=index)
+
+        def info(self, ticker):
+            rng = self._rng(ticker, 'info')
+            price = float(self.history(ticker)['Close'].iloc[-1])
+            return {
+                'symbol': ticker,
+                'shortName': f"{ticker} Corp",
+                'longName': f"{ticker} Corporation",
+                'sector': str(rng.choice(['Technology', 'Healthcare', 'Financial Services', 'Energy', 'Industrials'])),
+                'industry': 'Synthetic',
+                'marketCap': float(rng.uniform(5e9, 3e12)),
+                'trailingPE': float(rng.uniform(5, 60)),
+                'forwardPE': float(rng.uniform(5, 50)),
+                'pegRatio': float(rng.uniform(0.5, 3)),
+                'trailingEps': float(rng.uniform(0.5, 20)),
+                'totalRevenue': float(rng.uniform(1e9, 4e11)),
+                'profitMargins': float(rng.uniform(-0.1, 0.4)),
+                'revenueGrowth': float(rng.uniform(-0.2, 0.5)),
+                'debtToEquity': float(rng.uniform(0, 250)),
+                'recommendationMean': float(rng.uniform(1, 4)),
+                'dividendYield': float(rng.uniform(0, 0.05)),
+                'targetMeanPrice': price * float(rng.uniform(0.8, 1.4)),
+                'currentPrice': price,
+                'fiftyTwoWeekLow': price * 0.7,
+                'fiftyTwoWeekHigh': price * 1.2,
+            }
+
+        def news(self, ticker):
+            return [{'title': f"{ticker} earnings beat estimates", 'summary': '', 'link': '', 'publisher': 'Synthetic'}]
+
+        def search(self, query, count=10, timeout=None):
+            from search_utils import POPULAR_STOCKS
+
+            query_lower = query.lower()
+            matches = [stock for stock in POPULAR_STOCKS if query_lower in stock['name'].lower()]
+            return [{'symbol': stock['ticker'], 'shortname': stock['name']} for stock in matches[:count]]
+
+    return SyntheticBackend
+
+def generate_fixtures(directory):
+    """
+    Record a synthetic fixture set covering every bundled index ticker and search query
+
+    Returns:
+    --------
+    int
+        Number of tickers written
+    """
+    from data_backend import RecordingBackend
+
+    recorder = RecordingBackend(_synthetic_backend_class()(), directory)
+    tickers = benchmark_tickers()
+    for ticker in tickers:
+        recorder.history(ticker, period='max')
+        recorder.info(ticker)
+        recorder.news(ticker)
+    for query in SEARCH_QUERIES:
+        recorder.search(query)
+    return len(tickers)
+
+class CountingBackend:
+    """Wraps a data backend and counts the calls that reach it"""
+
+    METHODS = ('history', 'info', 'statement', 'news', 'search', 'download')
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.calls = Counter()
+
+    def __getattr__(self, name):
+        attribute = getattr(self.backend, name)
+        if name not in self.METHODS:
+            return attribute
+
+        def counted(*args, **kwargs):
+            self.calls[name] += 1
+            return attribute(*args, **kwargs)
+        return counted
+
+def _case_analyzer_init(tickers):
+    from stock_analyzer import StockAnalyzer
+
+    def run():
+        for ticker in tickers:
+            StockAnalyzer(ticker)
+    return run, len(tickers)
+
+def _case_buy_rating(tickers):
+    from stock_analyzer import StockAnalyzer
+
+    analyzers = [StockAnalyzer(ticker) for ticker in tickers]
+
+    def run():
+        for analyzer in analyzers:
+            analyzer.calculate_buy_rating()
+    return run, len(tickers)
+
+def _case_indicator(tickers, method):
+    from market_data import MarketDataProvider
+    from technical_analysis import TechnicalAnalysis
+
+    # History is loaded up front so only the indicator itself is timed
+    providers = []
+    for ticker in tickers:
+        provider = MarketDataProvider(ticker)
+        provider.get_history('1y')
+        if method == 'get_signal_history':
+            provider.get_history('max')
+        providers.append(provider)
+
+    def run():
+        for provider in providers:
+            getattr(TechnicalAnalysis(provider.ticker, provider=provider), method)()
+    return run, len(tickers)
+
+def _case_search():
+    from search_utils import search_stocks
+
+    def run():
+        for query in SEARCH_QUERIES:
+            search_stocks(query)
+    return run, len(SEARCH_QUERIES)
+
+def _case_scan(index_name):
+    from power_plays import get_top_stocks, get_authentic_index_tickers
+
+    count = len(set(get_authentic_index_tickers(index_name)))
+
+    def run():
+        return get_top_stocks(max_stocks=5, index_name=index_name)
+    return run, count
+
+def case_names():
+    """Every benchmark case, in run order"""
+    names = ['analyzer_init', 'buy_rating']
+    names += [f"indicator:{method}" for method in INDICATOR_METHODS]
+    names.append('search')
+    names += [f"scan:{index_name}" for index_name in BENCHMARK_INDICES]
+    return names
+
+def _build_case(name, tickers):
+    """Set up a case and return (timed function, number of items it processes)"""
+    if name == 'analyzer_init':
+        return _case_analyzer_init(tickers)
+    if name == 'buy_rating':
+        return _case_buy_rating(tickers)
+    if name.startswith('indicator:'):
+        return _case_indicator(tickers, name.split(':', 1)[1])
+    if name == 'search':
+        return _case_search()
+    if name.startswith('scan:'):
+        return _case_scan(name.split(':', 1)[1])
+    raise ValueError(f"Unknown benchmark case '{name}'")
+
+def run_case(name, ticker_count):
+    """
+    Run one case once in the current (fresh) process
+
+    Returns:
+    --------
+    dict
+        Wall time of the timed section, peak RSS of the process, and the
+        backend calls made inside the timed section
+    """
+    import data_backend
+    import streamlit.logger
+
+    # Scans run Streamlit calls outside a script run, which warns on every call
+    streamlit.logger.set_log_level("error")
+
+    counter = CountingBackend(data_backend.get_backend())
+    data_backend.set_backend(counter)
+
+    run, items = _build_case(name, sample_tickers(ticker_count))
+    setup_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    counter.calls.clear()
+    started = time.perf_counter()
+    result = run()
+    wall = time.perf_counter() - started
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    outcome = {
+        'wall_seconds': wall,
+        'peak_rss_mb': peak_rss * scale / 2 ** 20,
+        'setup_rss_mb': setup_rss * scale / 2 ** 20,
+        'upstream_calls': dict(counter.calls),
+        'items': items,
+    }
+    if name.startswith('scan:'):
+        outcome['top'] = [(stock['ticker'], stock['buy_rating']) for stock in result]
+    return outcome
+
+def run_benchmarks(names, repeat, ticker_count):
+    """Run each case `repeat` times, every run in its own freshly spawned process so caches start cold"""
+    context = multiprocessing.get_context('spawn')
+    results = {}
+
+    for name in names:
+        runs = []
+        for _ in range(repeat):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                runs.append(executor.submit(run_case, name, ticker_count).result())
+
+        walls = [run['wall_seconds'] for run in runs]
+        results[name] = {
+            'wall_seconds': walls,
+            'median_seconds': statistics.median(walls),
+            'min_seconds': min(walls),
+            'peak_rss_mb': max(run['peak_rss_mb'] for run in runs),
+            'setup_rss_mb': max(run['setup_rss_mb'] for run in runs),
+            'upstream_calls': runs[0]['upstream_calls'],
+            'items': runs[0]['items'],
+        }
+        if 'top' in runs[0]:
+            results[name]['top'] = runs[0]['top']
+
+        print(f"{name:40s} {results[name]['median_seconds'] * 1000:10.1f} ms  "
+              f"{results[name]['peak_rss_mb']:7.1f} MB  "
+              f"{sum(results[name]['upstream_calls'].values()):6d} calls")
+
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def compare(old_path, new_path):
+    """Print the median wall time change of every case present in both result files"""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    print(f"{'case':40s} {'old ms':>10s} {'new ms':>10s} {'change':>8s}")
+    for name, new_result in new['results'].items():
+        old_result = old['results'].get(name)
+        if old_result is None:
+            continue
+        old_ms = old_result['median_seconds'] * 1000
+        new_ms = new_result['median_seconds'] * 1000
+        change = (new_ms / old_ms - 1) * 100 if old_ms else 0
+        print(f"{name:40s} {old_ms:10.1f} {new_ms:10.1f} {change:+7.1f}%")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis and scan hot paths against recorded fixtures")
+    parser.add_argument('--fixtures', default=os.path.join('.cache', 'benchmark', 'fixtures'), help="fixture directory")
+    parser.add_argument('--workdir', default=os.path.join('.cache', 'benchmark'), help="scratch directory")
+    parser.add_argument('--generate', action='store_true', help="write a synthetic fixture set and exit")
+    parser.add_argument('--cases', nargs='*', help="run only cases whose name starts with one of these prefixes")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per case")
+    parser.add_argument('--tickers', type=int, default=50, help="tickers used by the per-ticker cases")
+    parser.add_argument('--scan-mode', help="scan engine mode for the scan cases")
+    parser.add_argument('--output', help="JSON file for the results")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="compare two result files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    configure_environment(args.fixtures, args.workdir, args.scan_mode)
+
+    if args.generate:
+        count = generate_fixtures(args.fixtures)
+        print(f"Wrote synthetic fixtures for {count} tickers to {args.fixtures}")
+        return
+
+    if not os.path.isdir(args.fixtures):
+        parser.error(f"no fixtures in {args.fixtures}; run with --generate or record some first")
+
+    write_constituents_cache()
+
+    names = case_names()
+    if args.cases:
+        names = [name for name in names if any(name.startswith(prefix) for prefix in args.cases)]
+
+    results = run_benchmarks(names, max(1, args.repeat), args.tickers)
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'fixtures': os.path.abspath(args.fixtures),
+            'repeat': args.repeat,
+            'tickers': args.tickers,
+            'scan_mode': os.environ.get("TICKER_AI_SCAN_MODE"),
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == '__main__':
+    main()
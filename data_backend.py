@@ -0,0 +1,369 @@
+"""
+Pluggable market data backends
+Yahoo Finance for live data, recorded fixtures on disk for offline scans, benchmarks and tests
+"""
+import os
+import re
+import time
+import pickle
+import hashlib
+import threading
+import requests
+import pandas as pd
+import yfinance as yf
+from price_store import PERIOD_OFFSETS
+from request_governor import get_governor, UPSTREAM_TIMEOUT
+
+# Which backend serves market data: 'yahoo', 'fixture' (replay from disk) or 'record' (Yahoo, saving every response)
+DATA_BACKEND = os.environ.get("TICKER_AI_DATA_BACKEND", "yahoo")
+
+# Directory holding recorded responses for the 'fixture' and 'record' backends
+FIXTURE_DIR = os.environ.get("TICKER_AI_FIXTURE_DIR", "fixtures")
+
+# Seconds the fixture backend waits per call, to mimic upstream latency in load tests
+FIXTURE_LATENCY = float(os.environ.get("TICKER_AI_FIXTURE_LATENCY", "0"))
+
+# Yahoo Finance symbol search endpoint
+YAHOO_SEARCH_URL = "https://query2.finance.yahoo.com/v1/finance/search"
+
+# Corporate action columns that yf.download(actions=False) leaves out
+ACTION_COLUMNS = ['Dividends', 'Stock Splits', 'Capital Gains']
+
+class FixtureMissingError(LookupError):
+    """Raised by the fixture backend when nothing was recorded for a request"""
+
+class DataBackend:
+    """
+    Interface of a market data source
+
+    Every method raises on failure. Returned objects may be shared between
+    callers and must not be modified.
+    """
+
+    name = None
+
+    def history(self, ticker, **kwargs):
+        """Daily OHLCV bars for period=... or start=..."""
+        raise NotImplementedError
+
+    def info(self, ticker):
+        """Company information dictionary"""
+        raise NotImplementedError
+
+    def statement(self, ticker, name):
+        """Financial statement or other per-ticker dataset (a yf.Ticker attribute name, e.g. 'income_stmt')"""
+        raise NotImplementedError
+
+    def news(self, ticker):
+        """List of news article dictionaries"""
+        raise NotImplementedError
+
+    def search(self, query, count=10, timeout=None):
+        """List of quote dictionaries (with 'symbol' and 'shortname') matching a query, within timeout seconds if given"""
+        raise NotImplementedError
+
+    def download(self, tickers, **kwargs):
+        """Wide OHLCV panel with (ticker, field) columns for period=... or start=..."""
+        raise NotImplementedError
+
+class YahooBackend(DataBackend):
+    """Live data from Yahoo Finance, with every call going through the 'yahoo' request governor"""
+
+    name = 'yahoo'
+
+    def __init__(self):
+        self.governor = get_governor('yahoo')
+        # Search is called on every keystroke, so its requests share pooled connections
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Mozilla/5.0'
+
+    def history(self, ticker, **kwargs):
+        return self.governor.call(yf.Ticker(ticker).history, endpoint='history', **kwargs)
+
+    def info(self, ticker):
+        return self.governor.call(lambda: yf.Ticker(ticker).info, endpoint='info')
+
+    def statement(self, ticker, name):
+        return self.governor.call(getattr, yf.Ticker(ticker), name, endpoint='statement')
+
+    def news(self, ticker):
+        return self.governor.call(lambda: yf.Ticker(ticker).news, endpoint='news')
+
+    def search(self, query, count=10, timeout=None):
+        response = self.governor.get(
+            YAHOO_SEARCH_URL,
+            endpoint='search',
+            session=self.session,
+            params={'q': query, 'quotesCount': count, 'newsCount': 0},
+            timeout=timeout or UPSTREAM_TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json().get('quotes', [])
+
+    def download(self, tickers, **kwargs):
+        """
+        Bulk history download, retrying tickers missing from the panel
+
+        yf.download catches each ticker's error (a 429 included) and leaves
+        the ticker empty instead of raising, so the governor never sees it.
+        Tickers that come back without data are downloaded again with
+        jittered backoff, up to the governor's retry count; those still
+        missing after that (e.g., delisted) are left out of the panel.
+        """
+        tickers = list(tickers)
+        panel = self._download(tickers, **kwargs)
+        for attempt in range(self.governor.retries):
+            missing = missing_tickers(panel, tickers)
+            if not missing:
+                break
+            time.sleep(self.governor.backoff_delay(attempt))
+            retried = self._download(missing, **kwargs)
+            if retried is None or retried.empty:
+                continue
+            if not isinstance(retried.columns, pd.MultiIndex):
+                retried = retried.set_axis(pd.MultiIndex.from_product([missing, retried.columns]), axis=1)
+            if panel is None or panel.empty:
+                panel = retried
+            else:
+                panel = pd.concat([panel.drop(columns=missing, level=0, errors='ignore'), retried], axis=1)
+        return panel
+
+    def _download(self, tickers, **kwargs):
+        # One token per ticker, since yfinance sends a request for each
+        return self.governor.call(
+            yf.download,
+            tickers,
+            group_by='ticker',
+            auto_adjust=True,
+            actions=False,
+            threads=True,
+            progress=False,
+            cost=len(tickers),
+            endpoint='download',
+            **kwargs
+        )
+
+def missing_tickers(panel, tickers):
+    """Tickers with no data at all in a downloaded panel"""
+    if panel is None or panel.empty:
+        return list(tickers)
+    if not isinstance(panel.columns, pd.MultiIndex):
+        # A single-ticker download with flat columns has data for that ticker
+        return []
+    present = panel.notna().any().groupby(level=0).any()
+    return [ticker for ticker in tickers if not present.get(ticker, False)]
+
+class FixtureBackend(DataBackend):
+    """
+    Replays responses recorded by RecordingBackend from a directory
+
+    Each ticker's datasets are pickled under <directory>/<TICKER>/. History
+    is stored once, as the longest range recorded, and any period or start
+    date is sliced out of it, so a fixture recorded with a one-year scan also
+    serves shorter timeframes and incremental price store updates.
+    """
+
+    name = 'fixture'
+
+    def __init__(self, directory=FIXTURE_DIR, latency=FIXTURE_LATENCY):
+        """
+        Initialize FixtureBackend
+
+        Parameters:
+        -----------
+        directory : str
+            Directory holding the recorded responses
+        latency : float
+            Seconds to sleep per call, to mimic network latency
+        """
+        self.directory = directory
+        self.latency = latency
+
+    def _path(self, ticker, dataset):
+        """Fixture file for a ticker's dataset, with characters unsafe in file names replaced"""
+        safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker.upper())
+        return os.path.join(self.directory, safe_ticker, dataset + ".pkl")
+
+    def _search_path(self, query):
+        """Fixture file for a search query, keyed by its normalized text"""
+        digest = hashlib.sha1(query.strip().lower().encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, "_search", digest + ".pkl")
+
+    def _load(self, path):
+        if self.latency:
+            time.sleep(self.latency)
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            raise FixtureMissingError(f"No fixture recorded at {path}") from None
+
+    def history(self, ticker, **kwargs):
+        return slice_history(self._load(self._path(ticker, 'history')), **kwargs)
+
+    def info(self, ticker):
+        return self._load(self._path(ticker, 'info'))
+
+    def statement(self, ticker, name):
+        return self._load(self._path(ticker, name))
+
+    def news(self, ticker):
+        return self._load(self._path(ticker, 'news'))
+
+    def search(self, query, count=10, timeout=None):
+        return self._load(self._search_path(query))[:count]
+
+    def download(self, tickers, **kwargs):
+        frames = {}
+        for ticker in tickers:
+            try:
+                data = self.history(ticker, **kwargs)
+            except FixtureMissingError:
+                # Like yf.download, a missing ticker is left out of the panel
+                continue
+            frames[ticker] = data.drop(columns=ACTION_COLUMNS, errors='ignore')
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+class RecordingBackend(FixtureBackend):
+    """
+    Serves live data from another backend and saves every response as a fixture
+
+    Point it at a directory, run the scans or pages to capture, then replay
+    the directory offline with FixtureBackend.
+    """
+
+    name = 'record'
+
+    def __init__(self, source=None, directory=FIXTURE_DIR):
+        """
+        Initialize RecordingBackend
+
+        Parameters:
+        -----------
+        source : DataBackend, optional
+            Backend serving the live data; defaults to YahooBackend
+        directory : str
+            Directory the responses are written to
+        """
+        super().__init__(directory, latency=0)
+        self.source = source if source is not None else YahooBackend()
+        self._lock = threading.Lock()
+
+    def _save(self, path, data):
+        """Write a fixture atomically"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def _record_history(self, ticker, data):
+        """Merge newly downloaded bars into the ticker's recorded history"""
+        if data is None or isinstance(data, dict) or data.empty:
+            return
+        path = self._path(ticker, 'history')
+        with self._lock:
+            try:
+                stored = FixtureBackend._load(self, path)
+            except FixtureMissingError:
+                stored = None
+            if stored is not None and not stored.empty:
+                data = pd.concat([stored, data])
+                data = data[~data.index.duplicated(keep='last')].sort_index()
+            self._save(path, data)
+
+    def history(self, ticker, **kwargs):
+        data = self.source.history(ticker, **kwargs)
+        self._record_history(ticker, data)
+        return data
+
+    def info(self, ticker):
+        data = self.source.info(ticker)
+        self._save(self._path(ticker, 'info'), data)
+        return data
+
+    def statement(self, ticker, name):
+        data = self.source.statement(ticker, name)
+        self._save(self._path(ticker, name), data)
+        return data
+
+    def news(self, ticker):
+        data = self.source.news(ticker)
+        self._save(self._path(ticker, 'news'), data)
+        return data
+
+    def search(self, query, count=10, timeout=None):
+        data = self.source.search(query, count, timeout=timeout)
+        self._save(self._search_path(query), data)
+        return data
+
+    def download(self, tickers, **kwargs):
+        panel = self.source.download(tickers, **kwargs)
+        if panel is not None and not panel.empty and isinstance(panel.columns, pd.MultiIndex):
+            for ticker in panel.columns.get_level_values(0).unique():
+                self._record_history(ticker, panel[ticker].dropna(how='all'))
+        return panel
+
+def slice_history(data, period=None, start=None, **kwargs):
+    """
+    Cut a recorded history down to a period (e.g., '1y') or a start date
+
+    Periods are measured back from the last recorded bar, so replayed
+    fixtures behave the same whenever they are run.
+    """
+    if data is None or data.empty:
+        return pd.DataFrame()
+
+    if start is not None:
+        start = pd.Timestamp(start)
+        if data.index.tz is not None and start.tz is None:
+            start = start.tz_localize(data.index.tz)
+        return data[data.index >= start]
+
+    offset = PERIOD_OFFSETS.get(period)
+    if offset is None:
+        # 'max' and unknown periods get everything recorded
+        return data
+    return data[data.index >= data.index[-1] - offset]
+
+BACKENDS = {
+    'yahoo': YahooBackend,
+    'fixture': FixtureBackend,
+    'record': RecordingBackend,
+}
+
+_BACKEND = None
+_BACKEND_LOCK = threading.Lock()
+
+def get_backend():
+    """
+    Get the process-wide data backend, created from TICKER_AI_DATA_BACKEND on first use
+
+    Returns:
+    --------
+    DataBackend
+    """
+    global _BACKEND
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            backend_class = BACKENDS.get(DATA_BACKEND)
+            if backend_class is None:
+                raise ValueError(f"Unknown data backend '{DATA_BACKEND}', expected one of {', '.join(BACKENDS)}")
+            _BACKEND = backend_class()
+        return _BACKEND
+
+def set_backend(backend):
+    """
+    Replace the process-wide data backend (e.g., with a FixtureBackend in a benchmark)
+
+    Parameters:
+    -----------
+    backend : DataBackend or None
+        New backend; None recreates the configured one on next use
+    """
+    global _BACKEND
+    with _BACKEND_LOCK:
+        _BACKEND = backend
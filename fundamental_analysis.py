@@ -1,14 +1,14 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from market_data import MarketDataProvider
 
 class FundamentalAnalysis:
     """
     Class for performing fundamental analysis on stock data
     """
     
-    def __init__(self, ticker):
+    def __init__(self, ticker, provider=None):
         """
         Initialize FundamentalAnalysis with a ticker symbol
         
@@ -16,10 +16,16 @@ class FundamentalAnalysis:
         -----------
         ticker : str
             Stock ticker symbol (e.g., 'AAPL' for Apple)
+        provider : MarketDataProvider, optional
+            Shared data provider; a new one is created if not given
         """
         self.ticker = ticker
-        self.stock = yf.Ticker(ticker)
-        self.info = self.stock.info
+        self.provider = provider if provider is not None else MarketDataProvider(ticker)
+    
+    @property
+    def info(self):
+        """Company information, shared with the other users of the provider"""
+        return self.provider.info
     
     def get_valuation_ratios(self):
         """
@@ -93,7 +99,7 @@ class FundamentalAnalysis:
         """
         try:
             # Get income statement data
-            income_stmt = self.stock.income_stmt
+            income_stmt = self.provider.get_statement('income_stmt')
             
             if income_stmt is None or isinstance(income_stmt, dict):
                 return pd.DataFrame()
@@ -127,7 +133,7 @@ class FundamentalAnalysis:
         """
         try:
             # Get balance sheet data
-            balance_sheet = self.stock.balance_sheet
+            balance_sheet = self.provider.get_statement('balance_sheet')
             
             if balance_sheet is None or isinstance(balance_sheet, dict):
                 return pd.DataFrame()
@@ -161,7 +167,7 @@ class FundamentalAnalysis:
         """
         try:
             # Get cash flow data
-            cash_flow = self.stock.cashflow
+            cash_flow = self.provider.get_statement('cashflow')
             
             if cash_flow is None or isinstance(cash_flow, dict):
                 return pd.DataFrame()
@@ -195,7 +201,7 @@ class FundamentalAnalysis:
         """
         try:
             # Get quarterly earnings data
-            earnings = self.stock.quarterly_earnings
+            earnings = self.provider.get_statement('quarterly_earnings')
             
             if earnings is None or earnings.empty:
                 return pd.DataFrame()
@@ -208,7 +214,7 @@ class FundamentalAnalysis:
                 earnings.index = quarters
             
             # Get quarterly revenue data
-            financials = self.stock.quarterly_financials
+            financials = self.provider.get_statement('quarterly_financials')
             
             if financials is None or financials.empty:
                 return earnings
@@ -241,7 +247,7 @@ class FundamentalAnalysis:
         """
         try:
             # Get recommendations
-            recommendations = self.stock.recommendations
+            recommendations = self.provider.get_statement('recommendations')
             
             # Handle cases where recommendations might be None or not a DataFrame
             if recommendations is None or not isinstance(recommendations, pd.DataFrame):
@@ -0,0 +1,265 @@
+"""
+Index constituent lists scraped from Wikipedia, cached on disk
+A list is scraped at most once per TTL; a stale cached list or the bundled snapshot covers network failures
+"""
+import os
+import json
+import time
+import threading
+import importlib.util
+import requests
+from bs4 import BeautifulSoup
+from metrics import observe_upstream, record_cache
+
+# JSON file holding the last scraped list of each index
+CONSTITUENTS_CACHE_PATH = os.environ.get("TICKER_AI_CONSTITUENTS_CACHE", os.path.join(".cache", "constituents.json"))
+
+# Seconds a scraped list is used before scraping again (constituents change rarely)
+CONSTITUENTS_TTL = int(os.environ.get("TICKER_AI_CONSTITUENTS_TTL", str(7 * 24 * 3600)))
+
+# Seconds to wait for Wikipedia before falling back
+CONSTITUENTS_TIMEOUT = float(os.environ.get("TICKER_AI_CONSTITUENTS_TIMEOUT", "10"))
+
+# Seconds to wait before scraping an index again after a failed attempt
+CONSTITUENTS_RETRY = int(os.environ.get("TICKER_AI_CONSTITUENTS_RETRY", "900"))
+
+# lxml parses the large constituent pages much faster; BeautifulSoup's parser is the fallback
+USE_LXML = importlib.util.find_spec("lxml") is not None
+
+# Other spellings of index names used around the app
+INDEX_ALIASES = {
+    'NASDAQ-100': 'NASDAQ 100',
+}
+
+# Where each index is scraped from and how its table is read
+INDEX_SOURCES = {
+    'S&P 500': {
+        'url': "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies",
+        'table_id': 'constituents',
+        'column': 0,
+        'limit': 500,
+        'min_count': 400,
+    },
+    'NASDAQ 100': {
+        'url': "https://en.wikipedia.org/wiki/NASDAQ-100",
+        'table_class': 'wikitable',
+        'all_tables': True,
+        'column': 1,
+        'max_length': 5,
+        'limit': 100,
+        'min_count': 50,
+    },
+    'Dow Jones': {
+        'url': "https://en.wikipedia.org/wiki/Dow_Jones_Industrial_Average",
+        'table_class': 'wikitable',
+        'column': 1,
+        'limit': 30,
+        'min_count': 25,
+    },
+}
+
+def canonical_index_name(index_name):
+    """Map alternative spellings (e.g., 'NASDAQ-100') to the name used for scraping and caching"""
+    return INDEX_ALIASES.get(index_name, index_name)
+
+class ConstituentResolver:
+    """
+    Resolves index names to ticker lists
+
+    A cached list younger than the TTL is returned without any network access.
+    Otherwise the Wikipedia page is scraped with a timeout; if that fails or
+    yields too few tickers, the cached list is used whatever its age, and
+    without one the caller's snapshot is returned. A failed index is not
+    scraped again until the retry delay has passed.
+    """
+
+    def __init__(self, path=CONSTITUENTS_CACHE_PATH, ttl=CONSTITUENTS_TTL, timeout=CONSTITUENTS_TIMEOUT,
+                 retry=CONSTITUENTS_RETRY):
+        """
+        Initialize ConstituentResolver
+
+        Parameters:
+        -----------
+        path : str
+            JSON cache file; an empty string keeps the cache in memory only
+        ttl : int
+            Seconds a scraped list is considered current
+        timeout : float
+            Request timeout in seconds
+        retry : int
+            Seconds between scraping attempts after a failure
+        """
+        self.path = path
+        self.ttl = ttl
+        self.timeout = timeout
+        self.retry = retry
+
+        self._lock = threading.Lock()
+        self._entries = None
+        # Index name to the time of its last failed scrape
+        self._failed_at = {}
+
+    def get(self, index_name, snapshot=None):
+        """
+        Get the constituents of an index
+
+        Parameters:
+        -----------
+        index_name : str
+            Index name (e.g., 'S&P 500', 'NASDAQ 100', 'Dow Jones')
+        snapshot : list, optional
+            Bundled list returned when nothing better is available
+
+        Returns:
+        --------
+        list
+            Ticker symbols
+        """
+        index_name = canonical_index_name(index_name)
+        source = INDEX_SOURCES.get(index_name)
+        if source is None:
+            return list(snapshot or [])
+
+        # One thread scrapes while the others wait for its result
+        with self._lock:
+            entry = self._load().get(index_name)
+            now = time.time()
+            if entry and now - entry['fetched_at'] < self.ttl:
+                record_cache('constituents', 'hit')
+                return list(entry['tickers'])
+
+            if now - self._failed_at.get(index_name, 0) >= self.retry:
+                started = time.perf_counter()
+                try:
+                    tickers = self._scrape(source)
+                except Exception as e:
+                    print(f"Error fetching {index_name} constituents: {str(e)}")
+                    tickers = []
+                observe_upstream('constituents', index_name, 'ok' if tickers else 'error', time.perf_counter() - started)
+
+                # A short list means the page layout changed; never cache it
+                if len(tickers) >= source['min_count']:
+                    self._entries[index_name] = {'tickers': tickers, 'fetched_at': now}
+                    self._failed_at.pop(index_name, None)
+                    self._save()
+                    record_cache('constituents', 'miss')
+                    return list(tickers)
+                self._failed_at[index_name] = now
+
+        if entry:
+            record_cache('constituents', 'stale')
+            return list(entry['tickers'])
+        record_cache('constituents', 'miss')
+        return list(snapshot or [])
+
+    def _scrape(self, source):
+        """Download a constituents page and read the ticker column"""
+        response = requests.get(source['url'], timeout=self.timeout, headers={'User-Agent': 'Mozilla/5.0'})
+        response.raise_for_status()
+
+        if USE_LXML:
+            rows = _table_rows_lxml(response.content, source)
+        else:
+            rows = _table_rows_bs4(response.content, source)
+
+        tickers = []
+        for cells in rows:
+            if len(cells) <= source['column']:
+                continue
+            ticker = cells[source['column']].strip()
+            if not ticker or ticker == '—':
+                continue
+            if len(ticker) > source.get('max_length', len(ticker)):
+                continue
+            tickers.append(ticker)
+
+        return tickers[:source['limit']]
+
+    def _load(self):
+        """Cached entries, read from disk on first use"""
+        if self._entries is None:
+            self._entries = {}
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r') as f:
+                        self._entries = json.load(f)
+                except Exception as e:
+                    print(f"Error reading constituents cache: {str(e)}")
+        return self._entries
+
+    def _save(self):
+        """Write the cache atomically"""
+        if not self.path:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error writing constituents cache: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+def _table_rows_lxml(content, source):
+    """Cell texts of every data row in the source's table(s), parsed with lxml"""
+    import lxml.html
+
+    document = lxml.html.fromstring(content)
+    if 'table_id' in source:
+        tables = document.xpath('//table[@id=$table_id]', table_id=source['table_id'])
+    else:
+        tables = document.xpath(
+            "//table[contains(concat(' ', normalize-space(@class), ' '), $table_class)]",
+            table_class=f" {source['table_class']} "
+        )
+    if not source.get('all_tables'):
+        tables = tables[:1]
+
+    rows = []
+    for table in tables:
+        for row in table.xpath('.//tr')[1:]:  # Skip header
+            rows.append([cell.text_content() for cell in row.xpath('.//td')])
+    return rows
+
+def _table_rows_bs4(content, source):
+    """Cell texts of every data row in the source's table(s), parsed with BeautifulSoup"""
+    soup = BeautifulSoup(content, 'html.parser')
+    if 'table_id' in source:
+        tables = soup.find_all('table', {'id': source['table_id']})
+    else:
+        tables = soup.find_all('table', {'class': source['table_class']})
+    if not source.get('all_tables'):
+        tables = tables[:1]
+
+    rows = []
+    for table in tables:
+        for row in table.find_all('tr')[1:]:  # Skip header
+            rows.append([cell.text for cell in row.find_all('td')])
+    return rows
+
+# Process-wide resolver shared by every scan and session
+CONSTITUENT_RESOLVER = ConstituentResolver()
+
+def get_index_constituents(index_name, snapshot=None):
+    """
+    Get the constituents of an index through the process-wide resolver
+
+    Parameters:
+    -----------
+    index_name : str
+        Index name
+    snapshot : list, optional
+        Bundled list used when no scraped list is available
+
+    Returns:
+    --------
+    list
+        Ticker symbols
+    """
+    return CONSTITUENT_RESOLVER.get(index_name, snapshot)
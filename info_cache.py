@@ -0,0 +1,159 @@
+"""
+Process-wide cache of company info
+Entries are served fresh for a TTL, then served stale while a background refresh runs
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from data_backend import get_backend
+from single_flight import SINGLE_FLIGHT, request_key
+from metrics import record_cache
+
+# Seconds an info dict is served without refreshing
+INFO_CACHE_TTL = int(os.environ.get("TICKER_AI_INFO_TTL", "900"))
+
+# Seconds past the TTL during which a stale entry is still served while it is refreshed
+INFO_CACHE_MAX_STALE = int(os.environ.get("TICKER_AI_INFO_MAX_STALE", "86400"))
+
+# Maximum number of tickers kept; the least recently used entries are evicted first
+INFO_CACHE_SIZE = int(os.environ.get("TICKER_AI_INFO_CACHE_SIZE", "2000"))
+
+class InfoCache:
+    """
+    Thread-safe LRU cache of company info dictionaries with stale-while-revalidate
+
+    A lookup younger than the TTL returns immediately. An older entry that is
+    still within the stale window also returns immediately and schedules one
+    background refresh for its ticker. Anything older, or missing, is fetched
+    synchronously. Returned dictionaries are shared and must not be modified.
+    """
+
+    def __init__(self, ttl=INFO_CACHE_TTL, max_stale=INFO_CACHE_MAX_STALE, max_size=INFO_CACHE_SIZE, refresh_workers=4):
+        """
+        Initialize InfoCache
+
+        Parameters:
+        -----------
+        ttl : int
+            Seconds an entry is considered fresh
+        max_stale : int
+            Seconds past the TTL during which a stale entry is served while refreshing
+        max_size : int
+            Maximum number of cached tickers
+        refresh_workers : int
+            Number of threads running background refreshes
+        """
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_size = max_size
+
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="info-refresh")
+
+    def get(self, ticker, fetch=None):
+        """
+        Get company info for a ticker
+
+        Parameters:
+        -----------
+        ticker : str
+            Stock ticker symbol
+        fetch : callable, optional
+            Zero-argument function returning the info dict; defaults to the data backend's info
+
+        Returns:
+        --------
+        dict
+            Company information (empty if nothing could be fetched)
+        """
+        if fetch is None:
+            fetch = lambda: get_backend().info(ticker)
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is not None:
+                info, fetched_at = entry
+                age = now - fetched_at
+                if age < self.ttl:
+                    self._entries.move_to_end(ticker)
+                    record_cache('info', 'hit')
+                    return info
+                if age < self.ttl + self.max_stale:
+                    self._entries.move_to_end(ticker)
+                    record_cache('info', 'stale')
+                    if ticker not in self._refreshing:
+                        self._refreshing.add(ticker)
+                        self._refresh_executor.submit(self._refresh, ticker, fetch)
+                    return info
+
+        record_cache('info', 'miss')
+        try:
+            info = self._fetch(ticker, fetch)
+        except Exception:
+            # Fall back to an expired entry rather than failing outright
+            if entry is not None:
+                return entry[0]
+            raise
+        return info
+
+    def _fetch(self, ticker, fetch):
+        """Fetch info and store it unless the response was empty"""
+        # Sessions missing the same ticker at once share one fetch
+        info = SINGLE_FLIGHT.do(request_key(ticker, 'info'), fetch)
+        if not isinstance(info, dict):
+            info = {}
+        if info:
+            self.put(ticker, info)
+        return info
+
+    def _refresh(self, ticker, fetch):
+        """Background refresh of a stale entry"""
+        try:
+            self._fetch(ticker, fetch)
+        except Exception as e:
+            print(f"Error refreshing company info for {ticker}: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(ticker)
+
+    def put(self, ticker, info):
+        """Store an info dict for a ticker, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[ticker] = (info, time.time())
+            self._entries.move_to_end(ticker)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, ticker=None):
+        """Drop one ticker, or every ticker if none is given"""
+        with self._lock:
+            if ticker is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(ticker, None)
+
+# Process-wide cache shared by every Streamlit session
+INFO_CACHE = InfoCache()
+
+def get_company_info(ticker, fetch=None):
+    """
+    Get company info for a ticker through the process-wide cache
+
+    Parameters:
+    -----------
+    ticker : str
+        Stock ticker symbol
+    fetch : callable, optional
+        Zero-argument function returning the info dict; defaults to the data backend's info
+
+    Returns:
+    --------
+    dict
+        Company information (shared; do not modify)
+    """
+    return INFO_CACHE.get(ticker, fetch)
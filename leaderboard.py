@@ -0,0 +1,114 @@
+"""
+Streaming top-k selection for index scans
+Keeps only the best few results while a scan runs, treating share classes of one company as a single entry
+"""
+import heapq
+
+# Tickers that should be treated as the same company; only the best-rated one is kept
+COMPANY_GROUPS = {
+    'GOOGL': 'ALPHABET',
+    'GOOG': 'ALPHABET',
+    'BRK.A': 'BERKSHIRE',
+    'BRK.B': 'BERKSHIRE',
+    'BRK-A': 'BERKSHIRE',
+    'BRK-B': 'BERKSHIRE',
+}
+
+class _Ranked:
+    """Heap entry ordered worst first: lower rating, then later ticker alphabetically"""
+
+    __slots__ = ('rating', 'ticker', 'company', 'result')
+
+    def __init__(self, rating, ticker, company, result):
+        self.rating = rating
+        self.ticker = ticker
+        self.company = company
+        self.result = result
+
+    def __lt__(self, other):
+        if self.rating != other.rating:
+            return self.rating < other.rating
+        return self.ticker > other.ticker
+
+class TopKSelector:
+    """
+    Bounded min-heap of the best results seen so far
+
+    Each offered result is compared against the weakest entry on the heap, so
+    memory stays proportional to k however many tickers are scanned. A result
+    whose company is already on the heap replaces that entry only if it ranks
+    higher, which gives the same picks as sorting every result and skipping
+    repeated companies.
+    """
+
+    def __init__(self, k, company_groups=None, rating_key='buy_rating'):
+        """
+        Initialize TopKSelector
+
+        Parameters:
+        -----------
+        k : int
+            Number of results to keep
+        company_groups : dict, optional
+            Ticker to company key for tickers that count as one company; defaults to COMPANY_GROUPS
+        rating_key : str
+            Result key holding the score to rank by
+        """
+        self.k = k
+        self.company_groups = COMPANY_GROUPS if company_groups is None else company_groups
+        self.rating_key = rating_key
+
+        self._heap = []
+        self._by_company = {}
+
+    def offer(self, result):
+        """
+        Consider one result for the leaderboard
+
+        Parameters:
+        -----------
+        result : dict
+            Result with at least 'ticker' and the rating key
+
+        Returns:
+        --------
+        bool
+            Whether the leaderboard changed
+        """
+        if self.k <= 0 or not result:
+            return False
+
+        ticker = result['ticker']
+        company = self.company_groups.get(ticker, ticker)
+        entry = _Ranked(result[self.rating_key], ticker, company, result)
+
+        current = self._by_company.get(company)
+        if current is not None:
+            # Same company already listed: keep whichever ranks higher
+            if not current < entry:
+                return False
+            self._heap.remove(current)
+            heapq.heapify(self._heap)
+        elif len(self._heap) >= self.k:
+            if not self._heap[0] < entry:
+                return False
+            evicted = heapq.heappop(self._heap)
+            del self._by_company[evicted.company]
+
+        heapq.heappush(self._heap, entry)
+        self._by_company[company] = entry
+        return True
+
+    def leaderboard(self):
+        """
+        Current top results, best first
+
+        Returns:
+        --------
+        list
+            Up to k result dictionaries sorted by rating (ties by ticker)
+        """
+        return [entry.result for entry in sorted(self._heap, reverse=True)]
+
+    def __len__(self):
+        return len(self._heap)
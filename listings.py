@@ -0,0 +1,322 @@
+"""
+Listed-securities universe from the NASDAQ Trader symbol directory, cached on disk
+Tickers and names are held in joined string buffers with offset arrays, exchanges and sectors as small integer codes
+"""
+import os
+import csv
+import time
+import threading
+from array import array
+import requests
+from metrics import observe_upstream
+
+# Symbol directory files covering every security listed on US exchanges, by file name
+LISTINGS_SOURCES = {
+    'nasdaqlisted.txt': "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt",
+    'otherlisted.txt': "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt",
+}
+
+# Directory the symbol directory files are downloaded to
+LISTINGS_DIR = os.environ.get("TICKER_AI_LISTINGS_DIR", os.path.join(".cache", "listings"))
+
+# Listing files to load, separated by os.pathsep; defaults to the downloaded
+# symbol directory. Setting it (e.g., to your own CSV) turns the download off,
+# and an empty value disables the listing
+LISTINGS_FILES = os.environ.get(
+    "TICKER_AI_LISTINGS_FILE",
+    os.pathsep.join(os.path.join(LISTINGS_DIR, name) for name in LISTINGS_SOURCES)
+)
+DOWNLOAD_LISTINGS = "TICKER_AI_LISTINGS_FILE" not in os.environ
+
+# Seconds a downloaded file is used before downloading it again (the directory is republished daily)
+LISTINGS_TTL = int(os.environ.get("TICKER_AI_LISTINGS_TTL", str(24 * 3600)))
+
+# Seconds to wait for NASDAQ Trader
+LISTINGS_TIMEOUT = float(os.environ.get("TICKER_AI_LISTINGS_TIMEOUT", "20"))
+
+# Rows a listing needs to count as the full universe; a smaller listing does
+# not stand in for the remote symbol search
+FULL_UNIVERSE_ROWS = int(os.environ.get("TICKER_AI_LISTINGS_FULL_ROWS", "5000"))
+
+# Header names accepted for each column, compared case-insensitively. The CSV
+# format uses the first name; the others read the NASDAQ Trader symbol
+# directory files (nasdaqlisted.txt and otherlisted.txt) as published
+COLUMN_NAMES = {
+    'ticker': ('ticker', 'symbol', 'act symbol'),
+    'name': ('name', 'security name', 'company name'),
+    'exchange': ('exchange', 'listing exchange'),
+    'sector': ('sector',),
+}
+
+# Exchange codes used by the NASDAQ Trader directory; nasdaqlisted.txt has no exchange column
+EXCHANGE_CODES = {
+    'A': "NYSE American",
+    'N': "NYSE",
+    'P': "NYSE Arca",
+    'Z': "Cboe BZX",
+    'V': "IEX",
+    'Q': "NASDAQ",
+}
+
+class StringColumn:
+    """
+    Append-only column of strings kept as one joined buffer plus an offsets array
+
+    Thousands of short strings cost one str object and four bytes per row
+    instead of one Python object each. Appended values are buffered until
+    the column is next read.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._offsets = array('I', [0])
+        self._pending = []
+
+    def __len__(self):
+        return len(self._offsets) - 1 + len(self._pending)
+
+    def append(self, value):
+        self._pending.append(value)
+
+    def _flush(self):
+        if not self._pending:
+            return
+        end = self._offsets[-1]
+        for value in self._pending:
+            end += len(value)
+            self._offsets.append(end)
+        self._buffer += "".join(self._pending)
+        self._pending = []
+
+    def __getitem__(self, position):
+        self._flush()
+        if position < 0:
+            position += len(self)
+        return self._buffer[self._offsets[position]:self._offsets[position + 1]]
+
+    def __iter__(self):
+        self._flush()
+        buffer, offsets = self._buffer, self._offsets
+        for position in range(len(offsets) - 1):
+            yield buffer[offsets[position]:offsets[position + 1]]
+
+class Listings:
+    """
+    Column-wise table of listed securities
+
+    Row i is (tickers[i], names[i], exchange(i), sector(i)). Tickers and names
+    are StringColumns. Exchanges and sectors repeat across thousands of rows,
+    so each row stores a one-byte code into a short vocabulary instead of its
+    own string. The NASDAQ Trader symbol directory has no sector column, so
+    sector is blank unless a CSV listing file supplies one.
+    """
+
+    def __init__(self):
+        self.tickers = StringColumn()
+        self.names = StringColumn()
+        self.exchanges = []
+        self.sectors = []
+
+        self._exchange_codes = array('B')
+        self._sector_codes = array('B')
+        self._positions = {}
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def __contains__(self, ticker):
+        return ticker in self._positions
+
+    def _code(self, vocabulary, value):
+        """Code of a value in a vocabulary, adding it on first sight (0 is always blank)"""
+        if not vocabulary:
+            vocabulary.append("")
+        try:
+            return vocabulary.index(value)
+        except ValueError:
+            if len(vocabulary) >= 256:
+                raise ValueError(f"More than 255 distinct values in a listing column (at '{value}')")
+            vocabulary.append(value)
+            return len(vocabulary) - 1
+
+    def add(self, ticker, name, exchange="", sector=""):
+        """Append a security; a ticker already listed keeps its first row"""
+        if not ticker or ticker in self._positions:
+            return
+        self._positions[ticker] = len(self.tickers)
+        self.tickers.append(ticker)
+        self.names.append(name or "")
+        self._exchange_codes.append(self._code(self.exchanges, exchange or ""))
+        self._sector_codes.append(self._code(self.sectors, sector or ""))
+
+    def position(self, ticker):
+        """Row of a ticker, or None if it is not listed"""
+        return self._positions.get(ticker)
+
+    def exchange(self, position):
+        return self.exchanges[self._exchange_codes[position]]
+
+    def sector(self, position):
+        return self.sectors[self._sector_codes[position]]
+
+    def record(self, position):
+        """Row as a dictionary with 'ticker', 'name', 'exchange' and 'sector'"""
+        return {
+            "ticker": self.tickers[position],
+            "name": self.names[position],
+            "exchange": self.exchange(position),
+            "sector": self.sector(position),
+        }
+
+    def get(self, ticker):
+        """Listing of a ticker as a dictionary, or None"""
+        position = self._positions.get(ticker)
+        return self.record(position) if position is not None else None
+
+def _yahoo_symbol(symbol):
+    """NASDAQ Trader share-class symbols (BRK.B) in Yahoo's form (BRK-B)"""
+    return symbol.replace('.', '-').replace('/', '-')
+
+def read_listing_file(path, listings):
+    """
+    Add the rows of one listing file to a Listings table
+
+    Comma-separated files need a header with at least a ticker and a name
+    column; pipe-separated files are read as NASDAQ Trader symbol directory
+    files, skipping test issues and the trailing file-creation line.
+
+    Parameters:
+    -----------
+    path : str
+        Listing file
+    listings : Listings
+        Table the rows are added to
+
+    Returns:
+    --------
+    int
+        Number of rows read
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        header_line = f.readline()
+        delimiter = '|' if '|' in header_line else ','
+        header = [column.strip().lower() for column in next(csv.reader([header_line], delimiter=delimiter))]
+
+        columns = {}
+        for field, names in COLUMN_NAMES.items():
+            columns[field] = next((header.index(name) for name in names if name in header), None)
+        if columns['ticker'] is None or columns['name'] is None:
+            raise ValueError(f"{path} has no ticker or name column")
+        test_issue = header.index('test issue') if 'test issue' in header else None
+        symbol_directory = delimiter == '|'
+        # nasdaqlisted.txt lists NASDAQ securities only and has no exchange column
+        default_exchange = "NASDAQ" if symbol_directory and columns['exchange'] is None else ""
+
+        count = 0
+        for row in csv.reader(f, delimiter=delimiter):
+            if len(row) <= max(columns['ticker'], columns['name']) or row[0].startswith("File Creation Time"):
+                # Blank lines and the symbol directory's footer
+                continue
+            if test_issue is not None and row[test_issue].strip() == 'Y':
+                continue
+
+            ticker = row[columns['ticker']].strip()
+            exchange = row[columns['exchange']].strip() if columns['exchange'] is not None else default_exchange
+            sector = row[columns['sector']].strip() if columns['sector'] is not None else ""
+            if symbol_directory:
+                ticker = _yahoo_symbol(ticker)
+                exchange = EXCHANGE_CODES.get(exchange, exchange)
+
+            listings.add(ticker, row[columns['name']].strip(), exchange, sector)
+            count += 1
+        return count
+
+def load_listings(paths=LISTINGS_FILES):
+    """
+    Load the listed-securities universe
+
+    Parameters:
+    -----------
+    paths : str
+        Listing files separated by os.pathsep; missing or unreadable files
+        are reported and skipped
+
+    Returns:
+    --------
+    Listings
+        The loaded table (empty if nothing could be read)
+    """
+    listings = Listings()
+    for path in filter(None, (paths or "").split(os.pathsep)):
+        try:
+            read_listing_file(path, listings)
+        except FileNotFoundError:
+            print(f"Listing file {path} not found; search uses the bundled stock list until it is available")
+        except Exception as e:
+            print(f"Error reading listing file {path}: {str(e)}")
+    return listings
+
+def is_full_universe(listings):
+    """Whether a listing is large enough to answer searches without the remote search"""
+    return len(listings) >= FULL_UNIVERSE_ROWS
+
+def download_listing_files(directory=LISTINGS_DIR, sources=LISTINGS_SOURCES, ttl=LISTINGS_TTL, timeout=LISTINGS_TIMEOUT):
+    """
+    Download the symbol directory files that are missing or older than the TTL
+
+    A file is only replaced by a complete download (one ending in the
+    directory's "File Creation Time" footer), so a failed download leaves
+    the previous file in place.
+
+    Parameters:
+    -----------
+    directory : str
+        Directory the files are written to
+    sources : dict
+        File name to URL
+    ttl : int
+        Seconds a downloaded file stays current
+    timeout : float
+        Seconds to wait for each download
+
+    Returns:
+    --------
+    bool
+        Whether any file was replaced
+    """
+    os.makedirs(directory, exist_ok=True)
+    updated = False
+
+    for name, url in sources.items():
+        path = os.path.join(directory, name)
+        try:
+            if time.time() - os.path.getmtime(path) < ttl:
+                continue
+        except OSError:
+            pass
+
+        started = time.perf_counter()
+        try:
+            response = requests.get(url, timeout=timeout, headers={'User-Agent': 'Mozilla/5.0'})
+            response.raise_for_status()
+            text = response.text
+            if '|' not in text.split('\n', 1)[0] or 'File Creation Time' not in text[-200:]:
+                raise ValueError("incomplete symbol directory file")
+        except Exception as e:
+            observe_upstream('nasdaqtrader', name, 'error', time.perf_counter() - started)
+            print(f"Error downloading listing file {name}: {str(e)}")
+            continue
+        observe_upstream('nasdaqtrader', name, 'ok', time.perf_counter() - started)
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+            updated = True
+        except Exception as e:
+            print(f"Error writing listing file {name}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    return updated
@@ -0,0 +1,332 @@
+"""
+Market data access shared by the analysis classes
+One provider per ticker reads from the configured data backend and memoizes every download
+"""
+import pandas as pd
+from info_cache import get_company_info
+from price_store import PERIOD_OFFSETS, PRICE_STORE, trim_history, adjustments_changed
+from data_backend import get_backend
+from single_flight import SINGLE_FLIGHT, request_key
+from tracing import span
+
+class MarketDataProvider:
+    """
+    Single point of access to market data for one ticker
+
+    StockAnalyzer, TechnicalAnalysis and FundamentalAnalysis all accept a provider,
+    so one analysis fetches company info once, downloads history once and reads
+    each financial statement at most once. The data comes from the process-wide
+    backend (Yahoo Finance, or recorded fixtures when running offline).
+    """
+
+    def __init__(self, ticker):
+        """
+        Initialize MarketDataProvider with a ticker symbol
+
+        Parameters:
+        -----------
+        ticker : str
+            Stock ticker symbol (e.g., 'AAPL' for Apple)
+        """
+        self.ticker = ticker
+        self.backend = get_backend()
+
+        self._info = None
+        self._history_cache = {}
+        self._statements = {}
+
+    @property
+    def info(self):
+        """Company information dictionary, fetched on first access"""
+        if self._info is None:
+            try:
+                # Shared across analyzers and sessions through the process-wide cache
+                with span('fetch.info', ticker=self.ticker):
+                    info = get_company_info(self.ticker, fetch=lambda: self.backend.info(self.ticker))
+            except Exception as e:
+                print(f"Error fetching company info for {self.ticker}: {str(e)}")
+                info = None
+            self._info = info if isinstance(info, dict) else {}
+        return self._info
+
+    def get_history(self, timeframe='1y'):
+        """
+        Get historical price data
+
+        Each timeframe is loaded at most once, and shorter timeframes are
+        sliced out of a longer cached frame when possible. Standard periods go
+        through the on-disk price store, so usually only the newest bars are
+        downloaded.
+
+        Parameters:
+        -----------
+        timeframe : str
+            Time period for historical data (e.g., '1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', 'max')
+
+        Returns:
+        --------
+        pandas.DataFrame
+            Historical stock data (a copy that callers are free to modify)
+        """
+        data = self._history_cache.get(timeframe)
+
+        if data is None:
+            data = self._slice_cached_history(timeframe)
+
+        if data is None:
+            try:
+                if PRICE_STORE is not None and timeframe in PERIOD_OFFSETS:
+                    # Served from disk, downloading only bars newer than the stored ones
+                    with span('fetch.price_store', ticker=self.ticker, timeframe=timeframe):
+                        data = PRICE_STORE.get_history(self.ticker, timeframe, self._fetch_history)
+                else:
+                    data = self._fetch_history(period=timeframe)
+            except Exception as e:
+                print(f"Error fetching historical data for {self.ticker}: {str(e)}")
+                return pd.DataFrame()
+            self._history_cache[timeframe] = data
+
+        return data.copy()
+
+    def _fetch_history(self, **kwargs):
+        """Download history from the backend (period=... or start=...)"""
+        # Concurrent requests for the same bars share one download
+        with span('fetch.history', ticker=self.ticker, **kwargs):
+            data = SINGLE_FLIGHT.do(
+                request_key(self.ticker, 'history', **kwargs),
+                self.backend.history, self.ticker, **kwargs
+            )
+        if data is None or isinstance(data, dict):
+            return pd.DataFrame()
+        return data
+
+    def seed_info(self, info):
+        """
+        Install an already fetched company info dictionary
+
+        Lets a scan hand prefetched info to an analyzer running in another
+        process, so the analysis itself needs no network access.
+
+        Parameters:
+        -----------
+        info : dict
+            Company information
+        """
+        self._info = info if isinstance(info, dict) else {}
+
+    def seed_history(self, timeframe, data):
+        """
+        Install an already downloaded history frame for a timeframe
+
+        Used by bulk scans that download many tickers at once, so the provider
+        never has to request history for this ticker itself.
+
+        Parameters:
+        -----------
+        timeframe : str
+            Time period the frame covers (e.g., '1y')
+        data : pandas.DataFrame
+            Historical stock data with at least a 'Close' column
+        """
+        self._history_cache[timeframe] = data
+
+    def _slice_cached_history(self, timeframe):
+        """Cut a shorter timeframe out of a longer cached history, if one covers it"""
+        offset = PERIOD_OFFSETS.get(timeframe)
+        if offset is None:
+            return None
+
+        for cached_timeframe, cached_data in self._history_cache.items():
+            if cached_data.empty:
+                continue
+
+            end = cached_data.index[-1]
+            start = end - offset
+
+            # Only reuse a cached frame that reaches back far enough
+            if cached_timeframe == 'max':
+                covers = True
+            else:
+                cached_offset = PERIOD_OFFSETS.get(cached_timeframe)
+                covers = cached_offset is not None and end - cached_offset <= start
+
+            if covers:
+                data = cached_data[cached_data.index >= start]
+                self._history_cache[timeframe] = data
+                return data
+
+        return None
+
+    def get_statement(self, name):
+        """
+        Get a financial statement or other per-ticker dataset
+
+        Parameters:
+        -----------
+        name : str
+            Dataset to read, named like the yf.Ticker attribute (e.g., 'income_stmt',
+            'balance_sheet', 'cashflow', 'quarterly_earnings', 'quarterly_financials',
+            'recommendations')
+
+        Returns:
+        --------
+        object
+            The dataset as returned by the backend (DataFrames are copied so callers
+            may modify them). Failed fetches raise and are not memoized, so a
+            later call retries.
+        """
+        if name not in self._statements:
+            with span('fetch.statement', ticker=self.ticker, statement=name):
+                self._statements[name] = SINGLE_FLIGHT.do(
+                    request_key(self.ticker, name),
+                    self.backend.statement, self.ticker, name
+                )
+
+        data = self._statements[name]
+        if isinstance(data, pd.DataFrame):
+            return data.copy()
+        return data
+
+
+def download_history_panel(tickers, timeframe='1y', chunk_size=100):
+    """
+    Download price history for many tickers in a few multi-symbol requests
+
+    When the on-disk price store is enabled, tickers with current stored bars
+    are served from disk, stale ones only download the bars after their last
+    stored date, and only tickers with no usable file get the full period.
+    A stale ticker whose downloaded bars show its prices were re-adjusted
+    (after a split or dividend) is downloaded again in full.
+
+    Parameters:
+    -----------
+    tickers : list
+        Ticker symbols to download
+    timeframe : str
+        Time period for historical data (e.g., '6mo', '1y', '2y')
+    chunk_size : int
+        Number of tickers per bulk download request
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Wide OHLCV panel with (ticker, field) column pairs; tickers whose
+        download failed are simply missing
+    """
+    unique_tickers = list(dict.fromkeys(tickers))
+
+    if PRICE_STORE is None or timeframe not in PERIOD_OFFSETS:
+        return _download_chunks(unique_tickers, chunk_size, period=timeframe)
+
+    frames = {}
+    stored_data = {}
+    full_tickers = []
+    update_tickers = []
+
+    for ticker in unique_tickers:
+        action, stored = PRICE_STORE.plan(ticker, timeframe)
+        stored_data[ticker] = stored
+        if action == 'fresh':
+            frames[ticker] = trim_history(stored, timeframe)
+        elif action == 'update':
+            update_tickers.append(ticker)
+        else:
+            full_tickers.append(ticker)
+
+    downloads = []
+    if full_tickers:
+        downloads.append((full_tickers, _download_chunks(full_tickers, chunk_size, period=timeframe)))
+    if update_tickers:
+        start = min(stored_data[ticker].index[-1] for ticker in update_tickers)
+        downloads.append((update_tickers, _download_chunks(update_tickers, chunk_size, start=start.strftime('%Y-%m-%d'))))
+
+    readjusted = []
+    for group, panel in downloads:
+        for ticker in group:
+            new_data = slice_history_panel(panel, ticker)
+            stored = stored_data[ticker]
+            if new_data is None:
+                # Download failed; serve whatever is stored
+                if stored is not None:
+                    frames[ticker] = trim_history(stored, timeframe)
+                continue
+            if ticker in update_tickers and adjustments_changed(stored, new_data):
+                readjusted.append(ticker)
+                continue
+            frames[ticker] = trim_history(PRICE_STORE.merge(ticker, stored, new_data), timeframe)
+
+    if readjusted:
+        # Stored bars no longer match the adjusted prices; replace them
+        panel = _download_chunks(readjusted, chunk_size, period=timeframe)
+        for ticker in readjusted:
+            new_data = slice_history_panel(panel, ticker)
+            if new_data is None:
+                frames[ticker] = trim_history(stored_data[ticker], timeframe)
+                continue
+            frames[ticker] = trim_history(PRICE_STORE.merge(ticker, None, new_data), timeframe)
+
+    if not frames:
+        return pd.DataFrame()
+
+    return pd.concat(frames, axis=1)
+
+def _download_chunks(tickers, chunk_size, **kwargs):
+    """Run chunked bulk downloads (period=... or start=...) and join them into one panel"""
+    chunks = []
+
+    for start in range(0, len(tickers), chunk_size):
+        chunk = tickers[start:start + chunk_size]
+        try:
+            # A concurrent scan downloading the same chunk shares this call
+            with span('fetch.download', tickers=len(chunk), **kwargs):
+                data = SINGLE_FLIGHT.do(
+                    request_key(tuple(chunk), 'download', **kwargs),
+                    get_backend().download, chunk, **kwargs
+                )
+        except Exception as e:
+            print(f"Error downloading history for {len(chunk)} tickers: {str(e)}")
+            continue
+
+        if data is None or data.empty:
+            continue
+
+        # A single-ticker download may come back with flat columns; relabel a
+        # copy, since a coalesced download is shared with other callers
+        if not isinstance(data.columns, pd.MultiIndex):
+            data = data.set_axis(pd.MultiIndex.from_product([chunk, data.columns]), axis=1)
+
+        chunks.append(data)
+
+    if not chunks:
+        return pd.DataFrame()
+
+    return pd.concat(chunks, axis=1)
+
+def slice_history_panel(panel, ticker):
+    """
+    Extract one ticker's history from a panel built by download_history_panel
+
+    Parameters:
+    -----------
+    panel : pandas.DataFrame
+        Wide OHLCV panel with (ticker, field) column pairs
+    ticker : str
+        Ticker symbol to extract
+
+    Returns:
+    --------
+    pandas.DataFrame or None
+        The ticker's OHLCV history, or None if the panel has no usable data for it
+    """
+    if panel is None or panel.empty:
+        return None
+
+    if ticker not in panel.columns.get_level_values(0):
+        return None
+
+    data = panel[ticker].dropna(how='all')
+    if data.empty or 'Close' not in data.columns:
+        return None
+
+    data.columns.name = None
+    return data
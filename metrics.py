@@ -0,0 +1,373 @@
+"""
+Process metrics in the Prometheus text exposition format
+Counters, gauges and histograms for upstream calls, caches, scans, OpenAI usage and sessions, served on a side HTTP port
+"""
+import os
+import time
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Port of the /metrics endpoint; 0 turns the endpoint off (metrics are still collected)
+METRICS_PORT = int(os.environ.get("TICKER_AI_METRICS_PORT", "9464"))
+
+# Interface the endpoint listens on; use 0.0.0.0 to let a scraper on another host in
+METRICS_HOST = os.environ.get("TICKER_AI_METRICS_HOST", "127.0.0.1")
+
+# A session counts as active if it ran the script within this many seconds
+SESSION_WINDOW = float(os.environ.get("TICKER_AI_METRICS_SESSION_WINDOW", "300"))
+
+# Histogram buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SCAN_BUCKETS = (1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _format_value(value):
+    """Sample value as the exposition format writes it"""
+    if value == float('inf'):
+        return "+Inf"
+    if value == float('-inf'):
+        return "-Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+def _format_labels(labels):
+    """Label set as {name="value",...}, with values escaped"""
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+class _Metric:
+    """Common bookkeeping: a name, help text and one value per label combination"""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        """Label values in declaration order"""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        """(suffix, label pairs, value) tuples for the exposition"""
+        with self._lock:
+            items = list(self._values.items())
+        return [("", tuple(zip(self.labelnames, key)), value) for key, value in sorted(items)]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines)
+
+class Counter(_Metric):
+    """Monotonically increasing count (e.g., requests served)"""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    """Value that goes up and down (e.g., active sessions)"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._function = None
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function):
+        """Read the value from function() at scrape time (unlabelled gauges only)"""
+        self._function = function
+
+    def _samples(self):
+        if self._function is not None:
+            try:
+                return [("", (), self._function())]
+            except Exception as e:
+                print(f"Error reading metric {self.name}: {str(e)}")
+                return []
+        return super()._samples()
+
+class Histogram(_Metric):
+    """Distribution of observed values (e.g., latencies) in cumulative buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (plus +Inf), sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            counts = state[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with-block in seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self):
+        with self._lock:
+            items = [(key, (list(state[0]), state[1])) for key, state in self._values.items()]
+
+        samples = []
+        for key, (counts, total) in sorted(items):
+            labels = tuple(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                samples.append(("_bucket", labels + (('le', _format_value(float(bound))),), cumulative))
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, cumulative))
+        return samples
+
+class MetricsRegistry:
+    """Named metrics of one process, rendered together for a scrape"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_class, name, documentation, labelnames, **kwargs):
+        """Get the metric with this name, creating it on first use"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, metric_class) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        """
+        Every metric in the Prometheus text exposition format
+
+        Returns:
+        --------
+        str
+            Exposition text, ready to serve with CONTENT_TYPE
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+# Process-wide registry
+REGISTRY = MetricsRegistry()
+
+# Upstream calls, one sample per attempt (retries included)
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    'ticker_ai_upstream_requests_total',
+    "Upstream call attempts by outcome (ok, error, retryable, circuit_open)",
+    ('upstream', 'endpoint', 'outcome')
+)
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    'ticker_ai_upstream_request_duration_seconds',
+    "Upstream call attempt latency",
+    ('upstream', 'endpoint')
+)
+
+# Cache lookups; hit ratio = hit / (hit + stale + miss)
+CACHE_REQUESTS = REGISTRY.counter(
+    'ticker_ai_cache_requests_total',
+    "Cache lookups by result (hit, stale, prefix, miss)",
+    ('cache', 'result')
+)
+
+# Index scans
+SCAN_TICKERS = REGISTRY.counter(
+    'ticker_ai_scan_tickers_total',
+    "Tickers processed by index scans by outcome (scanned, failed)",
+    ('index', 'outcome')
+)
+SCAN_DURATION = REGISTRY.histogram(
+    'ticker_ai_scan_duration_seconds',
+    "Wall time of index scans",
+    ('index', 'mode'),
+    buckets=SCAN_BUCKETS
+)
+SCAN_THROUGHPUT = REGISTRY.gauge(
+    'ticker_ai_scan_tickers_per_second',
+    "Throughput of the most recent scan of each index",
+    ('index',)
+)
+
+# OpenAI usage
+OPENAI_LATENCY = REGISTRY.histogram(
+    'ticker_ai_openai_request_duration_seconds',
+    "OpenAI request latency by outcome (ok, error)",
+    ('model', 'outcome')
+)
+OPENAI_TOKENS = REGISTRY.counter(
+    'ticker_ai_openai_tokens_total',
+    "OpenAI tokens used by type (prompt, completion)",
+    ('model', 'type')
+)
+
+# Sessions
+ACTIVE_SESSIONS = REGISTRY.gauge(
+    'ticker_ai_active_sessions',
+    f"Browser sessions that ran the app within the last {SESSION_WINDOW:g} seconds"
+)
+
+def observe_upstream(upstream, endpoint, outcome, seconds):
+    """Record one upstream call attempt"""
+    UPSTREAM_REQUESTS.inc(upstream=upstream, endpoint=endpoint, outcome=outcome)
+    UPSTREAM_LATENCY.observe(seconds, upstream=upstream, endpoint=endpoint)
+
+def record_cache(cache, result):
+    """Record one cache lookup ('hit', 'stale', 'prefix' or 'miss')"""
+    CACHE_REQUESTS.inc(cache=cache, result=result)
+
+def record_scan(index, mode, tickers, failed, seconds):
+    """Record a finished index scan"""
+    SCAN_TICKERS.inc(tickers - failed, index=index, outcome='scanned')
+    SCAN_TICKERS.inc(failed, index=index, outcome='failed')
+    SCAN_DURATION.observe(seconds, index=index, mode=mode)
+    if seconds > 0:
+        SCAN_THROUGHPUT.set(tickers / seconds, index=index)
+
+class SessionTracker:
+    """Counts sessions seen within a sliding window"""
+
+    def __init__(self, window=SESSION_WINDOW):
+        self.window = window
+
+        self._last_seen = {}
+        self._lock = threading.Lock()
+
+    def touch(self, session_id):
+        """Mark a session as active now"""
+        with self._lock:
+            self._last_seen[session_id] = time.time()
+
+    def active(self):
+        """Number of sessions seen within the window; older ones are forgotten"""
+        cutoff = time.time() - self.window
+        with self._lock:
+            for session_id in [s for s, seen in self._last_seen.items() if seen < cutoff]:
+                del self._last_seen[session_id]
+            return len(self._last_seen)
+
+SESSION_TRACKER = SessionTracker()
+ACTIVE_SESSIONS.set_function(SESSION_TRACKER.active)
+
+def record_session():
+    """Mark the Streamlit session running the current script as active"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+    except Exception:
+        ctx = None
+    if ctx is not None:
+        SESSION_TRACKER.touch(ctx.session_id)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the registry at /metrics"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the app log
+        pass
+
+_SERVER = None
+_SERVER_LOCK = threading.Lock()
+
+def start_metrics_server(port=METRICS_PORT, host=METRICS_HOST):
+    """
+    Serve /metrics on a side port from a daemon thread, once per process
+
+    Safe to call on every script run. If the port is taken (e.g., by another
+    app process on the same host) the error is printed once and metrics stay
+    in memory only.
+
+    Parameters:
+    -----------
+    port : int
+        Port to listen on; 0 disables the endpoint
+    host : str
+        Interface to listen on
+
+    Returns:
+    --------
+    http.server.ThreadingHTTPServer or None
+        The running server, or None if disabled or the port was unavailable
+    """
+    global _SERVER
+    with _SERVER_LOCK:
+        if _SERVER is not None or not port:
+            return _SERVER or None
+        try:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            print(f"Error starting metrics endpoint on {host}:{port}: {str(e)}")
+            # Do not retry on every script run
+            _SERVER = False
+            return None
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        _SERVER = server
+        return server
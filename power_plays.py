@@ -1,13 +1,21 @@
 """
 Power Plays functionality - Find top stock opportunities in Fortune 500
 """
-import yfinance as yf
 import pandas as pd
 import streamlit as st
 from stock_analyzer import StockAnalyzer
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from technical_analysis import TechnicalAnalysis, panel_signals_for
+from market_data import MarketDataProvider, download_history_panel, slice_history_panel
+from scan_engine import ScanEngine
+from collections import deque
+from leaderboard import TopKSelector
+from scoring import scoring_fingerprint, scoring_inputs, rescore_inputs
 import time
 from utils import format_large_number
+from info_cache import get_company_info
+from index_constituents import get_index_constituents, canonical_index_name
+from tracing import trace, span
+from metrics import record_scan
 
 # Stock indices for analysis
 STOCK_INDICES = {
@@ -102,80 +110,154 @@ STOCK_INDICES = {
     ]
 }
 
-def analyze_ticker(ticker):
+# NASDAQ 100 list used when the constituents page cannot be scraped
+NASDAQ_100_TICKERS = [
+    "AAPL", "MSFT", "AMZN", "NVDA", "GOOGL", "GOOG", "TSLA", "META",
+    "AVGO", "COST", "NFLX", "ADBE", "PEP", "TMUS", "CSCO", "CMCSA",
+    "TXN", "QCOM", "AMGN", "INTC", "HON", "INTU", "AMD", "SBUX",
+    "ISRG", "AMAT", "BKNG", "ADP", "GILD", "MDLZ", "ADI", "VRTX",
+    "REGN", "PYPL", "FISV", "CSX", "ATVI", "MRNA", "ABNB", "CHTR",
+    "MNST", "KLAC", "MRVL", "ORLY", "CDNS", "SNPS", "ASML", "NXPI",
+    "WDAY", "FTNT", "LRCX", "MCHP", "BIIB", "IDXX", "KDP", "CTAS",
+    "PANW", "CRWD", "DXCM", "ZM", "TEAM", "FAST", "ROST", "LCID",
+    "SGEN", "PAYX", "ODFL", "VRSK", "EXC", "CTSH", "DLTR", "XEL",
+    "MELI", "ZS", "OKTA", "MTCH", "SPLK", "DDOG", "ILMN", "KHC",
+    "CPRT", "EA", "LULU", "EBAY", "ALGN", "DOCU", "BNTX", "WBA",
+    "SIRI", "ENPH", "PCAR", "MRKT", "BMRN", "NTES", "JD", "NTAP",
+    "SWKS", "TCOM", "ROKU", "BGNE", "FOXA"
+]
+
+# Bundled constituent lists, used when no scraped list is available
+INDEX_SNAPSHOTS = {
+    "Fortune 500": STOCK_INDICES["Fortune 500"],
+    "S&P 500": STOCK_INDICES["S&P 500"],
+    "NASDAQ 100": NASDAQ_100_TICKERS,
+    "Dow Jones": STOCK_INDICES["Dow Jones"],
+}
+
+@span('scan.compute')
+def analyze_ticker(ticker, history=None, technical_signals=None, info=None):
     """
     Analyze a single ticker and return its buy rating and details
+    
+    Parameters:
+    -----------
+    ticker : str
+        Stock ticker symbol
+    history : pandas.DataFrame, optional
+        One year of prefetched price history; downloaded by the analyzer if not given
+    technical_signals : dict, optional
+        Technical signals computed for the whole index in one panel pass
+    info : dict, optional
+        Prefetched company information; fetched by the analyzer if not given
+    
+    Returns:
+    --------
+    dict
+        Rating, breakdown, formatted metrics and analysis text, plus the full
+        'info' snapshot and the 'indicators' frames the detail views render
+        from without fetching again
+    
+    Raises:
+    -------
+    Exception
+        Any failure (including an unavailable upstream) propagates, so the
+        scan engine records it in its errors instead of dropping the ticker
     """
-    try:
-        # Initialize stock analyzer for the ticker
-        analyzer = StockAnalyzer(ticker)
-        
-        # Get basic info
-        info = analyzer.get_company_info()
-        company_name = info.get('shortName', ticker)
-        
-        # Get key financial metrics
-        market_cap = info.get('marketCap', None)
-        pe_ratio = info.get('trailingPE', None)
-        eps = info.get('trailingEps', None)
-        revenue = info.get('totalRevenue', None)
-        dividend_yield = info.get('dividendYield', None)
-        target_price = info.get('targetMeanPrice', None)
-        current_price = analyzer.get_current_price()
-        price_change = analyzer.get_price_change()
-        
-        # Additional data for detailed analysis
-        sector = info.get('sector', 'N/A')
-        industry = info.get('industry', 'N/A')
-        forward_pe = info.get('forwardPE', None)
-        peg_ratio = info.get('pegRatio', None)
-        profit_margin = info.get('profitMargins', None)
-        
-        # Format metrics
-        formatted_metrics = {
-            'market_cap': format_large_number(market_cap) if market_cap else 'N/A',
-            'pe_ratio': f"{pe_ratio:.2f}" if pe_ratio else 'N/A',
-            'eps': f"${eps:.2f}" if eps else 'N/A',
-            'revenue': format_large_number(revenue) if revenue else 'N/A',
-            'dividend_yield': f"{dividend_yield*100:.2f}%" if dividend_yield else 'N/A',
-            'target_price': f"${target_price:.2f}" if target_price else 'N/A',
-            'current_price': f"${current_price:.2f}" if current_price else 'N/A',
-            'sector': sector,
-            'industry': industry,
-            'forward_pe': f"{forward_pe:.2f}" if forward_pe else 'N/A',
-            'peg_ratio': f"{peg_ratio:.2f}" if peg_ratio else 'N/A',
-            'profit_margin': f"{profit_margin*100:.2f}%" if profit_margin else 'N/A'
-        }
-        
-        # Calculate buy rating
-        buy_rating, rating_components = analyzer.calculate_buy_rating()
-        
-        # Get the score breakdown from components
-        technical_data = rating_components.get('Technical Analysis', {})
-        fundamental_data = rating_components.get('Fundamental Analysis', {})
-        sentiment_data = rating_components.get('Market Sentiment', {})
-        
-        # Extract individual scores
-        technical_score = technical_data.get('score', 5.0) if isinstance(technical_data, dict) else 5.0
-        fundamental_score = fundamental_data.get('score', 5.0) if isinstance(fundamental_data, dict) else 5.0
-        sentiment_score = sentiment_data.get('score', 5.0) if isinstance(sentiment_data, dict) else 5.0
-        
-        # Generate analysis
-        analysis = generate_analysis(ticker, buy_rating, technical_score, fundamental_score, sentiment_score, formatted_metrics)
-        
-        return {
-            'ticker': ticker,
-            'name': company_name,
-            'buy_rating': buy_rating,
-            'current_price': current_price,
-            'rating_components': rating_components,
-            'analysis': analysis,
-            'metrics': formatted_metrics
-        }
-    except Exception as e:
-        # If there's an error, return None
-        print(f"Error analyzing {ticker}: {str(e)}")
-        return None
+    # Initialize stock analyzer for the ticker, seeded with any prefetched history
+    provider = MarketDataProvider(ticker)
+    if history is not None:
+        provider.seed_history('1y', history)
+    if info is not None:
+        provider.seed_info(info)
+    analyzer = StockAnalyzer(ticker, provider=provider)
+    
+    # Get basic info
+    info = analyzer.get_company_info()
+    company_name = info.get('shortName', ticker)
+    
+    # Get key financial metrics
+    market_cap = info.get('marketCap', None)
+    pe_ratio = info.get('trailingPE', None)
+    eps = info.get('trailingEps', None)
+    revenue = info.get('totalRevenue', None)
+    dividend_yield = info.get('dividendYield', None)
+    target_price = info.get('targetMeanPrice', None)
+    current_price = analyzer.get_current_price()
+    price_change = analyzer.get_price_change()
+    
+    # Additional data for detailed analysis
+    sector = info.get('sector', 'N/A')
+    industry = info.get('industry', 'N/A')
+    forward_pe = info.get('forwardPE', None)
+    peg_ratio = info.get('pegRatio', None)
+    profit_margin = info.get('profitMargins', None)
+    
+    # Format metrics
+    formatted_metrics = {
+        'market_cap': format_large_number(market_cap) if market_cap else 'N/A',
+        'pe_ratio': f"{pe_ratio:.2f}" if pe_ratio else 'N/A',
+        'eps': f"${eps:.2f}" if eps else 'N/A',
+        'revenue': format_large_number(revenue) if revenue else 'N/A',
+        'dividend_yield': f"{dividend_yield*100:.2f}%" if dividend_yield else 'N/A',
+        'target_price': f"${target_price:.2f}" if target_price else 'N/A',
+        'current_price': f"${current_price:.2f}" if current_price else 'N/A',
+        'sector': sector,
+        'industry': industry,
+        'forward_pe': f"{forward_pe:.2f}" if forward_pe else 'N/A',
+        'peg_ratio': f"{peg_ratio:.2f}" if peg_ratio else 'N/A',
+        'profit_margin': f"{profit_margin*100:.2f}%" if profit_margin else 'N/A'
+    }
+    
+    # Calculate buy rating
+    buy_rating, rating_components = analyzer.calculate_buy_rating(technical_signals)
+    
+    # Get the score breakdown from components
+    technical_data = rating_components.get('Technical Analysis', {})
+    fundamental_data = rating_components.get('Fundamental Analysis', {})
+    sentiment_data = rating_components.get('Market Sentiment', {})
+    
+    # Extract individual scores
+    technical_score = technical_data.get('score', 5.0) if isinstance(technical_data, dict) else 5.0
+    fundamental_score = fundamental_data.get('score', 5.0) if isinstance(fundamental_data, dict) else 5.0
+    sentiment_score = sentiment_data.get('score', 5.0) if isinstance(sentiment_data, dict) else 5.0
+    
+    # Generate analysis
+    analysis = generate_analysis(ticker, buy_rating, technical_score, fundamental_score, sentiment_score, formatted_metrics)
+    
+    return {
+        'ticker': ticker,
+        'name': company_name,
+        'buy_rating': buy_rating,
+        'current_price': current_price,
+        'rating_components': rating_components,
+        'analysis': analysis,
+        'metrics': formatted_metrics,
+        'info': info,
+        'indicators': get_indicator_frames(analyzer)
+    }
+
+def get_indicator_frames(analyzer):
+    """
+    Indicator frames for a scan result, computed from the analyzer's cached history
+    
+    Parameters:
+    -----------
+    analyzer : StockAnalyzer
+        Analyzer whose one-year history is already loaded
+    
+    Returns:
+    --------
+    dict
+        'moving_averages', 'rsi', 'macd' and 'bollinger_bands' DataFrames
+    """
+    technical = analyzer.technical
+    return {
+        'moving_averages': technical.get_moving_averages('1y'),
+        'rsi': technical.get_rsi('1y'),
+        'macd': technical.get_macd('1y'),
+        'bollinger_bands': technical.get_bollinger_bands('1y'),
+    }
 
 def generate_analysis(ticker, buy_rating, technical_score, fundamental_score, sentiment_score, metrics=None):
     """
@@ -324,110 +406,17 @@ def generate_analysis(ticker, buy_rating, technical_score, fundamental_score, se
 def get_authentic_index_tickers(index_name):
     """
     Get authentic ticker lists from reliable financial data sources
-    """
-    import yfinance as yf
-    import requests
-    from bs4 import BeautifulSoup
-    
-    try:
-        if index_name == "NASDAQ 100":
-            # NASDAQ 100 fallback list with major companies
-            nasdaq_100_tickers = [
-                "AAPL", "MSFT", "AMZN", "NVDA", "GOOGL", "GOOG", "TSLA", "META", 
-                "AVGO", "COST", "NFLX", "ADBE", "PEP", "TMUS", "CSCO", "CMCSA",
-                "TXN", "QCOM", "AMGN", "INTC", "HON", "INTU", "AMD", "SBUX",
-                "ISRG", "AMAT", "BKNG", "ADP", "GILD", "MDLZ", "ADI", "VRTX",
-                "REGN", "PYPL", "FISV", "CSX", "ATVI", "MRNA", "ABNB", "CHTR",
-                "MNST", "KLAC", "MRVL", "ORLY", "CDNS", "SNPS", "ASML", "NXPI",
-                "WDAY", "FTNT", "LRCX", "MCHP", "BIIB", "IDXX", "KDP", "CTAS",
-                "PANW", "CRWD", "DXCM", "ZM", "TEAM", "FAST", "ROST", "LCID",
-                "SGEN", "PAYX", "ODFL", "VRSK", "EXC", "CTSH", "DLTR", "XEL",
-                "MELI", "ZS", "OKTA", "MTCH", "SPLK", "DDOG", "ILMN", "KHC",
-                "CPRT", "EA", "LULU", "EBAY", "ALGN", "DOCU", "BNTX", "WBA",
-                "SIRI", "ENPH", "PCAR", "MRKT", "BMRN", "NTES", "JD", "NTAP",
-                "SWKS", "TCOM", "ROKU", "BGNE", "FOXA"
-            ]
-            
-            # Try Wikipedia scraping first, fall back to hardcoded list
-            try:
-                url = "https://en.wikipedia.org/wiki/NASDAQ-100"
-                response = requests.get(url)
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find the table with NASDAQ 100 companies
-                tables = soup.find_all('table', {'class': 'wikitable'})
-                tickers = []
-                
-                for table in tables:
-                    if table:
-                        rows = table.find_all('tr')[1:]  # Skip header
-                        for row in rows:
-                            cells = row.find_all('td')
-                            if len(cells) >= 2:
-                                ticker = cells[1].text.strip()
-                                if ticker and ticker != '—' and len(ticker) <= 5:
-                                    tickers.append(ticker)
-                
-                if len(tickers) >= 50:  # If we got a decent number of tickers
-                    return tickers[:100]
-                else:
-                    return nasdaq_100_tickers[:100]
-                    
-            except Exception:
-                return nasdaq_100_tickers[:100]
-            
-        elif index_name == "S&P 500":
-            # Get S&P 500 constituents
-            url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-            response = requests.get(url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            table = soup.find('table', {'id': 'constituents'})
-            tickers = []
-            
-            if table:
-                rows = table.find_all('tr')[1:]  # Skip header
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 1:
-                        ticker = cells[0].text.strip()
-                        if ticker:
-                            tickers.append(ticker)
-            
-            return tickers[:500]  # Ensure exactly 500
-            
-        elif index_name == "Dow Jones":
-            # Get Dow Jones 30 constituents
-            url = "https://en.wikipedia.org/wiki/Dow_Jones_Industrial_Average"
-            response = requests.get(url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            table = soup.find('table', {'class': 'wikitable'})
-            tickers = []
-            
-            if table:
-                rows = table.find_all('tr')[1:]  # Skip header
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 2:
-                        ticker = cells[1].text.strip()
-                        if ticker:
-                            tickers.append(ticker)
-            
-            return tickers[:30]  # Ensure exactly 30
-            
 
-        
-        else:
-            # For other indices, use the existing hardcoded lists as fallback
-            return STOCK_INDICES.get(index_name, STOCK_INDICES["Fortune 500"])
-            
-    except Exception as e:
-        st.error(f"Error fetching authentic {index_name} data: {str(e)}")
-        # Fallback to existing lists
-        return STOCK_INDICES.get(index_name, STOCK_INDICES["Fortune 500"])
+    Scraped lists are cached on disk (see index_constituents); the bundled
+    lists are used when no scraped list is available.
+    """
+    index_name = canonical_index_name(index_name)
+    snapshot = INDEX_SNAPSHOTS.get(index_name, STOCK_INDICES["Fortune 500"])
+    return get_index_constituents(index_name, snapshot)
 
-def get_top_stocks(max_stocks=5, max_tickers=500, progress_callback=None, index_name="Fortune 500"):
+def get_top_stocks(max_stocks=5, max_tickers=500, progress_callback=None, index_name="Fortune 500",
+                   scan_mode=None, fetch_workers=None, compute_workers=None, concurrency=None,
+                   leaderboard_callback=None, store=None):
     """
     Analyze stocks from the selected index and return the top stocks with highest buy ratings
     
@@ -441,85 +430,239 @@ def get_top_stocks(max_stocks=5, max_tickers=500, progress_callback=None, index_
         Callback function to update progress
     index_name : str
         Name of the stock index to analyze (must be a key in STOCK_INDICES)
+    scan_mode : str, optional
+        Executor layout, one of scan_engine.SCAN_MODES ('thread', 'process', 'hybrid', 'stream')
+    fetch_workers : int, optional
+        Number of threads fetching company info
+    compute_workers : int, optional
+        Number of processes computing ratings in the 'process' and 'hybrid' modes
+    concurrency : int, optional
+        Number of fetch threads in the 'stream' mode
+    leaderboard_callback : function, optional
+        Called with the provisional top stocks (best first) whenever a finished
+        ticker changes them
+    store : ScanStore, optional
+        Scan store holding per-ticker fingerprints; when given, only tickers
+        whose scoring inputs changed since the last scan are rescored
     
     Returns:
     --------
     list
-        List of top stock dictionaries sorted by buy rating
+        List of top stock dictionaries sorted by buy rating (ties by ticker)
     """
-
-    
-    # Get authentic tickers for the selected index
-    tickers_to_analyze = get_authentic_index_tickers(index_name)
-    
     # Show a progress bar
     progress_container = st.empty()
     progress_bar = progress_container.progress(0)
     
-    analyzed_stocks = []
-    total_tickers = len(tickers_to_analyze)
-    completed = 0
-    
-    # Use ThreadPoolExecutor for parallel processing
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        # Submit all tasks
-        future_to_ticker = {executor.submit(analyze_ticker, ticker): ticker for ticker in tickers_to_analyze}
-        
-        # Process results as they complete
-        for future in as_completed(future_to_ticker):
-            ticker = future_to_ticker[future]
-            try:
-                result = future.result()
-                if result:  # If analysis was successful
-                    analyzed_stocks.append(result)
-            except Exception as e:
-                st.error(f"Error analyzing {ticker}: {str(e)}")
-            
-            # Update progress
-            completed += 1
-            progress_percentage = completed / total_tickers
-            
-            # Update progress bar or use callback
-            if progress_callback:
-                progress_callback(progress_percentage)
-            else:
-                progress_bar.progress(progress_percentage)
+    top_stocks = scan_index(
+        index_name,
+        max_stocks=max_stocks,
+        progress_callback=progress_callback or progress_bar.progress,
+        leaderboard_callback=leaderboard_callback,
+        scan_mode=scan_mode,
+        fetch_workers=fetch_workers,
+        compute_workers=compute_workers,
+        concurrency=concurrency,
+        store=store
+    )
     
     # Remove the progress bar when done
     progress_container.empty()
     
-    # Sort by buy rating
-    sorted_stocks = sorted(analyzed_stocks, key=lambda x: x['buy_rating'], reverse=True)
-    
-    # Get top N unique stocks (prevent duplicates and same companies)
-    top_stocks = []
-    seen_tickers = set()
-    seen_companies = set()
+    return top_stocks
+
+def scan_index(index_name, max_stocks=5, progress_callback=None, leaderboard_callback=None,
+               scan_mode=None, fetch_workers=None, compute_workers=None, concurrency=None,
+               store=None):
+    """
+    Scan an index and return its top stocks without touching the Streamlit page
     
-    # Define company groups that should be treated as the same entity
-    company_groups = {
-        'GOOGL': 'ALPHABET',
-        'GOOG': 'ALPHABET',
-        'BRK.A': 'BERKSHIRE',
-        'BRK.B': 'BERKSHIRE',
-    }
+    Safe to call from a background thread; get_top_stocks adds the progress bar
+    on top of this. Parameters and return value are as for get_top_stocks.
     
-    for stock in sorted_stocks:
-        ticker = stock['ticker']
+    With a ScanStore, the scan is incremental: each ticker's scoring inputs
+    (the scoring info fields and signal counts, plus the scoring version) are
+    fingerprinted, tickers whose fingerprint matches the previous
+    scan are rated by rescoring their stored inputs with the batch scorer, and
+    only changed tickers are analyzed again.
+    """
+    # One trace per scan, with the fetch and compute steps of every ticker under it
+    with trace('scan', index=index_name) as scan_span:
+        scan_started = time.perf_counter()
+        
+        # Get authentic tickers for the selected index
+        with span('scan.constituents'):
+            tickers_to_analyze = get_authentic_index_tickers(index_name)
+        scan_span.set_attribute('tickers', len(tickers_to_analyze))
+        
+        # Prefetch one year of history for the whole index in a few bulk requests
+        history_panel = download_history_panel(tickers_to_analyze, '1y')
         
-        # Check if this ticker represents a company we've already included
-        company_key = company_groups.get(ticker, ticker)
+        # Technical signals for every ticker in one column-wise pass over the closes
+        panel_signals = None
+        if not history_panel.empty:
+            close_panel = history_panel.xs('Close', axis=1, level=1, drop_level=True)
+            panel_signals = TechnicalAnalysis.get_panel_signals(close_panel)
         
-        if ticker not in seen_tickers and company_key not in seen_companies:
-            top_stocks.append(stock)
-            seen_tickers.add(ticker)
-            seen_companies.add(company_key)
+        def fetch_ticker_data(ticker):
+            """Company info plus the ticker's slice of the prefetched panel"""
+            with span('scan.fetch', ticker=ticker):
+                return {
+                    'info': get_company_info(ticker),
+                    'history': slice_history_panel(history_panel, ticker),
+                    'technical_signals': panel_signals_for(panel_signals, ticker),
+                }
+        
+        # Fingerprints and scoring inputs from the previous scan of this index;
+        # the stored inputs are rescored in one batch, so rating logic changed
+        # since then applies without analyzing the tickers again
+        previous_state = store.load_ticker_state(index_name) if store is not None else {}
+        stored_ratings = rescore_inputs({
+            ticker: inputs for ticker, (_, _, inputs) in previous_state.items() if inputs is not None
+        })
+        fingerprints = {}
+        ticker_inputs = {}
+        unchanged = []
+        # Unchanged tickers found by the fetch threads, not yet on the live leaderboard
+        unchanged_found = deque()
+        
+        def fetch_changed_ticker_data(ticker):
+            """Like fetch_ticker_data, but None when the ticker's scoring inputs are unchanged"""
+            payload = fetch_ticker_data(ticker)
+            history = payload['history']
+            if payload['technical_signals'] is None or history is None or history.empty:
+                return payload
+            
+            inputs = ticker_inputs[ticker] = scoring_inputs(payload['info'], payload['technical_signals'])
+            fingerprint = fingerprints[ticker] = scoring_fingerprint(inputs)
             
-            # Stop when we have enough unique stocks
+            previous = previous_state.get(ticker)
+            if previous is not None and previous[0] == fingerprint and ticker in stored_ratings:
+                stock = {
+                    'ticker': ticker,
+                    'name': payload['info'].get('shortName', ticker),
+                    'buy_rating': stored_ratings[ticker],
+                    'stored_rating': True,
+                }
+                unchanged.append(stock)
+                unchanged_found.append(stock)
+                return None
+            return payload
+        
+        # Keep only the running top N, one entry per company: the live
+        # leaderboard ranks every rating, stored or fresh; `analyzed` keeps
+        # only full results for the final pick of an incremental scan
+        selector = TopKSelector(max_stocks)
+        analyzed = TopKSelector(max_stocks)
+        new_state = {}
+        
+        def offer(stock):
+            if selector.offer(stock) and leaderboard_callback:
+                leaderboard_callback(selector.leaderboard())
+        
+        def offer_unchanged():
+            # Runs on the calling thread, like every leaderboard update
+            while unchanged_found:
+                offer(unchanged_found.popleft())
+        
+        def collect_result(ticker, result):
+            if ticker in fingerprints:
+                new_state[ticker] = (fingerprints[ticker], result['buy_rating'], ticker_inputs[ticker])
+            analyzed.offer(result)
+            offer(result)
+        
+        def report_progress(fraction):
+            offer_unchanged()
+            if progress_callback:
+                progress_callback(fraction)
+        
+        # Fetch on threads; compute on threads or a process pool depending on the mode
+        engine = ScanEngine(
+            mode=scan_mode,
+            fetch_workers=fetch_workers,
+            compute_workers=compute_workers,
+            concurrency=concurrency
+        )
+        with span('scan.engine', mode=engine.mode):
+            engine.run(
+                tickers_to_analyze,
+                fetch_changed_ticker_data if store is not None else fetch_ticker_data,
+                analyze_ticker,
+                progress_callback=report_progress,
+                on_result=collect_result
+            )
+        offer_unchanged()
+        
+        if engine.errors:
+            scan_span.set_attribute('errors', len(engine.errors))
+            print(f"{len(engine.errors)} of {len(tickers_to_analyze)} {index_name} tickers failed to scan")
+        record_scan(index_name, engine.mode, len(tickers_to_analyze), len(engine.errors), time.perf_counter() - scan_started)
+        
+        if store is None:
+            # Sorted by buy rating with ties broken by ticker, so the order never depends on worker timing
+            return selector.leaderboard()
+        
+        # Keep the unchanged tickers with their rescored ratings
+        for stock in unchanged:
+            ticker = stock['ticker']
+            new_state[ticker] = (fingerprints[ticker], stock['buy_rating'], ticker_inputs[ticker])
+        store.save_ticker_state(index_name, new_state)
+        
+        # Pick the winners from the analyzed results and every unchanged ticker,
+        # best first. Winners that kept a stored rating still need their full
+        # result for display; one that fails is passed over for the next candidate
+        candidates = sorted(analyzed.leaderboard() + unchanged, key=lambda x: (-x['buy_rating'], x['ticker']))
+        top_stocks = []
+        companies = set()
+        for stock in candidates:
             if len(top_stocks) >= max_stocks:
                 break
+            company = selector.company_groups.get(stock['ticker'], stock['ticker'])
+            if company in companies:
+                continue
+            if stock.get('stored_rating'):
+                ticker = stock['ticker']
+                try:
+                    stock = analyze_ticker(ticker, **fetch_ticker_data(ticker))
+                except Exception as e:
+                    engine.errors[ticker] = str(e)
+                    print(f"Error analyzing {ticker}: {str(e)}")
+                    continue
+            if stock:
+                top_stocks.append(stock)
+                companies.add(company)
+        
+        return sorted(top_stocks, key=lambda x: (-x['buy_rating'], x['ticker']))
+
+def leaderboard_display(placeholder):
+    """
+    Build a get_top_stocks leaderboard_callback that shows partial winners mid-scan
     
-    return top_stocks
+    Parameters:
+    -----------
+    placeholder : streamlit element
+        Empty container (from st.empty()) that is redrawn with each provisional leaderboard
+    
+    Returns:
+    --------
+    function
+        Callback taking the provisional list of top stocks
+    """
+    def show_leaderboard(stocks):
+        rows = [
+            {
+                'Rank': rank,
+                'Ticker': stock['ticker'],
+                'Company': stock['name'],
+                'Buy Rating': stock['buy_rating'],
+            }
+            for rank, stock in enumerate(stocks, 1)
+        ]
+        with placeholder.container():
+            st.caption("Leaders so far")
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+    
+    return show_leaderboard
 
 def display_power_plays():
     """
@@ -566,11 +709,14 @@ def display_power_plays():
     # Handle button clicks
     if run_button:
         with st.spinner(f"Analyzing {selected_index} stocks to find the best opportunities..."):
+            leaderboard_placeholder = st.empty()
             st.session_state.power_plays_results = get_top_stocks(
                 max_stocks=5, 
                 max_tickers=500,
-                index_name=selected_index
+                index_name=selected_index,
+                leaderboard_callback=leaderboard_display(leaderboard_placeholder)
             )
+            leaderboard_placeholder.empty()
     
     # Display results only if we have them
     top_stocks = st.session_state.power_plays_results
@@ -588,16 +734,9 @@ def display_power_plays():
             st.markdown(f"## #{i+1} - {ticker}")
             
             try:
-                import yfinance as yf
-                from utils import format_large_number
-                
-                stock_obj = yf.Ticker(ticker)
-                company_info = stock_obj.info
-                
-                # Get individual scores from analyzer
-                from stock_analyzer import StockAnalyzer
-                analyzer = StockAnalyzer(ticker)
-                buy_rating_calc, rating_breakdown = analyzer.calculate_buy_rating()
+                # Everything below renders from the scan result; nothing is fetched again
+                company_info = stock.get('info') or {}
+                rating_breakdown = stock.get('rating_components', {})
                 
                 technical_score = rating_breakdown.get('Technical Analysis', {}).get('score', 5)
                 fundamental_score = rating_breakdown.get('Fundamental Analysis', {}).get('score', 5)
@@ -0,0 +1,283 @@
+"""
+Persistent on-disk store of daily OHLCV history, one file per ticker
+Stored histories are extended incrementally, so reruns only download the newest bars
+"""
+import os
+import re
+import time
+import threading
+import importlib.util
+import pandas as pd
+from metrics import record_cache
+
+# Calendar length of the standard Yahoo periods, used to slice a shorter period
+# out of an already downloaded longer history instead of requesting it again
+PERIOD_OFFSETS = {
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+}
+
+# Directory holding the price files; set TICKER_AI_PRICE_STORE to an empty string to disable
+PRICE_STORE_DIR = os.environ.get("TICKER_AI_PRICE_STORE", os.path.join(".cache", "prices"))
+
+# Seconds after a write during which a stored history is served without checking for new bars
+PRICE_STORE_REFRESH_SECONDS = int(os.environ.get("TICKER_AI_PRICE_REFRESH_SECONDS", "900"))
+
+# Relative difference between a stored and a downloaded price for the same
+# bar that means Yahoo has re-adjusted the history (a split or dividend)
+ADJUSTMENT_TOLERANCE = float(os.environ.get("TICKER_AI_PRICE_ADJUSTMENT_TOLERANCE", "1e-4"))
+
+# Parquet needs pyarrow; fall back to pickle files when it isn't installed
+USE_PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+class PriceStore:
+    """
+    Columnar price store keyed by ticker
+
+    Each ticker's daily bars live in one file. A request for a period the file
+    already covers only downloads the bars after the last stored date and
+    appends them; a period reaching further back than the file is downloaded
+    in full and merged in. Yahoo prices are split and dividend adjusted, so
+    when a downloaded bar disagrees with the stored bar for the same date the
+    whole period is downloaded again and replaces the file.
+    """
+
+    def __init__(self, directory=PRICE_STORE_DIR, refresh_seconds=PRICE_STORE_REFRESH_SECONDS):
+        """
+        Initialize PriceStore
+
+        Parameters:
+        -----------
+        directory : str
+            Directory holding one price file per ticker
+        refresh_seconds : int
+            How long after a write the stored bars are considered current
+        """
+        self.directory = directory
+        self.refresh_seconds = refresh_seconds
+        self.extension = ".parquet" if USE_PARQUET else ".pkl"
+
+    def _path(self, ticker):
+        """File path for a ticker, with characters unsafe in file names replaced"""
+        safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker.upper())
+        return os.path.join(self.directory, safe_ticker + self.extension)
+
+    def load(self, ticker):
+        """
+        Load the stored history for a ticker
+
+        Returns:
+        --------
+        pandas.DataFrame or None
+            Stored daily bars, or None if nothing usable is stored
+        """
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            if USE_PARQUET:
+                data = pd.read_parquet(path)
+            else:
+                data = pd.read_pickle(path)
+        except Exception as e:
+            print(f"Error reading stored prices for {ticker}: {str(e)}")
+            return None
+
+        if data.empty:
+            return None
+        return data
+
+    def save(self, ticker, data):
+        """Write a ticker's history, replacing the file atomically"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(ticker)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            if USE_PARQUET:
+                data.to_parquet(tmp_path)
+            else:
+                data.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error writing stored prices for {ticker}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def is_fresh(self, ticker):
+        """Whether the stored file was written recently enough to skip an update check"""
+        try:
+            age = time.time() - os.path.getmtime(self._path(ticker))
+        except OSError:
+            return False
+        return age < self.refresh_seconds
+
+    def plan(self, ticker, timeframe):
+        """
+        Decide how to serve a timeframe for a ticker
+
+        Parameters:
+        -----------
+        ticker : str
+            Ticker symbol
+        timeframe : str
+            Yahoo period (e.g., '1y'); must be a key of PERIOD_OFFSETS
+
+        Returns:
+        --------
+        tuple
+            ('fresh', stored) when the stored bars can be served as they are,
+            ('update', stored) when only bars after the last stored date are
+            needed, or ('full', stored_or_None) when the period must be downloaded
+        """
+        stored = self.load(ticker)
+        if stored is None:
+            record_cache('price_store', 'miss')
+            return 'full', None
+
+        offset = PERIOD_OFFSETS[timeframe]
+        # Allow a few days of slack: the first bar of a period often falls
+        # on the trading day after the calendar start date
+        if stored.index[0] > stored.index[-1] - offset + pd.Timedelta(days=5):
+            record_cache('price_store', 'miss')
+            return 'full', stored
+
+        if self.is_fresh(ticker):
+            record_cache('price_store', 'hit')
+            return 'fresh', stored
+        # Only the newest bars are downloaded
+        record_cache('price_store', 'stale')
+        return 'update', stored
+
+    def merge(self, ticker, stored, new_data):
+        """
+        Merge downloaded bars into the stored history and save the result
+
+        Downloaded bars replace stored bars for the same dates, which refreshes
+        a partial bar for the current session. Pass stored=None to replace the
+        stored history outright.
+
+        Returns:
+        --------
+        pandas.DataFrame
+            The merged history
+        """
+        new_data = normalize_history(new_data)
+
+        if stored is None or stored.empty:
+            merged = new_data
+        elif new_data.empty:
+            merged = stored
+        else:
+            columns = [column for column in stored.columns if column in new_data.columns]
+            merged = pd.concat([stored[columns], new_data[columns]])
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+
+        if not merged.empty:
+            self.save(ticker, merged)
+        return merged
+
+    def get_history(self, ticker, timeframe, fetch):
+        """
+        Get a ticker's history for a timeframe, downloading only what is missing
+
+        Parameters:
+        -----------
+        ticker : str
+            Ticker symbol
+        timeframe : str
+            Yahoo period (e.g., '1y'); must be a key of PERIOD_OFFSETS
+        fetch : callable
+            fetch(period=...) or fetch(start=...) returning a history DataFrame
+
+        Returns:
+        --------
+        pandas.DataFrame
+            Daily bars covering the timeframe
+        """
+        action, stored = self.plan(ticker, timeframe)
+
+        if action == 'fresh':
+            data = stored
+        elif action == 'update':
+            # The download starts at the last stored date, so it overlaps the stored bars by one
+            start = stored.index[-1].strftime('%Y-%m-%d')
+            new_data = fetch(start=start)
+            if adjustments_changed(stored, new_data):
+                data = self.merge(ticker, None, fetch(period=timeframe))
+                if data.empty:
+                    data = self.merge(ticker, stored, new_data)
+            else:
+                data = self.merge(ticker, stored, new_data)
+        else:
+            data = self.merge(ticker, stored, fetch(period=timeframe))
+
+        return trim_history(data, timeframe)
+
+def normalize_history(data):
+    """Keep only OHLCV columns and use a timezone-naive daily index"""
+    if data is None or isinstance(data, dict) or data.empty:
+        return pd.DataFrame()
+
+    columns = [column for column in ['Open', 'High', 'Low', 'Close', 'Volume'] if column in data.columns]
+    data = data[columns].dropna(how='all')
+
+    index = pd.DatetimeIndex(data.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    data = data.copy()
+    data.index = index.normalize()
+    data.index.name = 'Date'
+    return data
+
+def adjustments_changed(stored, new_data):
+    """
+    Whether downloaded bars disagree with stored bars for the same dates
+
+    Opens are compared because a partial bar for the current session keeps
+    its open while its close, high, low and volume still move; an adjustment
+    for a split or dividend rescales every open before its date.
+
+    Parameters:
+    -----------
+    stored : pandas.DataFrame
+        Stored history
+    new_data : pandas.DataFrame
+        Downloaded bars, overlapping the stored history
+
+    Returns:
+    --------
+    bool
+        True if the stored history must be downloaded again
+    """
+    new_data = normalize_history(new_data)
+    if stored is None or stored.empty or new_data.empty or 'Open' not in new_data.columns or 'Open' not in stored.columns:
+        return False
+
+    dates = stored.index.intersection(new_data.index)
+    if dates.empty:
+        return False
+    old_open = stored.loc[dates, 'Open']
+    new_open = new_data.loc[dates, 'Open']
+    valid = old_open.notna() & new_open.notna() & (old_open != 0)
+    if not valid.any():
+        return False
+    difference = ((new_open[valid] - old_open[valid]) / old_open[valid]).abs()
+    return bool((difference > ADJUSTMENT_TOLERANCE).any())
+
+def trim_history(data, timeframe):
+    """Cut a stored history down to the requested timeframe"""
+    if data is None or data.empty:
+        return pd.DataFrame()
+
+    start = data.index[-1] - PERIOD_OFFSETS[timeframe]
+    return data[data.index >= start]
+
+# Process-wide store, or None when disabled
+PRICE_STORE = PriceStore() if PRICE_STORE_DIR else None
@@ -0,0 +1,218 @@
+"""
+Remote symbol search behind an LRU cache
+Lookups run in the background with a bounded wait, so a slow upstream never holds up the page while the user types
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, CancelledError, TimeoutError as FutureTimeoutError
+from metrics import record_cache
+
+# Queries whose results are kept, and seconds before a cached result is fetched again
+REMOTE_SEARCH_CACHE_SIZE = int(os.environ.get("TICKER_AI_REMOTE_SEARCH_CACHE_SIZE", "512"))
+REMOTE_SEARCH_TTL = float(os.environ.get("TICKER_AI_REMOTE_SEARCH_TTL", "3600"))
+
+# Seconds a search waits for the upstream before answering without it; the fetch carries on in the background
+REMOTE_SEARCH_WAIT = float(os.environ.get("TICKER_AI_REMOTE_SEARCH_WAIT", "0.3"))
+
+# Timeout of the upstream request itself, in seconds
+REMOTE_SEARCH_TIMEOUT = float(os.environ.get("TICKER_AI_REMOTE_SEARCH_TIMEOUT", "3"))
+
+# Seconds a failed lookup is remembered as having no results, so it is not retried on every rerun
+REMOTE_SEARCH_FAILURE_TTL = float(os.environ.get("TICKER_AI_REMOTE_SEARCH_FAILURE_TTL", "60"))
+
+# Seconds between checks by a page waiting for a background lookup to finish
+REMOTE_SEARCH_POLL_SECONDS = float(os.environ.get("TICKER_AI_REMOTE_SEARCH_POLL_SECONDS", "0.5"))
+
+# Background fetches running at once; queued fetches overtaken by a longer query are dropped
+REMOTE_SEARCH_WORKERS = int(os.environ.get("TICKER_AI_REMOTE_SEARCH_WORKERS", "2"))
+
+def normalize_query(query):
+    """Cache key of a query: lower case with runs of whitespace collapsed"""
+    return " ".join(query.lower().split())
+
+def _matches(quote, query):
+    """Whether a cached quote still matches a longer query"""
+    symbol = str(quote.get('symbol', ''))
+    name = str(quote.get('shortname', '')).lower()
+    return symbol.lower().startswith(query) or query in name
+
+class RemoteSearch:
+    """
+    Cached, non-blocking symbol search against an upstream
+
+    A cached query is answered at once. Otherwise the fetch is started in the
+    background and waited on for at most `wait` seconds; if it has not
+    returned by then, the search answers from the longest cached prefix of
+    the query (results for 'app' filtered down for 'appl') and the fetch
+    fills the cache for the next lookup; is_pending() tells a page when to
+    look again. A failed fetch is cached as no results for a short while.
+    Each cached query remembers how many quotes were asked for, so a search
+    wanting more than that fetches again. While the user keeps typing, a fetch
+    still queued for an earlier form of the query is cancelled, so only the
+    latest query reaches the upstream.
+    """
+
+    def __init__(self, fetch, cache_size=REMOTE_SEARCH_CACHE_SIZE, ttl=REMOTE_SEARCH_TTL,
+                 wait=REMOTE_SEARCH_WAIT, timeout=REMOTE_SEARCH_TIMEOUT, workers=REMOTE_SEARCH_WORKERS):
+        """
+        Initialize RemoteSearch
+
+        Parameters:
+        -----------
+        fetch : callable
+            fetch(query, count, timeout) returning a list of quote dictionaries
+            with 'symbol' and 'shortname'
+        cache_size : int
+            Queries kept in the LRU cache
+        ttl : float
+            Seconds a cached result stays fresh
+        wait : float
+            Seconds a search waits for a fetch before answering without it
+        timeout : float
+            Timeout passed to the fetch, in seconds
+        workers : int
+            Background fetches running at once
+        """
+        self.fetch = fetch
+        self.cache_size = cache_size
+        self.ttl = ttl
+        self.wait = wait
+        self.timeout = timeout
+
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="remote-search")
+
+    def cached(self, key, count=None):
+        """
+        Fresh cached quotes for a normalized query, or None
+
+        With a count, quotes fetched for fewer than `count` are treated as
+        missing, unless the upstream returned fewer than it was asked for
+        (then it has no more to give).
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            stored_at, quotes, ttl, fetched_count = entry
+            if time.time() - stored_at > ttl:
+                del self._cache[key]
+                return None
+            if count is not None and count > fetched_count and len(quotes) >= fetched_count:
+                return None
+            self._cache.move_to_end(key)
+            return quotes
+
+    def _store(self, key, quotes, count, ttl=None):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[3] > count and time.time() - entry[0] <= entry[2]:
+                # A fresh answer to a larger request is worth more than this one
+                return
+            self._cache[key] = (time.time(), quotes, self.ttl if ttl is None else ttl, count)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def prefix_answer(self, key):
+        """Quotes cached for the longest prefix of a normalized query, filtered to those matching it, or None"""
+        for end in range(len(key) - 1, 0, -1):
+            quotes = self.cached(key[:end])
+            if quotes is not None:
+                return [quote for quote in quotes if _matches(quote, key)]
+        return None
+
+    def _run(self, key, count):
+        try:
+            quotes = self.fetch(key, count, self.timeout)
+        except Exception:
+            self._store(key, [], count, ttl=REMOTE_SEARCH_FAILURE_TTL)
+            raise
+        else:
+            self._store(key, list(quotes), count)
+            return quotes
+        finally:
+            with self._lock:
+                # A fetch for more quotes may have taken this one's place
+                if self._pending.get(key, (None, None))[1] == count:
+                    del self._pending[key]
+
+    def _start(self, key, count):
+        """Future of the fetch for a normalized query, starting one unless one for at least `count` quotes is pending"""
+        with self._lock:
+            future, pending_count = self._pending.get(key, (None, None))
+            if future is not None and pending_count >= count:
+                return future
+
+            # Fetches still queued for a shorter or longer form of this query
+            # were overtaken by typing; drop them before they reach the upstream
+            for other, (queued, _) in list(self._pending.items()):
+                if (key.startswith(other) or other.startswith(key)) and queued.cancel():
+                    del self._pending[other]
+
+            future = self._executor.submit(self._run, key, count)
+            self._pending[key] = (future, count)
+            return future
+
+    def is_pending(self, query):
+        """Whether a background fetch for a query is queued or running"""
+        with self._lock:
+            return normalize_query(query) in self._pending
+
+    def search(self, query, count=10, wait=None):
+        """
+        Quotes matching a query, without waiting longer than `wait` for the upstream
+
+        Parameters:
+        -----------
+        query : str
+            Search query
+        count : int
+            Maximum number of quotes to fetch
+        wait : float, optional
+            Seconds to wait for a fetch (defaults to the instance's wait)
+
+        Returns:
+        --------
+        list
+            Quote dictionaries; possibly a prefix answer or empty when the
+            upstream is slow or failing
+        """
+        key = normalize_query(query)
+        if not key:
+            return []
+
+        quotes = self.cached(key, count)
+        if quotes is not None:
+            record_cache('remote_search', 'hit')
+            return quotes[:count]
+
+        future = self._start(key, count)
+        try:
+            quotes = future.result(timeout=self.wait if wait is None else wait)
+            record_cache('remote_search', 'miss')
+            return quotes[:count]
+        except (FutureTimeoutError, CancelledError):
+            # Still running, or dropped for a longer query typed meanwhile
+            pass
+        except Exception as e:
+            print(f"Error searching remote symbols for '{query}': {str(e)}")
+
+        quotes = self.prefix_answer(key)
+        if quotes is not None:
+            record_cache('remote_search', 'prefix')
+            return quotes[:count]
+        record_cache('remote_search', 'miss')
+        return []
+
+def _backend_search(query, count, timeout):
+    # Resolved on each call, so a backend swapped in by set_backend() is used
+    from data_backend import get_backend
+    return get_backend().search(query, count=count, timeout=timeout)
+
+# Shared by every session in the process, so one user's lookups warm the cache for the rest
+REMOTE_SEARCH = RemoteSearch(_backend_search)
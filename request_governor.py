@@ -0,0 +1,312 @@
+"""
+Shared governor for outbound requests to upstream data providers
+Calls are paced by a token bucket, retried with jittered backoff when throttled, and fail fast while the upstream is down
+"""
+import os
+import time
+import random
+import threading
+import importlib.util
+import requests
+from yfinance.exceptions import YFRateLimitError
+from metrics import observe_upstream
+
+# Sustained requests per second to one upstream, and how many may go out back to back
+UPSTREAM_RATE = float(os.environ.get("TICKER_AI_UPSTREAM_RATE", "8"))
+UPSTREAM_BURST = int(os.environ.get("TICKER_AI_UPSTREAM_BURST", "16"))
+
+# Retries after a throttled or failed call; each waits a random time up to an exponentially growing cap
+UPSTREAM_RETRIES = int(os.environ.get("TICKER_AI_UPSTREAM_RETRIES", "3"))
+UPSTREAM_BACKOFF = float(os.environ.get("TICKER_AI_UPSTREAM_BACKOFF", "0.5"))
+UPSTREAM_MAX_BACKOFF = float(os.environ.get("TICKER_AI_UPSTREAM_MAX_BACKOFF", "30"))
+
+# Consecutive failures that open the circuit, and seconds it stays open before a probe call
+BREAKER_THRESHOLD = int(os.environ.get("TICKER_AI_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("TICKER_AI_BREAKER_COOLDOWN", "30"))
+
+# Default timeout for raw HTTP requests, in seconds
+UPSTREAM_TIMEOUT = float(os.environ.get("TICKER_AI_UPSTREAM_TIMEOUT", "10"))
+
+# HTTP statuses worth retrying: throttling and server-side failures
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Network errors worth retrying; yfinance talks through curl_cffi, the raw calls through requests
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout)
+if importlib.util.find_spec("curl_cffi") is not None:
+    from curl_cffi.requests import exceptions as curl_exceptions
+    TRANSIENT_ERRORS += (curl_exceptions.ConnectionError, curl_exceptions.Timeout)
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open"""
+
+class UpstreamStatusError(Exception):
+    """An HTTP response with a retryable status, raised so the governor retries it"""
+
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code} from {response.url}")
+        self.response = response
+
+def is_retryable(error):
+    """Whether an error means the upstream is throttling us or temporarily unavailable"""
+    if isinstance(error, (YFRateLimitError, UpstreamStatusError) + TRANSIENT_ERRORS):
+        return True
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) in RETRY_STATUSES
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Tokens refill continuously at `rate` per second up to `burst`; acquire()
+    blocks until enough tokens are available. A request costing more than the
+    bucket holds is taken in burst-sized slices, so it is charged in full and
+    a bulk call of n requests takes as long as n single calls. A rate of 0
+    disables pacing.
+    """
+
+    def __init__(self, rate=UPSTREAM_RATE, burst=UPSTREAM_BURST):
+        self.rate = rate
+        self.burst = max(1, burst)
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Take tokens, sleeping until they are available"""
+        if self.rate <= 0:
+            return
+
+        while tokens > 0:
+            # More than the bucket holds would never fit at once; take it a bucketful at a time
+            needed = min(tokens, self.burst)
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= needed:
+                    self._tokens -= needed
+                    tokens -= needed
+                    continue
+                wait = (needed - self._tokens) / self.rate
+            time.sleep(wait)
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker
+
+    After `threshold` consecutive failures the circuit opens and every call
+    is refused for `cooldown` seconds. Then a single probe call is let
+    through: success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go out now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probing = False
+            # Half-open: only one probe at a time
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        """Count a failure; returns True if it opened the circuit"""
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self._failures >= self.threshold:
+                opened = self.state != self.OPEN
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                return opened
+            return False
+
+class RequestGovernor:
+    """
+    Rate limiting, retries and circuit breaking for one upstream
+
+    Every call first checks the circuit breaker, then takes a token from the
+    bucket. Throttling (429), server errors (5xx) and network errors are
+    retried with full-jitter exponential backoff, honouring Retry-After when
+    the response carries one; they also count towards opening the circuit.
+    Any other error is the upstream answering normally (e.g., an unknown
+    ticker) and is raised straight away.
+    """
+
+    def __init__(self, name, rate=UPSTREAM_RATE, burst=UPSTREAM_BURST, retries=UPSTREAM_RETRIES,
+                 backoff=UPSTREAM_BACKOFF, max_backoff=UPSTREAM_MAX_BACKOFF,
+                 threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        """
+        Initialize RequestGovernor
+
+        Parameters:
+        -----------
+        name : str
+            Upstream name used in error messages
+        rate : float
+            Sustained calls per second; 0 disables pacing
+        burst : int
+            Calls that may go out back to back
+        retries : int
+            Retries after a retryable failure
+        backoff : float
+            Base delay in seconds; attempt n waits up to backoff * 2**n
+        max_backoff : float
+            Upper bound for a single delay in seconds
+        threshold : int
+            Consecutive failures that open the circuit
+        cooldown : float
+            Seconds the circuit stays open
+        """
+        self.name = name
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(threshold, cooldown)
+
+    def call(self, fn, *args, cost=1, endpoint=None, **kwargs):
+        """
+        Call fn(*args, **kwargs) under the governor
+
+        Parameters:
+        -----------
+        fn : callable
+            Function making the upstream request
+        cost : int
+            Tokens the call consumes (e.g., the number of tickers in a bulk download)
+        endpoint : str, optional
+            Label for the call in the upstream metrics (e.g., 'history');
+            defaults to the function's name
+
+        Returns:
+        --------
+        object
+            Whatever fn returns
+
+        Raises:
+        -------
+        CircuitOpenError
+            If the upstream's circuit is open
+        """
+        endpoint = endpoint or getattr(fn, '__name__', 'call')
+
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow():
+                observe_upstream(self.name, endpoint, 'circuit_open', 0.0)
+                raise CircuitOpenError(f"{self.name} is unavailable, not calling it for now")
+            self.bucket.acquire(cost)
+
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                retryable = is_retryable(e)
+                observe_upstream(self.name, endpoint, 'retryable' if retryable else 'error', time.perf_counter() - started)
+                if not retryable:
+                    self.breaker.record_success()
+                    raise
+                if self.breaker.record_failure():
+                    print(f"{self.name} failing ({str(e)}), circuit open for {self.breaker.cooldown:g}s")
+                if attempt == self.retries:
+                    raise
+                time.sleep(self._delay(attempt, e))
+                continue
+
+            observe_upstream(self.name, endpoint, 'ok', time.perf_counter() - started)
+            self.breaker.record_success()
+            return result
+
+    def request(self, method, url, endpoint=None, session=None, **kwargs):
+        """
+        Send an HTTP request under the governor
+
+        Takes the same arguments as requests.request, with a default timeout,
+        plus an endpoint label for the metrics (defaults to the method) and an
+        optional requests.Session to send it through, reusing its connections.
+        Retryable statuses are retried; once retries are exhausted the last
+        response is returned so callers can inspect its status as usual.
+        Raises CircuitOpenError while the upstream's circuit is open.
+        """
+        kwargs.setdefault('timeout', UPSTREAM_TIMEOUT)
+        sender = session if session is not None else requests
+
+        def send():
+            response = sender.request(method, url, **kwargs)
+            if response.status_code in RETRY_STATUSES:
+                raise UpstreamStatusError(response)
+            return response
+
+        try:
+            return self.call(send, endpoint=endpoint or method)
+        except UpstreamStatusError as e:
+            return e.response
+
+    def get(self, url, endpoint=None, session=None, **kwargs):
+        """GET request under the governor"""
+        return self.request('GET', url, endpoint=endpoint, session=session, **kwargs)
+
+    def backoff_delay(self, attempt):
+        """Seconds to wait before retry number `attempt` (from 0) when the upstream gave no Retry-After"""
+        # Full jitter keeps concurrent workers from retrying in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _delay(self, attempt, error):
+        """Seconds to wait before the next attempt"""
+        response = getattr(error, 'response', None)
+        retry_after = getattr(response, 'headers', {}).get('Retry-After') if response is not None else None
+        try:
+            return min(self.max_backoff, float(retry_after))
+        except (TypeError, ValueError):
+            pass
+        return self.backoff_delay(attempt)
+
+# One governor per upstream, shared by every thread and session in the process
+_GOVERNORS = {}
+_GOVERNORS_LOCK = threading.Lock()
+
+def get_governor(name='yahoo'):
+    """
+    Get the process-wide governor for an upstream
+
+    Parameters:
+    -----------
+    name : str
+        Upstream name (e.g., 'yahoo'); each name has its own bucket and breaker
+
+    Returns:
+    --------
+    RequestGovernor
+    """
+    with _GOVERNORS_LOCK:
+        governor = _GOVERNORS.get(name)
+        if governor is None:
+            governor = _GOVERNORS[name] = RequestGovernor(name)
+        return governor
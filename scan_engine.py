@@ -0,0 +1,232 @@
+"""
+Scan engine for running a per-ticker analysis over a whole index
+Data is fetched on a thread pool; the compute stage runs on the same threads, a process pool, or on the caller as results stream in
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from tracing import propagate
+
+# Executor layouts: 'thread' fetches and computes on the same threads, 'process'
+# fetches everything on threads and then computes on a process pool, 'hybrid'
+# hands each ticker to the process pool as soon as its data has arrived, and
+# 'stream' runs many fetches at once on a wide thread pool and scores each
+# ticker on the calling thread as it arrives
+SCAN_MODES = ('thread', 'process', 'hybrid', 'stream')
+
+# Default layout and worker counts, overridable per scan
+SCAN_MODE = os.environ.get("TICKER_AI_SCAN_MODE", "thread")
+SCAN_FETCH_WORKERS = int(os.environ.get("TICKER_AI_SCAN_FETCH_WORKERS", "5"))
+SCAN_COMPUTE_WORKERS = int(os.environ.get("TICKER_AI_SCAN_COMPUTE_WORKERS", str(os.cpu_count() or 1)))
+
+# Fetch threads, and so fetches in flight, in the 'stream' mode
+SCAN_CONCURRENCY = int(os.environ.get("TICKER_AI_SCAN_CONCURRENCY", "64"))
+
+class ScanEngine:
+    """
+    Runs fetch and compute stages for many tickers with a selectable executor
+
+    fetch(ticker) does the I/O and returns a dict of keyword arguments, or None
+    when the ticker needs no computing; compute(ticker, **kwargs) turns the
+    arguments into a result. In the process modes
+    compute must be a module-level function and its arguments picklable. Results
+    come back in input order whatever order the workers finish in.
+    """
+
+    def __init__(self, mode=None, fetch_workers=None, compute_workers=None, concurrency=None):
+        """
+        Initialize ScanEngine
+
+        Parameters:
+        -----------
+        mode : str, optional
+            One of SCAN_MODES; defaults to SCAN_MODE
+        fetch_workers : int, optional
+            Number of fetch threads; defaults to SCAN_FETCH_WORKERS
+        compute_workers : int, optional
+            Number of compute processes; defaults to SCAN_COMPUTE_WORKERS
+        concurrency : int, optional
+            Fetch threads in the 'stream' mode; defaults to SCAN_CONCURRENCY
+        """
+        self.mode = mode or SCAN_MODE
+        if self.mode not in SCAN_MODES:
+            raise ValueError(f"Unknown scan mode '{self.mode}', expected one of {', '.join(SCAN_MODES)}")
+
+        self.fetch_workers = max(1, fetch_workers or SCAN_FETCH_WORKERS)
+        self.compute_workers = max(1, compute_workers or SCAN_COMPUTE_WORKERS)
+        self.concurrency = max(1, concurrency or SCAN_CONCURRENCY)
+
+        # Ticker to error message for the last run
+        self.errors = {}
+
+    def run(self, tickers, fetch, compute, progress_callback=None, on_result=None):
+        """
+        Fetch and compute every ticker
+
+        Parameters:
+        -----------
+        tickers : list
+            Ticker symbols to process
+        fetch : callable
+            fetch(ticker) returning a dict of keyword arguments for compute, or None to skip it
+        compute : callable
+            compute(ticker, **kwargs) returning a result, or None to skip the ticker
+        progress_callback : function, optional
+            Called with the completed fraction (0 to 1) as work finishes
+        on_result : function, optional
+            Called with (ticker, result) on the calling thread as each result
+            arrives; results handed to it are not kept by the engine
+
+        Returns:
+        --------
+        dict
+            Ticker to result in input order; failed and skipped tickers are left
+            out, and the dict is empty when on_result is given
+        """
+        tickers = list(dict.fromkeys(tickers))
+        self.errors = {}
+        results = _ResultSink(on_result)
+
+        if not tickers:
+            return results
+
+        # Thread and stream modes finish both stages of a ticker in one step
+        stages = 1 if self.mode in ('thread', 'stream') else 2
+        total_steps = len(tickers) * stages
+        completed_steps = 0
+
+        def step_done(steps=1):
+            nonlocal completed_steps
+            completed_steps += steps
+            if progress_callback:
+                progress_callback(completed_steps / total_steps)
+
+        if self.mode == 'thread':
+            with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+                # Workers join the caller's trace; the process pool below runs outside it
+                futures = {executor.submit(propagate(_fetch_and_compute), fetch, compute, ticker): ticker for ticker in tickers}
+                for future in as_completed(futures):
+                    self._collect(futures[future], future, results)
+                    step_done()
+            return results.in_order(tickers)
+
+        if self.mode == 'stream':
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="scan-fetch") as executor:
+                for ticker, payload, error in fetch_stream(tickers, fetch, executor):
+                    if error is not None:
+                        self._record_error(ticker, error)
+                    elif payload is not None:
+                        # Scored here while the pool keeps fetching the rest
+                        try:
+                            result = compute(ticker, **payload)
+                        except Exception as e:
+                            self._record_error(ticker, e)
+                            result = None
+                        results.add(ticker, result)
+                    step_done()
+            return results.in_order(tickers)
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as fetch_executor, \
+                ProcessPoolExecutor(max_workers=self.compute_workers) as compute_executor:
+            fetch_futures = {fetch_executor.submit(propagate(fetch), ticker): ticker for ticker in tickers}
+            fetched = {}
+            compute_futures = {}
+
+            for future in as_completed(fetch_futures):
+                ticker = fetch_futures[future]
+                try:
+                    payload = future.result()
+                except Exception as e:
+                    self._record_error(ticker, e)
+                    # A failed fetch skips the compute stage as well
+                    step_done(2)
+                    continue
+                if payload is None:
+                    step_done(2)
+                    continue
+                fetched[ticker] = payload
+                step_done()
+
+                if self.mode == 'hybrid':
+                    compute_futures[compute_executor.submit(compute, ticker, **fetched.pop(ticker))] = ticker
+
+            if self.mode == 'process':
+                # Submit in input order once every fetch is in
+                for ticker in tickers:
+                    if ticker in fetched:
+                        compute_futures[compute_executor.submit(compute, ticker, **fetched.pop(ticker))] = ticker
+
+            for future in as_completed(compute_futures):
+                self._collect(compute_futures[future], future, results)
+                step_done()
+
+        return results.in_order(tickers)
+
+    def _collect(self, ticker, future, results):
+        """Store a finished future's result, recording failures"""
+        try:
+            result = future.result()
+        except Exception as e:
+            self._record_error(ticker, e)
+            return
+        results.add(ticker, result)
+
+    def _record_error(self, ticker, error):
+        """Remember why a ticker failed"""
+        self.errors[ticker] = str(error)
+        print(f"Error scanning {ticker}: {str(error)}")
+
+class _ResultSink:
+    """Collects results, or forwards them to a callback without keeping them"""
+
+    def __init__(self, on_result=None):
+        self.on_result = on_result
+        self.results = {}
+
+    def add(self, ticker, result):
+        if result is None:
+            return
+        if self.on_result is not None:
+            self.on_result(ticker, result)
+        else:
+            self.results[ticker] = result
+
+    def in_order(self, tickers):
+        """Results keyed in input order, independent of completion order"""
+        return {ticker: self.results[ticker] for ticker in tickers if ticker in self.results}
+
+def _fetch_and_compute(fetch, compute, ticker):
+    """Both stages for one ticker on the calling thread"""
+    payload = fetch(ticker)
+    if payload is None:
+        return None
+    return compute(ticker, **payload)
+
+def fetch_stream(tickers, fetch, executor):
+    """
+    Fetch many tickers concurrently and yield each one as soon as it arrives
+
+    Parameters:
+    -----------
+    tickers : list
+        Ticker symbols to fetch
+    fetch : callable
+        Blocking fetch(ticker) function
+    executor : concurrent.futures.Executor
+        Executor running the fetch calls; its worker count bounds the fetches in flight
+
+    Yields:
+    -------
+    tuple
+        (ticker, payload, error) in completion order; error is None on success
+    """
+    futures = {executor.submit(propagate(fetch), ticker): ticker for ticker in tickers}
+    try:
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+    finally:
+        # Stop fetches not yet started when the consumer gives up early
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,148 @@
+"""
+Background scheduler that keeps Power Plays scans precomputed
+A daemon thread rescans each index on a fixed cadence and writes the results to the scan store
+"""
+import os
+import time
+import threading
+from collections import deque
+
+# Indices kept precomputed, comma separated
+SCHEDULED_INDICES = [
+    name.strip()
+    for name in os.environ.get("TICKER_AI_SCHEDULED_INDICES", "Fortune 500,S&P 500,NASDAQ 100,Dow Jones").split(",")
+    if name.strip()
+]
+
+# Seconds between scans of the same index; 0 disables scheduled scans
+SCAN_INTERVAL_SECONDS = int(os.environ.get("TICKER_AI_SCAN_INTERVAL_SECONDS", "3600"))
+
+# Seconds between checks by a page waiting for a triggered scan to finish
+SCAN_STATUS_POLL_SECONDS = float(os.environ.get("TICKER_AI_SCAN_STATUS_POLL_SECONDS", "2"))
+
+class ScanScheduler:
+    """
+    Runs index scans in the background and stores each result
+
+    Every index whose latest stored scan is older than the interval is rescanned,
+    one index at a time. trigger() queues an immediate rescan ahead of the
+    schedule; it also works when scheduled scans are disabled.
+    """
+
+    def __init__(self, store, scan_function, index_names=None, interval=SCAN_INTERVAL_SECONDS):
+        """
+        Initialize ScanScheduler
+
+        Parameters:
+        -----------
+        store : ScanStore
+            Store the completed scans are saved to
+        scan_function : callable
+            scan_function(index_name) returning the list of top stocks
+        index_names : list, optional
+            Indices to keep precomputed; defaults to SCHEDULED_INDICES
+        interval : int
+            Seconds between scans of the same index; 0 only runs triggered scans
+        """
+        self.store = store
+        self.scan_function = scan_function
+        self.index_names = list(SCHEDULED_INDICES if index_names is None else index_names)
+        self.interval = interval
+
+        self._pending = deque()
+        self._running = None
+        # Index name to the start of its last scheduled attempt, so a failing
+        # scan waits a full interval instead of retrying in a tight loop
+        self._attempted_at = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the scheduler thread (no-op if it is already running)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="scan-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """Ask the scheduler thread to exit after the current scan"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def trigger(self, index_name):
+        """
+        Queue an immediate rescan of an index
+
+        Returns:
+        --------
+        bool
+            False if that index is already queued or being scanned
+        """
+        with self._lock:
+            if index_name == self._running or index_name in self._pending:
+                return False
+            self._pending.append(index_name)
+        self._wake.set()
+        return True
+
+    def is_scanning(self, index_name):
+        """Whether an index is being scanned or waiting in the queue"""
+        with self._lock:
+            return index_name == self._running or index_name in self._pending
+
+    def _next_due(self):
+        """Next index to scan and how many seconds until it is due"""
+        with self._lock:
+            if self._pending:
+                return self._pending.popleft(), 0
+
+        if self.interval <= 0 or not self.index_names:
+            return None, None
+
+        now = time.time()
+        best_name, best_wait = None, None
+        for index_name in self.index_names:
+            last_run = max(self.store.last_scanned_at(index_name) or 0, self._attempted_at.get(index_name, 0))
+            wait = 0 if not last_run else max(0, last_run + self.interval - now)
+            if best_wait is None or wait < best_wait:
+                best_name, best_wait = index_name, wait
+        return best_name, best_wait
+
+    def _run(self):
+        """Scheduler loop: scan whatever is due, otherwise sleep until it is"""
+        while not self._stop.is_set():
+            try:
+                index_name, wait = self._next_due()
+            except Exception as e:
+                print(f"Error planning scheduled scans: {str(e)}")
+                index_name, wait = None, 60
+
+            if index_name is None or wait > 0:
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+
+            with self._lock:
+                self._running = index_name
+            self._attempted_at[index_name] = time.time()
+            try:
+                self.run_scan(index_name)
+            finally:
+                with self._lock:
+                    self._running = None
+
+    def run_scan(self, index_name):
+        """Scan one index now and save the result"""
+        started = time.time()
+        try:
+            stocks = self.scan_function(index_name)
+        except Exception as e:
+            print(f"Error running scheduled scan of {index_name}: {str(e)}")
+            return None
+        return self.store.save_scan(index_name, stocks, duration=time.time() - started)
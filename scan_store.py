@@ -0,0 +1,223 @@
+"""
+Local SQLite store of completed Power Plays scans
+Every scan is kept under its index name and completion time, so any session can serve the latest snapshot
+"""
+import os
+import json
+import time
+import pickle
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Database file; set TICKER_AI_SCAN_STORE to an empty string to disable
+SCAN_STORE_PATH = os.environ.get("TICKER_AI_SCAN_STORE", os.path.join(".cache", "scans.sqlite3"))
+
+# Number of scans kept per index; older ones are deleted when a new scan is saved
+SCAN_STORE_HISTORY = int(os.environ.get("TICKER_AI_SCAN_STORE_HISTORY", "48"))
+
+class ScanStore:
+    """
+    Scan snapshots keyed by index name and timestamp
+
+    The stock list of a scan (including its DataFrames) is pickled into one
+    row, so loading a snapshot is a single indexed read. Each call opens its own
+    connection, which keeps the store safe to use from the scheduler thread and
+    from any number of Streamlit sessions.
+    """
+
+    def __init__(self, path=SCAN_STORE_PATH, history=SCAN_STORE_HISTORY):
+        """
+        Initialize ScanStore
+
+        Parameters:
+        -----------
+        path : str
+            SQLite database file
+        history : int
+            Number of scans kept per index
+        """
+        self.path = path
+        self.history = history
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS scans (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    index_name TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    duration REAL,
+                    stocks BLOB NOT NULL
+                )
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS scans_by_index ON scans (index_name, created_at)")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS ticker_state (
+                    index_name TEXT NOT NULL,
+                    ticker TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    buy_rating REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    inputs TEXT,
+                    PRIMARY KEY (index_name, ticker)
+                )
+            """)
+            # Stores created before scoring inputs were kept lack the column
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(ticker_state)")]
+            if 'inputs' not in columns:
+                connection.execute("ALTER TABLE ticker_state ADD COLUMN inputs TEXT")
+
+    @contextmanager
+    def _connect(self):
+        """Connection for one transaction, committed on success and always closed"""
+        # Wait for concurrent writers instead of failing
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def save_scan(self, index_name, stocks, duration=None, created_at=None):
+        """
+        Store a completed scan
+
+        Parameters:
+        -----------
+        index_name : str
+            Name of the scanned index
+        stocks : list
+            Top stock dictionaries as returned by get_top_stocks
+        duration : float, optional
+            Seconds the scan took
+        created_at : float, optional
+            Completion time as a Unix timestamp; defaults to now
+
+        Returns:
+        --------
+        int
+            Row id of the stored scan
+        """
+        created_at = time.time() if created_at is None else created_at
+        blob = pickle.dumps(stocks, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self._lock, self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO scans (index_name, created_at, duration, stocks) VALUES (?, ?, ?, ?)",
+                (index_name, created_at, duration, blob)
+            )
+            # Keep only the most recent scans of this index
+            connection.execute(
+                """
+                DELETE FROM scans WHERE index_name = ? AND id NOT IN (
+                    SELECT id FROM scans WHERE index_name = ? ORDER BY created_at DESC LIMIT ?
+                )
+                """,
+                (index_name, index_name, self.history)
+            )
+            return cursor.lastrowid
+
+    def latest_scan(self, index_name):
+        """
+        Get the most recent scan of an index
+
+        Parameters:
+        -----------
+        index_name : str
+            Name of the index
+
+        Returns:
+        --------
+        dict or None
+            {'index', 'stocks', 'created_at', 'duration'}, or None if the index was never scanned
+        """
+        try:
+            with self._connect() as connection:
+                row = connection.execute(
+                    "SELECT index_name, stocks, created_at, duration FROM scans "
+                    "WHERE index_name = ? ORDER BY created_at DESC LIMIT 1",
+                    (index_name,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading stored scan for {index_name}: {str(e)}")
+            return None
+
+        if row is None:
+            return None
+
+        try:
+            stocks = pickle.loads(row[1])
+        except Exception as e:
+            print(f"Error loading stored scan for {index_name}: {str(e)}")
+            return None
+
+        return {'index': row[0], 'stocks': stocks, 'created_at': row[2], 'duration': row[3]}
+
+    def last_scanned_at(self, index_name):
+        """Completion time of the latest scan of an index, or None"""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT MAX(created_at) FROM scans WHERE index_name = ?",
+                (index_name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def load_ticker_state(self, index_name):
+        """
+        Get the input fingerprint, rating and scoring inputs of every ticker from the last scan of an index
+
+        Returns:
+        --------
+        dict
+            Ticker to (fingerprint, buy_rating, inputs), where inputs is the
+            scoring.scoring_inputs row or None if it was not stored
+        """
+        try:
+            with self._connect() as connection:
+                rows = connection.execute(
+                    "SELECT ticker, fingerprint, buy_rating, inputs FROM ticker_state WHERE index_name = ?",
+                    (index_name,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error reading ticker state for {index_name}: {str(e)}")
+            return {}
+
+        state = {}
+        for ticker, fingerprint, buy_rating, inputs in rows:
+            try:
+                inputs = json.loads(inputs) if inputs else None
+            except ValueError:
+                inputs = None
+            state[ticker] = (fingerprint, buy_rating, inputs)
+        return state
+
+    def save_ticker_state(self, index_name, state):
+        """
+        Replace the per-ticker fingerprints, ratings and scoring inputs of an index
+
+        Parameters:
+        -----------
+        index_name : str
+            Name of the index
+        state : dict
+            Ticker to (fingerprint, buy_rating, inputs), with inputs a
+            scoring.scoring_inputs row or None
+        """
+        now = time.time()
+        rows = [
+            (index_name, ticker, fingerprint, buy_rating, now,
+             json.dumps(inputs, default=str) if inputs is not None else None)
+            for ticker, (fingerprint, buy_rating, inputs) in state.items()
+        ]
+        with self._lock, self._connect() as connection:
+            connection.execute("DELETE FROM ticker_state WHERE index_name = ?", (index_name,))
+            connection.executemany(
+                "INSERT INTO ticker_state (index_name, ticker, fingerprint, buy_rating, updated_at, inputs) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
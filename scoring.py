@@ -0,0 +1,317 @@
+"""
+Vectorized buy rating scorer for a whole universe of tickers
+Computes the same component scores and weighted rating as StockAnalyzer.calculate_buy_rating
+"""
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+# Bump whenever the scoring inputs change (e.g., a new SCORING_FIELDS entry), so
+# rescans collect them again; rating logic changes need no bump, since stored
+# inputs are rescored on every scan
+SCORING_VERSION = 1
+
+# Weight of each rating component in the final buy rating
+RATING_WEIGHTS = {
+    'Technical Analysis': 0.4,
+    'Fundamental Analysis': 0.4,
+    'Market Sentiment': 0.2,
+}
+
+# Company info fields the fundamental and sentiment scores read
+SCORING_FIELDS = [
+    'trailingPE',
+    'forwardPE',
+    'profitMargins',
+    'revenueGrowth',
+    'debtToEquity',
+    'recommendationMean',
+]
+
+def scoring_value(info, field):
+    """
+    Numeric value of a scoring field, or None when it is missing or unusable
+
+    Both the per-ticker rating and the batch scorer read fields through this
+    rule: None, NaN and non-numeric values all count as missing data.
+    """
+    value = info.get(field)
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if value != value else value
+
+def count_signals(signals):
+    """
+    Count bullish and bearish technical signals
+
+    Parameters:
+    -----------
+    signals : dict
+        Signal name to interpretation text, as from TechnicalAnalysis.get_technical_signals
+
+    Returns:
+    --------
+    tuple
+        (bullish_count, bearish_count, total_signals)
+    """
+    bullish_count = sum(1 for signal in signals.values() if "bullish" in signal.lower())
+    bearish_count = sum(1 for signal in signals.values() if "bearish" in signal.lower())
+    return bullish_count, bearish_count, len(signals)
+
+def scoring_inputs(info, signals):
+    """
+    Build one row of scorer input from company info and technical signals
+
+    Parameters:
+    -----------
+    info : dict
+        Company information
+    signals : dict
+        Technical signals
+
+    Returns:
+    --------
+    dict
+        The SCORING_FIELDS values plus 'bullish_signals' and 'total_signals'
+    """
+    row = {field: info.get(field) for field in SCORING_FIELDS}
+    bullish_count, _, total_signals = count_signals(signals)
+    row['bullish_signals'] = bullish_count
+    row['total_signals'] = total_signals
+    return row
+
+def scoring_fingerprint(inputs):
+    """
+    Fingerprint of everything a buy rating depends on
+
+    Ticker states with the same fingerprint have the same scoring inputs, so
+    a rescan can rescore the stored inputs instead of analyzing the ticker.
+    A new price bar or a reworded signal that leaves the inputs alone keeps
+    the fingerprint.
+
+    Parameters:
+    -----------
+    inputs : dict
+        One row of scorer input, as from scoring_inputs
+
+    Returns:
+    --------
+    str
+        Hex digest combining the inputs with SCORING_VERSION
+    """
+    payload = {
+        'version': SCORING_VERSION,
+        'fields': {field: scoring_value(inputs, field) for field in SCORING_FIELDS},
+        'bullish_signals': inputs['bullish_signals'],
+        'total_signals': inputs['total_signals'],
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+def _numeric_column(frame, column):
+    """Column as a float array, with missing or non-numeric values as NaN"""
+    if column not in frame.columns:
+        return np.full(len(frame), np.nan)
+    return pd.to_numeric(frame[column], errors='coerce').to_numpy(dtype=float)
+
+def _bucket(valid, conditions, scores, reasons):
+    """Vectorized if/elif ladder; the last score and reason are the else branch"""
+    score = np.select(conditions, scores[:-1], default=scores[-1]).astype(float)
+    reason = np.select(conditions, reasons[:-1], default=reasons[-1]).astype(object)
+    score[~valid] = np.nan
+    reason[~valid] = None
+    return score, reason
+
+def _technical_scores(frame):
+    """Technical score from the share of bullish signals"""
+    bullish = _numeric_column(frame, 'bullish_signals')
+    total = _numeric_column(frame, 'total_signals')
+    has_signals = np.nan_to_num(total) > 0
+
+    ratio = np.divide(bullish, total, out=np.zeros(len(frame)), where=has_signals)
+    score = np.where(has_signals, ratio * 10, 5.0)
+
+    reason = np.select(
+        [~has_signals, score >= 7, score >= 5, score > 3],
+        [
+            "Insufficient technical data available",
+            "Strong bullish technical indicators",
+            "Moderately bullish technical indicators",
+            "Mixed technical signals with slight bearish bias",
+        ],
+        default="Strong bearish technical indicators"
+    ).astype(object)
+
+    return score, reason
+
+def _fundamental_scores(frame):
+    """Fundamental score as the mean of the valuation, margin, growth and debt factors"""
+    pe_ratio = _numeric_column(frame, 'trailingPE')
+    industry_avg_pe = _numeric_column(frame, 'forwardPE')
+    industry_avg_pe = np.where(np.isnan(industry_avg_pe), 20, industry_avg_pe)
+    profit_margin = _numeric_column(frame, 'profitMargins')
+    revenue_growth = _numeric_column(frame, 'revenueGrowth')
+    debt_to_equity = _numeric_column(frame, 'debtToEquity')
+
+    factors = [
+        _bucket(
+            ~np.isnan(pe_ratio),
+            [pe_ratio < industry_avg_pe * 0.7, pe_ratio < industry_avg_pe, pe_ratio < industry_avg_pe * 1.3],
+            [9, 7, 5, 3],
+            [
+                "P/E ratio significantly below industry average (potentially undervalued)",
+                "P/E ratio below industry average",
+                "P/E ratio near industry average",
+                "P/E ratio above industry average (potentially overvalued)",
+            ]
+        ),
+        _bucket(
+            ~np.isnan(profit_margin),
+            [profit_margin > 0.2, profit_margin > 0.1, profit_margin > 0.05, profit_margin > 0],
+            [9, 7, 5, 3, 1],
+            [
+                "Excellent profit margins",
+                "Good profit margins",
+                "Average profit margins",
+                "Below-average profit margins",
+                "Negative profit margins",
+            ]
+        ),
+        _bucket(
+            ~np.isnan(revenue_growth),
+            [revenue_growth > 0.25, revenue_growth > 0.15, revenue_growth > 0.05, revenue_growth > 0],
+            [10, 8, 6, 4, 2],
+            [
+                "Exceptional revenue growth",
+                "Strong revenue growth",
+                "Positive revenue growth",
+                "Minimal revenue growth",
+                "Declining revenues",
+            ]
+        ),
+        _bucket(
+            ~np.isnan(debt_to_equity),
+            [debt_to_equity < 50, debt_to_equity < 100, debt_to_equity < 150, debt_to_equity < 200],
+            [9, 7, 5, 3, 1],
+            [
+                "Very low debt-to-equity ratio",
+                "Low debt-to-equity ratio",
+                "Moderate debt-to-equity ratio",
+                "High debt-to-equity ratio",
+                "Very high debt-to-equity ratio",
+            ]
+        ),
+    ]
+
+    factor_scores = np.column_stack([score for score, _ in factors])
+    factor_reasons = np.column_stack([reason for _, reason in factors])
+    present = ~np.isnan(factor_scores)
+    factor_count = present.sum(axis=1)
+
+    # Factor scores are small integers, so the sum is exact in any order
+    total = np.where(present, factor_scores, 0).sum(axis=1)
+    score = np.divide(total, factor_count, out=np.full(len(frame), 5.0), where=factor_count > 0)
+    score = np.minimum(score, 10)
+
+    # Summary is the first two available reasons, in factor order
+    rank = np.cumsum(present, axis=1)
+    rows = np.arange(len(frame))
+    first_reason = factor_reasons[rows, np.argmax(rank == 1, axis=1)]
+    second_reason = factor_reasons[rows, np.argmax(rank == 2, axis=1)]
+    first_reason = np.where(factor_count >= 1, first_reason, "")
+    second_reason = np.where(factor_count >= 2, second_reason, "")
+    separator = np.where(factor_count >= 2, "; ", "")
+    reason = first_reason + separator + second_reason
+    reason = np.where(factor_count == 0, "Insufficient fundamental data available", reason).astype(object)
+
+    return score, reason
+
+def _sentiment_scores(frame):
+    """Sentiment score from the analyst recommendation mean (1 = Strong Buy, 5 = Strong Sell)"""
+    rec = _numeric_column(frame, 'recommendationMean')
+    valid = ~np.isnan(rec)
+
+    score = np.where(valid, ((5 - rec) / 4) * 9 + 1, 5.0)
+    reason = np.select(
+        [~valid, rec <= 1.5, rec <= 2.5, rec <= 3.5, rec <= 4.5],
+        [
+            "No analyst recommendations available",
+            "Strong analyst buy recommendations",
+            "Moderate analyst buy recommendations",
+            "Hold recommendations from analysts",
+            "Moderate analyst sell recommendations",
+        ],
+        default="Strong analyst sell recommendations"
+    ).astype(object)
+
+    return score, reason
+
+def score_universe(frame, weights=None):
+    """
+    Score many tickers at once
+
+    Parameters:
+    -----------
+    frame : pandas.DataFrame
+        One row per ticker with the SCORING_FIELDS columns plus 'bullish_signals'
+        and 'total_signals' (see scoring_inputs); missing columns count as missing data
+    weights : dict, optional
+        Component weights keyed like RATING_WEIGHTS; defaults to RATING_WEIGHTS
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Same index as the input with technical/fundamental/sentiment score and
+        reason columns and the rounded 'buy_rating'. With the default weights the
+        values match StockAnalyzer.calculate_buy_rating exactly.
+    """
+    weights = RATING_WEIGHTS if weights is None else weights
+
+    technical_score, technical_reason = _technical_scores(frame)
+    fundamental_score, fundamental_reason = _fundamental_scores(frame)
+    sentiment_score, sentiment_reason = _sentiment_scores(frame)
+
+    final_score = (
+        technical_score * weights['Technical Analysis'] +
+        fundamental_score * weights['Fundamental Analysis'] +
+        sentiment_score * weights['Market Sentiment']
+    )
+
+    # Python's round rather than np.round so halfway cases match the per-ticker path
+    buy_rating = [round(score, 1) for score in final_score.tolist()]
+
+    return pd.DataFrame({
+        'technical_score': technical_score,
+        'technical_reason': technical_reason,
+        'fundamental_score': fundamental_score,
+        'fundamental_reason': fundamental_reason,
+        'sentiment_score': sentiment_score,
+        'sentiment_reason': sentiment_reason,
+        'buy_rating': buy_rating,
+    }, index=frame.index)
+
+def rescore_inputs(inputs, weights=None):
+    """
+    Buy ratings for stored scoring inputs, without fetching anything
+
+    Parameters:
+    -----------
+    inputs : dict
+        Ticker to scoring_inputs row
+    weights : dict, optional
+        Component weights keyed like RATING_WEIGHTS; defaults to RATING_WEIGHTS
+
+    Returns:
+    --------
+    dict
+        Ticker to buy rating
+    """
+    if not inputs:
+        return {}
+    frame = pd.DataFrame.from_dict(inputs, orient='index')
+    return score_universe(frame, weights)['buy_rating'].to_dict()
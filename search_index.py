@@ -0,0 +1,202 @@
+"""
+In-memory search index over listed securities
+A prefix trie over tickers, an n-gram index over company names and a hash map over aliases, so a lookup never scans the whole list
+"""
+from array import array
+
+# Length of the n-grams indexed over names
+NGRAM_SIZE = 3
+
+class _TrieNode:
+    """Trie node holding the list positions of every ticker at or below it"""
+
+    __slots__ = ('children', 'positions', 'exact')
+
+    def __init__(self):
+        self.children = {}
+        self.positions = []
+        self.exact = []
+
+def _ngrams(text, size):
+    """Distinct substrings of a given length"""
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+class SearchIndex:
+    """
+    Ranked lookup of securities by ticker prefix, company name and alias
+
+    Matches rank like a linear scan of the list would: the exact ticker first,
+    then tickers starting with the query, then names containing it, each
+    group in list order. Every posting list is kept in list order, so only
+    as many candidates as the caller asks for are ever checked.
+    """
+
+    def __init__(self, tickers, names, aliases=None):
+        """
+        Initialize SearchIndex
+
+        Parameters:
+        -----------
+        tickers : sequence
+            Ticker symbols, in ranking order
+        names : sequence
+            Company names aligned with the tickers
+        aliases : dict, optional
+            Lower-case alias (e.g., 'coke') mapped to a ticker or a list of tickers
+        """
+        self.tickers = list(tickers)
+        self.names = list(names)
+
+        self._lower_names = [name.lower() for name in self.names]
+        self._ticker_positions = {}
+        self._trie = _TrieNode()
+
+        for position, ticker in enumerate(self.tickers):
+            self._ticker_positions.setdefault(ticker, position)
+            node = self._trie
+            node.positions.append(position)
+            for char in ticker:
+                node = node.children.setdefault(char, _TrieNode())
+                node.positions.append(position)
+            node.exact.append(position)
+
+        # Trigram posting lists, built as lists and stored as compact arrays
+        name_index = {}
+        for position, name in enumerate(self._lower_names):
+            for gram in _ngrams(name, NGRAM_SIZE):
+                postings = name_index.get(gram)
+                if postings is None:
+                    name_index[gram] = [position]
+                else:
+                    postings.append(position)
+        self._name_index = {gram: array('I', postings) for gram, postings in name_index.items()}
+
+        self._aliases = {}
+        self._alias_order = {}
+        self._alias_substrings = {}
+        for order, (alias, value) in enumerate((aliases or {}).items()):
+            self._aliases[alias] = [value] if isinstance(value, str) else list(value)
+            self._alias_order[alias] = order
+            # Every substring, so a partly typed alias finds it with one lookup
+            for size in range(1, len(alias) + 1):
+                for part in _ngrams(alias, size):
+                    self._alias_substrings.setdefault(part, []).append(alias)
+        self._alias_lengths = sorted({len(alias) for alias in self._aliases})
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def record(self, position):
+        """Search result dictionary for a list position"""
+        return {"ticker": self.tickers[position], "name": self.names[position]}
+
+    def _ticker_node(self, prefix):
+        node = self._trie
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def _name_matches(self, query_lower):
+        """Positions of names containing the query, in list order (lazily)"""
+        if len(query_lower) < NGRAM_SIZE:
+            # Too short for the index; such fragments are common, so an
+            # in-order scan finds enough matches after a few names
+            for position, name in enumerate(self._lower_names):
+                if query_lower in name:
+                    yield position
+            return
+        if len(query_lower) == NGRAM_SIZE:
+            yield from self._name_index.get(query_lower, ())
+            return
+
+        # Candidates must contain every trigram; walk the rarest list and confirm each
+        grams = _ngrams(query_lower, NGRAM_SIZE)
+        postings = [self._name_index.get(gram) for gram in grams]
+        if not all(postings):
+            return
+        for position in min(postings, key=len):
+            if query_lower in self._lower_names[position]:
+                yield position
+
+    def search(self, query, limit=10):
+        """
+        Best matches for a query, as a linear scan would rank them
+
+        Parameters:
+        -----------
+        query : str
+            Ticker or company name fragment
+        limit : int
+            Maximum number of matches
+
+        Returns:
+        --------
+        list
+            Matching {'ticker', 'name'} dictionaries
+        """
+        if not query:
+            return []
+        query_upper = query.upper()
+        query_lower = query.lower()
+
+        positions = []
+        node = self._ticker_node(query_upper)
+        if node is not None:
+            exact = node.exact
+            positions.extend(exact[:limit])
+            if len(positions) < limit:
+                exact_set = set(exact)
+                for position in node.positions:
+                    if position not in exact_set:
+                        positions.append(position)
+                        if len(positions) == limit:
+                            break
+
+        if len(positions) < limit:
+            for position in self._name_matches(query_lower):
+                # Names of prefix-matched tickers are already in
+                if self.tickers[position].startswith(query_upper):
+                    continue
+                positions.append(position)
+                if len(positions) == limit:
+                    break
+
+        return [self.record(position) for position in positions]
+
+    def aliases(self, query):
+        """
+        Securities named by aliases that contain the query or are contained in it
+
+        Parameters:
+        -----------
+        query : str
+            Search query
+
+        Returns:
+        --------
+        list
+            {'ticker', 'name'} dictionaries in alias order, without duplicates;
+            alias tickers missing from the index are skipped
+        """
+        query_lower = query.lower()
+        if not query_lower:
+            return []
+
+        # Aliases containing the query, plus aliases that are substrings of it
+        matched = set(self._alias_substrings.get(query_lower, ()))
+        for size in self._alias_lengths:
+            for part in _ngrams(query_lower, size):
+                if part in self._aliases:
+                    matched.add(part)
+
+        results = []
+        seen = set()
+        for alias in sorted(matched, key=self._alias_order.get):
+            for ticker in self._aliases[alias]:
+                position = self._ticker_positions.get(ticker)
+                if position is not None and ticker not in seen:
+                    seen.add(ticker)
+                    results.append(self.record(position))
+        return results
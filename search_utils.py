@@ -2,6 +2,12 @@
 Stock Search Utilities
 Extracted search functionality without Streamlit configuration conflicts
 """
+import os
+import time
+import threading
+from search_index import SearchIndex
+from listings import load_listings, is_full_universe, download_listing_files, DOWNLOAD_LISTINGS, LISTINGS_TTL
+from remote_search import REMOTE_SEARCH
 
 # Comprehensive stock database with major companies from all indices
 POPULAR_STOCKS = [
@@ -292,6 +298,91 @@ POPULAR_STOCKS = [
     {"ticker": "SNAP", "name": "Snap Inc."},
 ]
 
+# Common variations, abbreviations and category names, mapped to tickers
+TICKER_ALIASES = {
+    "citi": "C",
+    "citigroup": "C",
+    "coke": "KO",
+    "coca cola": "KO",
+    "cocacola": "KO",
+    "coca-cola": "KO",
+    "boeing": "BA",
+    "lockheed": "LMT",
+    "raytheon": "RTX",
+    "defense": ["NOC", "LMT", "GD", "RTX", "HII"],  # Defense contractors
+    "airlines": ["AAL", "DAL", "UAL", "LUV"],  # Major airlines
+    "tech": ["AAPL", "MSFT", "GOOGL", "META", "AMZN", "NVDA"],  # Big tech
+    "semiconductors": ["NVDA", "AMD", "INTC", "MU", "TSM", "AVGO"],  # Semiconductor companies
+    "banks": ["JPM", "BAC", "WFC", "C", "GS", "MS"],  # Major banks
+    "energy": ["XOM", "CVX", "COP", "SLB", "BP", "OXY"],  # Energy companies
+    "retail": ["WMT", "TGT", "COST", "AMZN", "HD", "LOW"],  # Retail companies
+}
+
+# Listed-securities universe from the last downloaded symbol directory (see listings.py)
+LISTINGS = load_listings()
+
+def remote_search_below(listings):
+    """
+    Fewest local matches that skip the remote symbol search
+    
+    With the full universe listed, any local match is as good as the remote
+    search; otherwise the remote search tops up anything short of a full page.
+    TICKER_AI_REMOTE_SEARCH_BELOW overrides both.
+    """
+    return int(os.environ.get("TICKER_AI_REMOTE_SEARCH_BELOW", "1" if is_full_universe(listings) else "10"))
+
+REMOTE_SEARCH_BELOW = remote_search_below(LISTINGS)
+
+def build_search_index(stocks, listings, aliases):
+    """
+    Build the search index over the popular stocks followed by the rest of the listing
+    
+    Popular stocks come first so they keep ranking ahead of other listed
+    securities with the same ticker prefix or name match.
+    
+    Returns:
+    --------
+    SearchIndex
+    """
+    tickers = [stock["ticker"] for stock in stocks]
+    names = [stock["name"] for stock in stocks]
+    known = set(tickers)
+    for ticker, name in zip(listings.tickers, listings.names):
+        if ticker not in known:
+            tickers.append(ticker)
+            names.append(name or ticker)
+    return SearchIndex(tickers, names, aliases)
+
+# Built at startup and rebuilt when the listing is refreshed; every keystroke is a few dictionary lookups
+SEARCH_INDEX = build_search_index(POPULAR_STOCKS, LISTINGS, TICKER_ALIASES)
+
+_listings_refresh_lock = threading.Lock()
+_listings_checked_at = 0.0
+
+def _refresh_listings():
+    """Download a newer symbol directory and swap in the listing and index built from it"""
+    global LISTINGS, REMOTE_SEARCH_BELOW, SEARCH_INDEX
+    try:
+        if not download_listing_files() and len(LISTINGS):
+            return
+        listings = load_listings()
+        search_index = build_search_index(POPULAR_STOCKS, listings, TICKER_ALIASES)
+        LISTINGS, REMOTE_SEARCH_BELOW, SEARCH_INDEX = listings, remote_search_below(listings), search_index
+    except Exception as e:
+        print(f"Error refreshing listings: {str(e)}")
+    finally:
+        _listings_refresh_lock.release()
+
+def refresh_listings_in_background():
+    """Check the symbol directory for updates on a background thread, at most once per TTL"""
+    global _listings_checked_at
+    if not DOWNLOAD_LISTINGS or time.time() - _listings_checked_at < LISTINGS_TTL:
+        return
+    if not _listings_refresh_lock.acquire(blocking=False):
+        return
+    _listings_checked_at = time.time()
+    threading.Thread(target=_refresh_listings, name="listings-refresh", daemon=True).start()
+
 def search_stocks(query):
     """
     Search for stocks by partial ticker or company name match
@@ -310,101 +401,51 @@ def search_stocks(query):
     if not query:
         return []
     
-    # First search local database for faster results
-    query_upper = query.upper()
-    query_lower = query.lower()
-    local_matches = []
-    
-    for stock in POPULAR_STOCKS:
-        # Match on ticker (exact or starting with)
-        if stock["ticker"] == query_upper or stock["ticker"].startswith(query_upper):
-            local_matches.append(stock)
-        # Match on name (case-insensitive partial match)
-        elif query_lower in stock["name"].lower():
-            local_matches.append(stock)
+    refresh_listings_in_background()
     
-    # Sort matches: exact ticker matches first, then starts-with ticker matches, then name matches
-    local_matches.sort(key=lambda x: (
-        0 if x["ticker"] == query_upper else 
-        1 if x["ticker"].startswith(query_upper) else 
-        2
-    ))
+    # First search the local index: exact ticker matches first, then
+    # starts-with ticker matches, then name matches
+    query_lower = query.lower()
+    local_matches = SEARCH_INDEX.search(query, limit=10)
     
     # If we already have enough local matches, return them
     if len(local_matches) >= 10:
-        return local_matches[:10]
+        return local_matches
+    
+    seen_tickers = {stock["ticker"] for stock in local_matches}
     
     # If not enough local matches, try a more direct approach for specific companies
     if query_lower in ["northrop", "grumman", "northrop grumman"]:
         # Ensure Northrop Grumman is in results
-        if not any(stock['ticker'] == "NOC" for stock in local_matches):
+        if "NOC" not in seen_tickers:
+            seen_tickers.add("NOC")
             local_matches.append({
                 "ticker": "NOC",
                 "name": "Northrop Grumman Corporation"
             })
     
     # Try common variations and abbreviations
-    ticker_mappings = {
-        "citi": "C",
-        "citigroup": "C",
-        "coke": "KO",
-        "coca cola": "KO",
-        "cocacola": "KO",
-        "coca-cola": "KO",
-        "boeing": "BA",
-        "lockheed": "LMT",
-        "raytheon": "RTX",
-        "defense": ["NOC", "LMT", "GD", "RTX", "HII"],  # Defense contractors
-        "airlines": ["AAL", "DAL", "UAL", "LUV"],  # Major airlines
-        "tech": ["AAPL", "MSFT", "GOOGL", "META", "AMZN", "NVDA"],  # Big tech
-        "semiconductors": ["NVDA", "AMD", "INTC", "MU", "TSM", "AVGO"],  # Semiconductor companies
-        "banks": ["JPM", "BAC", "WFC", "C", "GS", "MS"],  # Major banks
-        "energy": ["XOM", "CVX", "COP", "SLB", "BP", "OXY"],  # Energy companies
-        "retail": ["WMT", "TGT", "COST", "AMZN", "HD", "LOW"],  # Retail companies
-    }
+    for stock in SEARCH_INDEX.aliases(query):
+        if stock["ticker"] not in seen_tickers:
+            seen_tickers.add(stock["ticker"])
+            local_matches.append(stock)
     
-    for key, value in ticker_mappings.items():
-        if query_lower in key or key in query_lower:
-            if isinstance(value, list):
-                # Add all related companies for category searches
-                for ticker in value:
-                    # Find the company name in our database
-                    for stock in POPULAR_STOCKS:
-                        if stock["ticker"] == ticker and not any(m["ticker"] == ticker for m in local_matches):
-                            local_matches.append(stock)
-                            break
-            else:
-                # Add the specific company
-                for stock in POPULAR_STOCKS:
-                    if stock["ticker"] == value and not any(m["ticker"] == value for m in local_matches):
-                        local_matches.append(stock)
-                        break
+    if len(local_matches) >= REMOTE_SEARCH_BELOW:
+        return local_matches[:10]
     
-    # Try to get additional matches from Yahoo Finance API
-    try:
-        import requests
-        
-        # Yahoo Finance search API
-        url = f"https://query2.finance.yahoo.com/v1/finance/search?q={query}&quotesCount=10&newsCount=0"
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            data = response.json()
-            if 'quotes' in data:
-                for quote in data['quotes']:
-                    if 'symbol' in quote and 'shortname' in quote:
-                        # Skip if already in local matches
-                        if any(stock['ticker'] == quote['symbol'] for stock in local_matches):
-                            continue
-                        
-                        local_matches.append({
-                            "ticker": quote['symbol'],
-                            "name": quote['shortname']
-                        })
-    except Exception as e:
-        # If API call fails, just continue with local matches
-        print(f"Error fetching data from Yahoo Finance: {e}")
+    # Try to get additional matches from Yahoo Finance API (through the data
+    # backend); cached, and never waits long on a slow upstream
+    for quote in REMOTE_SEARCH.search(query, count=10):
+        if 'symbol' in quote and 'shortname' in quote:
+            # Skip if already in local matches
+            if quote['symbol'] in seen_tickers:
+                continue
+            
+            seen_tickers.add(quote['symbol'])
+            local_matches.append({
+                "ticker": quote['symbol'],
+                "name": quote['shortname']
+            })
     
     # Return combined results (limit to 10)
-    return local_matches[:10]
\ No newline at end of file
+    return local_matches[:10]
@@ -0,0 +1,86 @@
+"""
+Request coalescing for upstream fetches
+Concurrent fetches of the same (ticker, dataset, period) key share one in-flight call instead of each hitting the upstream
+"""
+import threading
+from metrics import record_cache
+
+class _Flight:
+    """One in-flight call and its outcome"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait for it and receive the same result, or the same exception.
+    Nothing is cached: once the call finishes, the next caller for the key
+    starts a new one. Shared results must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+        # Calls answered by another caller's fetch, for monitoring
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless a call with the same key is already in flight
+
+        Parameters:
+        -----------
+        key : hashable
+            Identity of the request, e.g. (ticker, dataset, period)
+        fn : callable
+            Function performing the fetch
+
+        Returns:
+        --------
+        object
+            The result of the one call made for this key
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        # A coalesced call is a hit on the in-flight request
+        record_cache('single_flight', 'miss' if leader else 'hit')
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn(*args, **kwargs)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+        return flight.result
+
+# Process-wide coalescer shared by every thread and session
+SINGLE_FLIGHT = SingleFlight()
+
+def request_key(ticker, dataset, **params):
+    """Single-flight key for a ticker's dataset and request parameters (e.g., period)"""
+    return (ticker, dataset, tuple(sorted(params.items())))
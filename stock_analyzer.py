@@ -1,16 +1,19 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from technical_analysis import TechnicalAnalysis
 from fundamental_analysis import FundamentalAnalysis
+from market_data import MarketDataProvider
+from scoring import RATING_WEIGHTS, count_signals, scoring_value
+from tracing import span
 
 class StockAnalyzer:
     """
     Main class for analyzing stock data and generating buy ratings
     """
     
-    def __init__(self, ticker):
+    @span('analyzer.init')
+    def __init__(self, ticker, provider=None):
         """
         Initialize StockAnalyzer with a ticker symbol
         
@@ -18,24 +21,20 @@ class StockAnalyzer:
         -----------
         ticker : str
             Stock ticker symbol (e.g., 'AAPL' for Apple)
+        provider : MarketDataProvider, optional
+            Shared data provider; a new one is created if not given
         """
         self.ticker = ticker
-        self.stock = yf.Ticker(ticker)
+        self.provider = provider if provider is not None else MarketDataProvider(ticker)
+        self.info = self.provider.info
         
-        try:
-            self.info = self.stock.info if hasattr(self.stock, 'info') else {}
-        except (AttributeError, TypeError):
-            self.info = {}
-            
-        # Get the stock data for the last day
-        try:
-            self.current_data = self.stock.history(period='2d')
-        except Exception:
-            self.current_data = pd.DataFrame()
-            
-        # Initialize analysis components
-        self.technical = TechnicalAnalysis(ticker)
-        self.fundamental = FundamentalAnalysis(ticker)
+        # Initialize analysis components on the same provider
+        self.technical = TechnicalAnalysis(ticker, provider=self.provider)
+        self.fundamental = FundamentalAnalysis(ticker, provider=self.provider)
+        
+        # One year of history is fetched once and shared by the price getters
+        # and every technical indicator
+        self.current_data = self.technical.get_historical_data('1y')
     
     def get_current_price(self):
         """Get the current stock price"""
@@ -83,12 +82,19 @@ class StockAnalyzer:
         pandas.DataFrame
             Historical stock data
         """
-        return self.stock.history(period=timeframe)
+        return self.technical.get_historical_data(timeframe)
     
-    def calculate_buy_rating(self):
+    @span('compute.buy_rating')
+    def calculate_buy_rating(self, technical_signals=None):
         """
         Calculate an overall buy rating on a scale of 1-10
         
+        Parameters:
+        -----------
+        technical_signals : dict, optional
+            Precomputed technical signals (e.g., from TechnicalAnalysis.get_panel_signals);
+            computed from this ticker's history if not given
+        
         Returns:
         --------
         float
@@ -99,7 +105,7 @@ class StockAnalyzer:
         score_breakdown = {}
         
         # Technical Analysis Score (40% weight)
-        technical_score = self._calculate_technical_score()
+        technical_score = self._calculate_technical_score(technical_signals)
         score_breakdown['Technical Analysis'] = technical_score
         
         # Fundamental Analysis Score (40% weight)
@@ -112,9 +118,9 @@ class StockAnalyzer:
         
         # Calculate final weighted score
         final_score = (
-            technical_score['score'] * 0.4 +
-            fundamental_score['score'] * 0.4 +
-            sentiment_score['score'] * 0.2
+            technical_score['score'] * RATING_WEIGHTS['Technical Analysis'] +
+            fundamental_score['score'] * RATING_WEIGHTS['Fundamental Analysis'] +
+            sentiment_score['score'] * RATING_WEIGHTS['Market Sentiment']
         )
         
         # Round to one decimal place
@@ -122,15 +128,14 @@ class StockAnalyzer:
         
         return final_score, score_breakdown
     
-    def _calculate_technical_score(self):
+    def _calculate_technical_score(self, signals=None):
         """Calculate technical analysis score component"""
         # Get technical signals
-        signals = self.technical.get_technical_signals()
+        if signals is None:
+            signals = self.technical.get_technical_signals()
         
         # Count bullish vs bearish signals
-        bullish_count = sum(1 for signal in signals.values() if "bullish" in signal.lower())
-        bearish_count = sum(1 for signal in signals.values() if "bearish" in signal.lower())
-        total_signals = len(signals)
+        bullish_count, bearish_count, total_signals = count_signals(signals)
         
         if total_signals == 0:
             score = 5.0  # Neutral if no signals
@@ -153,9 +158,9 @@ class StockAnalyzer:
     
     def _calculate_fundamental_score(self):
         """Calculate fundamental analysis score component"""
-        # Get key fundamental ratios
-        pe_ratio = self.get_pe_ratio()
+        # Get key fundamental ratios; missing, None and NaN values count as no data
         company_info = self.get_company_info()
+        pe_ratio = scoring_value(company_info, 'trailingPE')
         
         # Initialize parameters for scoring
         score_factors = []
@@ -164,7 +169,9 @@ class StockAnalyzer:
         # 1. P/E Ratio Assessment
         if pe_ratio is not None:
             # Compare to industry average (simplified)
-            industry_avg_pe = company_info.get('forwardPE', 20)  # Default to 20 if not available
+            industry_avg_pe = scoring_value(company_info, 'forwardPE')
+            if industry_avg_pe is None:
+                industry_avg_pe = 20  # Default to 20 if not available
             
             if pe_ratio < industry_avg_pe * 0.7:  # Significantly undervalued
                 score_factors.append(9)
@@ -180,7 +187,7 @@ class StockAnalyzer:
                 reasons.append("P/E ratio above industry average (potentially overvalued)")
         
         # 2. Profit Margins
-        profit_margin = company_info.get('profitMargins', None)
+        profit_margin = scoring_value(company_info, 'profitMargins')
         if profit_margin is not None:
             if profit_margin > 0.2:  # Very high margins
                 score_factors.append(9)
@@ -199,7 +206,7 @@ class StockAnalyzer:
                 reasons.append("Negative profit margins")
         
         # 3. Revenue Growth
-        revenue_growth = company_info.get('revenueGrowth', None)
+        revenue_growth = scoring_value(company_info, 'revenueGrowth')
         if revenue_growth is not None:
             if revenue_growth > 0.25:  # Excellent growth
                 score_factors.append(10)
@@ -218,7 +225,7 @@ class StockAnalyzer:
                 reasons.append("Declining revenues")
         
         # 4. Debt-to-Equity
-        debt_to_equity = company_info.get('debtToEquity', None)
+        debt_to_equity = scoring_value(company_info, 'debtToEquity')
         if debt_to_equity is not None:
             if debt_to_equity < 50:  # Very low debt
                 score_factors.append(9)
@@ -257,7 +264,7 @@ class StockAnalyzer:
         company_info = self.get_company_info()
         
         # Analyst recommendations
-        rec = company_info.get('recommendationMean', None)
+        rec = scoring_value(company_info, 'recommendationMean')
         
         if rec is not None:
             # Convert 1-5 scale (where 1 is Strong Buy and 5 is Strong Sell) to 10-1 scale
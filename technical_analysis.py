@@ -1,14 +1,218 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
+from collections import namedtuple
 from datetime import datetime, timedelta
+from numpy.lib.stride_tricks import sliding_window_view
+from market_data import MarketDataProvider
+from tracing import span
+
+# Every indicator series for one close-price history, as aligned NumPy arrays
+IndicatorSet = namedtuple('IndicatorSet', [
+    'close',
+    'ma20', 'ma50', 'ma200',
+    'rsi',
+    'macd', 'signal', 'histogram',
+    'bb_middle', 'bb_upper', 'bb_lower',
+])
+
+def _rolling_mean(values, window):
+    """Trailing rolling mean, NaN until the window is full (like pandas rolling)"""
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        result[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return result
+
+def _rolling_std(values, window):
+    """Trailing rolling sample standard deviation, NaN until the window is full"""
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        result[window - 1:] = sliding_window_view(values, window).std(axis=1, ddof=1)
+    return result
+
+def _ema(values, period):
+    """Exponential moving average matching pandas ewm(span=period, adjust=False)"""
+    alpha = 2.0 / (period + 1.0)
+    result = np.empty(len(values))
+    previous = np.nan
+    for i, value in enumerate(values.tolist()):
+        if value != value:  # NaN input keeps the previous average
+            result[i] = previous
+            continue
+        previous = value if previous != previous else previous + alpha * (value - previous)
+        result[i] = previous
+    return result
+
+def compute_indicators(close, rsi_window=14, macd_fast=12, macd_slow=26, macd_signal=9, bb_window=20, bb_std=2):
+    """
+    Compute every technical indicator in one pass over a close-price array
+    
+    Parameters:
+    -----------
+    close : array-like
+        Closing prices, oldest first
+    rsi_window : int
+        RSI calculation window
+    macd_fast, macd_slow, macd_signal : int
+        MACD fast EMA, slow EMA and signal line periods
+    bb_window : int
+        Bollinger Bands moving average window
+    bb_std : int
+        Number of standard deviations for the Bollinger Bands
+    
+    Returns:
+    --------
+    IndicatorSet
+        MA20/50/200, RSI, MACD/signal/histogram and Bollinger bands as arrays
+        aligned with the input
+    """
+    close = np.ascontiguousarray(close, dtype=float)
+    
+    # Moving averages
+    ma20 = _rolling_mean(close, 20)
+    ma50 = _rolling_mean(close, 50)
+    ma200 = _rolling_mean(close, 200)
+    
+    # RSI from average gains and losses
+    delta = np.empty(len(close))
+    if len(close):
+        delta[0] = np.nan
+        delta[1:] = np.diff(close)
+    avg_gain = _rolling_mean(np.where(delta < 0, 0.0, delta), rsi_window)
+    avg_loss = _rolling_mean(np.where(delta > 0, 0.0, -delta), rsi_window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    
+    # MACD
+    macd = _ema(close, macd_fast) - _ema(close, macd_slow)
+    signal = _ema(macd, macd_signal)
+    
+    # Bollinger Bands (reuse the 20-day MA when the window matches)
+    bb_middle = ma20 if bb_window == 20 else _rolling_mean(close, bb_window)
+    band_width = _rolling_std(close, bb_window) * bb_std
+    
+    return IndicatorSet(
+        close=close,
+        ma20=ma20, ma50=ma50, ma200=ma200,
+        rsi=rsi,
+        macd=macd, signal=signal, histogram=macd - signal,
+        bb_middle=bb_middle, bb_upper=bb_middle + band_width, bb_lower=bb_middle - band_width,
+    )
+
+# Column order of get_panel_signals, matching the key order of get_technical_signals
+PANEL_SIGNAL_COLUMNS = [
+    'Insufficient Data',
+    'Short-term Trend',
+    'Medium-term Trend',
+    'Long-term Trend',
+    'Major Signal',
+    'MA Relationship',
+    'RSI',
+    'MACD',
+    'Bollinger Bands',
+]
+
+# Number of most recent bars searched for crosses and band breakouts
+SIGNAL_LOOKBACK = 5
+
+def find_crossings(fast, slow):
+    """
+    Mark the bars where one series crosses another
+    
+    Parameters:
+    -----------
+    fast, slow : numpy.ndarray
+        Aligned 1-D series, or 2-D arrays with one column per ticker (time runs along axis 0)
+    
+    Returns:
+    --------
+    numpy.ndarray
+        True where fast moves from at or below slow to above it
+    numpy.ndarray
+        True where fast moves from at or above slow to below it
+    """
+    fast = np.asarray(fast, dtype=float)
+    slow = np.asarray(slow, dtype=float)
+    above = np.zeros(fast.shape, dtype=bool)
+    below = np.zeros(fast.shape, dtype=bool)
+    above[1:] = (fast[:-1] <= slow[:-1]) & (fast[1:] > slow[1:])
+    below[1:] = (fast[:-1] >= slow[:-1]) & (fast[1:] < slow[1:])
+    return above, below
+
+def recent_event_history(positive, negative, lookback=SIGNAL_LOOKBACK):
+    """
+    For every bar, find the first event within the last lookback bars
+    
+    An event on bar i is a move between bars i-1 and i, so a window of
+    lookback bars holds lookback-1 possible events. The earliest event in the
+    window wins, and a positive event wins a tie with a negative one on the
+    same bar.
+    
+    Parameters:
+    -----------
+    positive, negative : numpy.ndarray
+        Boolean event markers (e.g., from find_crossings), 1-D or 2-D with time along axis 0
+    lookback : int
+        Number of bars in the window ending at each bar
+    
+    Returns:
+    --------
+    numpy.ndarray
+        Same shape as the inputs: 1 for a positive event, -1 for a negative one, 0 for none
+    """
+    positive = np.asarray(positive, dtype=bool)
+    negative = np.asarray(negative, dtype=bool)
+    squeeze = positive.ndim == 1
+    if squeeze:
+        positive, negative = positive[:, None], negative[:, None]
+    
+    length = positive.shape[0]
+    result = np.zeros(positive.shape, dtype=int)
+    if length == 0 or lookback < 2:
+        return result[:, 0] if squeeze else result
+    
+    # Position of the next event at or after each bar (length when there is none)
+    rows = np.arange(length)[:, None]
+    event_rows = np.where(positive | negative, rows, length)
+    next_event = np.minimum.accumulate(event_rows[::-1], axis=0)[::-1]
+    
+    # First event inside (t - lookback + 1, t] for every bar t
+    window_start = np.clip(rows - lookback + 2, 0, length - 1)
+    columns = np.arange(positive.shape[1])[None, :]
+    first_event = next_event[window_start, columns]
+    hit = first_event <= rows
+    
+    event_row = np.minimum(first_event, length - 1)
+    result = np.where(hit, np.where(positive[event_row, columns], 1, -1), 0)
+    return result[:, 0] if squeeze else result
+
+def latest_event(positive, negative, lookback=SIGNAL_LOOKBACK):
+    """
+    First event within the last lookback bars, for the most recent bar only
+    
+    Returns:
+    --------
+    int or numpy.ndarray
+        1, -1 or 0 (one value per column for 2-D inputs)
+    """
+    positive = np.asarray(positive, dtype=bool)
+    negative = np.asarray(negative, dtype=bool)
+    if positive.shape[0] == 0 or lookback < 2:
+        return np.zeros(positive.shape[1:], dtype=int) if positive.ndim > 1 else 0
+    return recent_event_history(positive[-lookback:], negative[-lookback:], lookback)[-1]
+
+def _band_breakouts(indicators, lookback=None):
+    """Bars where the close breaks above the upper band / below the lower band"""
+    window = slice(-lookback, None) if lookback else slice(None)
+    upper_breakout, _ = find_crossings(indicators.close[window], indicators.bb_upper[window])
+    _, lower_breakout = find_crossings(indicators.close[window], indicators.bb_lower[window])
+    return upper_breakout, lower_breakout
 
 class TechnicalAnalysis:
     """
     Class for performing technical analysis on stock data
     """
     
-    def __init__(self, ticker):
+    def __init__(self, ticker, provider=None):
         """
         Initialize TechnicalAnalysis with a ticker symbol
         
@@ -16,14 +220,22 @@ class TechnicalAnalysis:
         -----------
         ticker : str
             Stock ticker symbol (e.g., 'AAPL' for Apple)
+        provider : MarketDataProvider, optional
+            Shared data provider; a new one is created if not given
         """
         self.ticker = ticker
-        self.stock = yf.Ticker(ticker)
+        self.provider = provider if provider is not None else MarketDataProvider(ticker)
+        
+        # Indicator kernel results keyed by timeframe and parameters
+        self._indicator_cache = {}
     
     def get_historical_data(self, timeframe='1y'):
         """
         Get historical price data
         
+        Downloads are memoized by the data provider, so every indicator shares
+        the same history frame.
+        
         Parameters:
         -----------
         timeframe : str
@@ -32,16 +244,35 @@ class TechnicalAnalysis:
         Returns:
         --------
         pandas.DataFrame
-            Historical stock data
+            Historical stock data (a copy that callers are free to modify)
         """
-        try:
-            data = self.stock.history(period=timeframe)
-            if data is None or isinstance(data, dict):
-                return pd.DataFrame()
-            return data
-        except Exception as e:
-            print(f"Error fetching historical data for {self.ticker}: {str(e)}")
-            return pd.DataFrame()
+        return self.provider.get_history(timeframe)
+    
+    def get_indicators(self, timeframe='1y', **params):
+        """
+        Get every indicator for a timeframe from the one-pass kernel
+        
+        Parameters:
+        -----------
+        timeframe : str
+            Time period for historical data
+        **params
+            Optional compute_indicators parameters (e.g., rsi_window=14)
+        
+        Returns:
+        --------
+        pandas.DatetimeIndex
+            Dates of the history
+        IndicatorSet
+            Indicator arrays aligned with the dates
+        """
+        key = (timeframe, tuple(sorted(params.items())))
+        if key not in self._indicator_cache:
+            data = self.get_historical_data(timeframe)
+            close = data['Close'].to_numpy(dtype=float) if not data.empty else np.empty(0)
+            with span('compute.indicators', ticker=self.ticker, timeframe=timeframe, bars=len(close)):
+                self._indicator_cache[key] = (data.index, compute_indicators(close, **params))
+        return self._indicator_cache[key]
     
     def get_moving_averages(self, timeframe='1y'):
         """
@@ -63,34 +294,39 @@ class TechnicalAnalysis:
         if data.empty:
             return pd.DataFrame()
         
-        # Calculate moving averages
-        data['MA20'] = data['Close'].rolling(window=20).mean()
-        data['MA50'] = data['Close'].rolling(window=50).mean()
-        data['MA200'] = data['Close'].rolling(window=200).mean()
+        # Attach the moving averages from the indicator kernel
+        _, indicators = self.get_indicators(timeframe)
+        data['MA20'] = indicators.ma20
+        data['MA50'] = indicators.ma50
+        data['MA200'] = indicators.ma200
         
         return data
     
-    def interpret_moving_averages(self):
+    def interpret_moving_averages(self, lookback=SIGNAL_LOOKBACK):
         """
         Interpret moving average signals
         
+        Parameters:
+        -----------
+        lookback : int
+            Number of most recent days searched for a golden or death cross
+        
         Returns:
         --------
         dict
             Dictionary of moving average signals and their interpretations
         """
-        # Get data with moving averages
-        data = self.get_moving_averages('1y')
+        # Get indicator arrays
+        _, indicators = self.get_indicators('1y')
         
-        if data.empty or len(data) < 200:  # Need at least 200 days for 200MA
+        if len(indicators.close) < 200:  # Need at least 200 days for 200MA
             return {'Insufficient Data': 'Not enough historical data for moving average analysis'}
         
         # Get latest values
-        latest = data.iloc[-1]
-        close = latest['Close']
-        ma20 = latest['MA20']
-        ma50 = latest['MA50']
-        ma200 = latest['MA200']
+        close = indicators.close[-1]
+        ma20 = indicators.ma20[-1]
+        ma50 = indicators.ma50[-1]
+        ma200 = indicators.ma200[-1]
         
         signals = {}
         
@@ -113,28 +349,16 @@ class TechnicalAnalysis:
             signals['Long-term Trend'] = 'Bearish: Price below 200-day MA'
         
         # Golden Cross / Death Cross (MA50 vs MA200)
-        # Check for recent crossing
-        last_5_days = data.tail(5)
-        cross_detected = False
-        
-        for i in range(1, len(last_5_days)):
-            prev_day = last_5_days.iloc[i-1]
-            curr_day = last_5_days.iloc[i]
-            
-            # Check for Golden Cross (MA50 crosses above MA200)
-            if prev_day['MA50'] <= prev_day['MA200'] and curr_day['MA50'] > curr_day['MA200']:
-                signals['Major Signal'] = 'Bullish: Recent Golden Cross (50-day MA crossed above 200-day MA)'
-                cross_detected = True
-                break
-            
-            # Check for Death Cross (MA50 crosses below MA200)
-            if prev_day['MA50'] >= prev_day['MA200'] and curr_day['MA50'] < curr_day['MA200']:
-                signals['Major Signal'] = 'Bearish: Recent Death Cross (50-day MA crossed below 200-day MA)'
-                cross_detected = True
-                break
-        
-        # Current relationship between MA50 and MA200
-        if not cross_detected:
+        # Check for recent crossing over the lookback window
+        golden, death = find_crossings(indicators.ma50[-lookback:], indicators.ma200[-lookback:])
+        cross = latest_event(golden, death, lookback)
+        
+        if cross > 0:
+            signals['Major Signal'] = 'Bullish: Recent Golden Cross (50-day MA crossed above 200-day MA)'
+        elif cross < 0:
+            signals['Major Signal'] = 'Bearish: Recent Death Cross (50-day MA crossed below 200-day MA)'
+        else:
+            # Current relationship between MA50 and MA200
             if ma50 > ma200:
                 signals['MA Relationship'] = 'Bullish: 50-day MA above 200-day MA'
             else:
@@ -158,38 +382,15 @@ class TechnicalAnalysis:
         pandas.DataFrame
             Dataframe with RSI values
         """
-        # Get historical data
-        data = self.get_historical_data(timeframe)
+        dates, indicators = self._get_indicators_with(timeframe, rsi_window=window)
         
-        if data.empty:
+        if len(indicators.close) == 0:
             return pd.DataFrame()
         
-        # Calculate daily price changes
-        delta = data['Close'].diff()
-        
-        # Separate gains and losses
-        gain = delta.copy()
-        loss = delta.copy()
-        gain[gain < 0] = 0
-        loss[loss > 0] = 0
-        loss = abs(loss)
-        
-        # Calculate average gain and loss over specified window
-        avg_gain = gain.rolling(window=window).mean()
-        avg_loss = loss.rolling(window=window).mean()
-        
-        # Calculate RS (Relative Strength)
-        rs = avg_gain / avg_loss
-        
-        # Calculate RSI
-        rsi = 100 - (100 / (1 + rs))
-        
-        # Create result dataframe
-        result = pd.DataFrame(index=data.index)
-        result['Close'] = data['Close']
-        result['RSI'] = rsi
-        
-        return result
+        return pd.DataFrame({
+            'Close': indicators.close,
+            'RSI': indicators.rsi
+        }, index=dates)
     
     def get_macd(self, timeframe='1y', fast=12, slow=26, signal=9):
         """
@@ -211,33 +412,17 @@ class TechnicalAnalysis:
         pandas.DataFrame
             Dataframe with MACD values
         """
-        # Get historical data
-        data = self.get_historical_data(timeframe)
+        dates, indicators = self._get_indicators_with(timeframe, macd_fast=fast, macd_slow=slow, macd_signal=signal)
         
-        if data.empty:
+        if len(indicators.close) == 0:
             return pd.DataFrame()
         
-        # Calculate EMAs
-        ema_fast = data['Close'].ewm(span=fast, adjust=False).mean()
-        ema_slow = data['Close'].ewm(span=slow, adjust=False).mean()
-        
-        # Calculate MACD line
-        macd_line = ema_fast - ema_slow
-        
-        # Calculate signal line
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-        
-        # Calculate histogram
-        histogram = macd_line - signal_line
-        
-        # Create result dataframe
-        result = pd.DataFrame(index=data.index)
-        result['Close'] = data['Close']
-        result['MACD'] = macd_line
-        result['Signal'] = signal_line
-        result['Histogram'] = histogram
-        
-        return result
+        return pd.DataFrame({
+            'Close': indicators.close,
+            'MACD': indicators.macd,
+            'Signal': indicators.signal,
+            'Histogram': indicators.histogram
+        }, index=dates)
     
     def interpret_macd(self):
         """
@@ -248,23 +433,20 @@ class TechnicalAnalysis:
         str
             MACD signal interpretation
         """
-        # Get MACD data
-        macd_data = self.get_macd('1y')
+        # Get indicator arrays
+        _, indicators = self.get_indicators('1y')
         
-        if macd_data.empty:
+        if len(indicators.close) == 0:
             return "Insufficient data for MACD analysis"
         
         # Get latest values
-        latest = macd_data.iloc[-1]
-        macd = latest['MACD']
-        signal = latest['Signal']
-        histogram = latest['Histogram']
+        macd = indicators.macd[-1]
+        signal = indicators.signal[-1]
+        histogram = indicators.histogram[-1]
         
         # Get previous values for trend
-        if len(macd_data) > 1:
-            prev = macd_data.iloc[-2]
-            prev_histogram = prev['Histogram']
-            histogram_trend = histogram - prev_histogram
+        if len(indicators.histogram) > 1:
+            histogram_trend = histogram - indicators.histogram[-2]
         else:
             histogram_trend = 0
         
@@ -304,72 +486,53 @@ class TechnicalAnalysis:
         pandas.DataFrame
             Dataframe with Bollinger Bands
         """
-        # Get historical data
-        data = self.get_historical_data(timeframe)
+        dates, indicators = self._get_indicators_with(timeframe, bb_window=window, bb_std=num_std)
         
-        if data.empty:
+        if len(indicators.close) == 0:
             return pd.DataFrame()
         
-        # Calculate middle band (SMA)
-        middle_band = data['Close'].rolling(window=window).mean()
-        
-        # Calculate standard deviation
-        std = data['Close'].rolling(window=window).std()
-        
-        # Calculate upper and lower bands
-        upper_band = middle_band + (std * num_std)
-        lower_band = middle_band - (std * num_std)
-        
-        # Create result dataframe
-        result = pd.DataFrame(index=data.index)
-        result['Close'] = data['Close']
-        result['Middle Band'] = middle_band
-        result['Upper Band'] = upper_band
-        result['Lower Band'] = lower_band
-        
-        return result
+        return pd.DataFrame({
+            'Close': indicators.close,
+            'Middle Band': indicators.bb_middle,
+            'Upper Band': indicators.bb_upper,
+            'Lower Band': indicators.bb_lower
+        }, index=dates)
     
-    def interpret_bollinger_bands(self):
+    def interpret_bollinger_bands(self, lookback=SIGNAL_LOOKBACK):
         """
         Interpret Bollinger Bands signals
         
+        Parameters:
+        -----------
+        lookback : int
+            Number of most recent days searched for a band breakout
+        
         Returns:
         --------
         str
             Bollinger Bands signal interpretation
         """
-        # Get Bollinger Bands data
-        bb_data = self.get_bollinger_bands('1y')
+        # Get indicator arrays
+        _, indicators = self.get_indicators('1y')
         
-        if bb_data.empty:
+        if len(indicators.close) == 0:
             return "Insufficient data for Bollinger Bands analysis"
         
         # Get latest values
-        latest = bb_data.iloc[-1]
-        close = latest['Close']
-        middle = latest['Middle Band']
-        upper = latest['Upper Band']
-        lower = latest['Lower Band']
-        
-        # Calculate bandwidth and %B
-        bandwidth = (upper - lower) / middle
+        close = indicators.close[-1]
+        middle = indicators.bb_middle[-1]
+        upper = indicators.bb_upper[-1]
+        lower = indicators.bb_lower[-1]
+        
+        # Calculate %B
         percent_b = (close - lower) / (upper - lower) if (upper - lower) != 0 else 0.5
         
-        # Look at recent data for breakouts
-        last_5_days = bb_data.tail(5)
-        breakout_detected = False
-        
-        for i in range(1, len(last_5_days)):
-            prev_day = last_5_days.iloc[i-1]
-            curr_day = last_5_days.iloc[i]
-            
-            # Upper band breakout
-            if prev_day['Close'] <= prev_day['Upper Band'] and curr_day['Close'] > curr_day['Upper Band']:
-                return "Bullish: Price breaking out above upper Bollinger Band"
-            
-            # Lower band breakout
-            if prev_day['Close'] >= prev_day['Lower Band'] and curr_day['Close'] < curr_day['Lower Band']:
-                return "Bearish: Price breaking down below lower Bollinger Band"
+        # Look at the lookback window for breakouts
+        breakout = latest_event(*_band_breakouts(indicators, lookback), lookback)
+        if breakout > 0:
+            return "Bullish: Price breaking out above upper Bollinger Band"
+        if breakout < 0:
+            return "Bearish: Price breaking down below lower Bollinger Band"
         
         # Interpret current position
         if close > upper:
@@ -383,6 +546,47 @@ class TechnicalAnalysis:
         else:
             return "Neutral: Price within normal Bollinger Band range"
     
+    def get_signal_history(self, timeframe='max', lookback=SIGNAL_LOOKBACK):
+        """
+        Get cross and breakout signals for every day of a history
+        
+        Each day carries the signal interpret_moving_averages and
+        interpret_bollinger_bands would have reported on that day, which makes
+        historical signal studies a single vectorized pass.
+        
+        Parameters:
+        -----------
+        timeframe : str
+            Time period for historical data
+        lookback : int
+            Number of days searched back from each day
+        
+        Returns:
+        --------
+        pandas.DataFrame
+            'Close', 'MA Cross' (1 = golden cross, -1 = death cross, 0 = none) and
+            'Band Breakout' (1 = above upper band, -1 = below lower band, 0 = none)
+        """
+        dates, indicators = self.get_indicators(timeframe)
+        
+        if len(indicators.close) == 0:
+            return pd.DataFrame()
+        
+        golden, death = find_crossings(indicators.ma50, indicators.ma200)
+        
+        return pd.DataFrame({
+            'Close': indicators.close,
+            'MA Cross': recent_event_history(golden, death, lookback),
+            'Band Breakout': recent_event_history(*_band_breakouts(indicators), lookback)
+        }, index=dates)
+    
+    def _get_indicators_with(self, timeframe, **params):
+        """Kernel results for non-default parameters, sharing the default run when possible"""
+        defaults = {'rsi_window': 14, 'macd_fast': 12, 'macd_slow': 26, 'macd_signal': 9, 'bb_window': 20, 'bb_std': 2}
+        custom = {name: value for name, value in params.items() if defaults[name] != value}
+        return self.get_indicators(timeframe, **custom)
+    
+    @span('compute.technical_signals')
     def get_technical_signals(self):
         """
         Get a comprehensive set of technical signals
@@ -400,9 +604,9 @@ class TechnicalAnalysis:
             signals[key] = value
         
         # RSI
-        rsi_data = self.get_rsi()
-        if not rsi_data.empty:
-            rsi_value = rsi_data['RSI'].iloc[-1]
+        _, indicators = self.get_indicators('1y')
+        if len(indicators.rsi) > 0:
+            rsi_value = indicators.rsi[-1]
             if rsi_value > 70:
                 signals['RSI'] = f"Bearish: Overbought (RSI = {rsi_value:.2f})"
             elif rsi_value < 30:
@@ -419,3 +623,184 @@ class TechnicalAnalysis:
         signals['Bollinger Bands'] = self.interpret_bollinger_bands()
         
         return signals
+    
+    @staticmethod
+    @span('compute.panel_signals')
+    def get_panel_signals(close_panel, lookback=SIGNAL_LOOKBACK):
+        """
+        Compute the latest technical signals for many tickers in one vectorized pass
+        
+        Parameters:
+        -----------
+        close_panel : pandas.DataFrame
+            Closing prices with dates as rows and tickers as columns. Missing
+            values (e.g., before a listing date) are allowed.
+        lookback : int
+            Number of most recent days searched for crosses and band breakouts
+        
+        Returns:
+        --------
+        pandas.DataFrame
+            One row per ticker with the PANEL_SIGNAL_COLUMNS; a cell is NaN where
+            get_technical_signals would not produce that key. Use
+            panel_signals_for(result, ticker) to get the same dict as the
+            per-ticker path.
+        """
+        values = close_panel.to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        valid_count = valid.sum(axis=0)
+        
+        # Move each ticker's missing values to the top so every column ends with
+        # its own most recent bars, exactly like a per-ticker history
+        order = np.argsort(valid, axis=0, kind='stable')
+        closes = pd.DataFrame(np.take_along_axis(values, order, axis=0), columns=close_panel.columns)
+        
+        # Column-wise indicators
+        ma20 = closes.rolling(window=20).mean()
+        ma50 = closes.rolling(window=50).mean()
+        ma200 = closes.rolling(window=200).mean()
+        
+        delta = closes.diff()
+        avg_gain = delta.clip(lower=0).rolling(window=14).mean()
+        avg_loss = (-delta).clip(lower=0).rolling(window=14).mean()
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        
+        macd = closes.ewm(span=12, adjust=False).mean() - closes.ewm(span=26, adjust=False).mean()
+        macd_signal = macd.ewm(span=9, adjust=False).mean()
+        histogram = (macd - macd_signal).to_numpy()
+        
+        band_width = closes.rolling(window=20).std() * 2
+        upper = (ma20 + band_width).to_numpy()
+        lower = (ma20 - band_width).to_numpy()
+        
+        close = closes.to_numpy()
+        ma20, ma50, ma200 = ma20.to_numpy(), ma50.to_numpy(), ma200.to_numpy()
+        rsi = rsi.to_numpy()
+        macd, macd_signal = macd.to_numpy(), macd_signal.to_numpy()
+        
+        tickers = close_panel.columns
+        result = pd.DataFrame(np.nan, index=tickers, columns=PANEL_SIGNAL_COLUMNS, dtype=object)
+        has_data = valid_count > 0
+        
+        # === Moving averages ===
+        enough_history = valid_count >= 200
+        latest_close = close[-1]
+        result['Insufficient Data'] = np.where(enough_history, None, 'Not enough historical data for moving average analysis')
+        result['Short-term Trend'] = np.where(latest_close > ma20[-1], 'Bullish: Price above 20-day MA', 'Bearish: Price below 20-day MA')
+        result['Medium-term Trend'] = np.where(latest_close > ma50[-1], 'Bullish: Price above 50-day MA', 'Bearish: Price below 50-day MA')
+        result['Long-term Trend'] = np.where(latest_close > ma200[-1], 'Bullish: Price above 200-day MA', 'Bearish: Price below 200-day MA')
+        
+        # Golden / death cross within the lookback window
+        cross = latest_event(*find_crossings(ma50[-lookback:], ma200[-lookback:]), lookback)
+        cross_detected = cross != 0
+        result['Major Signal'] = np.select(
+            [cross > 0, cross < 0],
+            [
+                'Bullish: Recent Golden Cross (50-day MA crossed above 200-day MA)',
+                'Bearish: Recent Death Cross (50-day MA crossed below 200-day MA)',
+            ],
+            default=None
+        )
+        result['MA Relationship'] = np.where(
+            cross_detected, None,
+            np.where(ma50[-1] > ma200[-1], 'Bullish: 50-day MA above 200-day MA', 'Bearish: 50-day MA below 200-day MA')
+        )
+        for column in ['Short-term Trend', 'Medium-term Trend', 'Long-term Trend', 'Major Signal', 'MA Relationship']:
+            result.loc[~enough_history, column] = None
+        
+        # === RSI ===
+        rsi_value = rsi[-1]
+        rsi_label = np.select(
+            [rsi_value > 70, rsi_value < 30, rsi_value > 50],
+            ['Bearish: Overbought', 'Bullish: Oversold', 'Neutral-Bullish'],
+            default='Neutral-Bearish'
+        )
+        result['RSI'] = [
+            f"{label} (RSI = {value:.2f})" if present else None
+            for label, value, present in zip(rsi_label, rsi_value.tolist(), has_data)
+        ]
+        
+        # === MACD ===
+        latest_macd, latest_signal, latest_histogram = macd[-1], macd_signal[-1], histogram[-1]
+        if len(histogram) > 1:
+            histogram_trend = np.where(valid_count > 1, latest_histogram - histogram[-2], 0)
+        else:
+            histogram_trend = np.zeros(len(tickers))
+        result['MACD'] = np.select(
+            [
+                ~has_data,
+                (latest_macd > latest_signal) & (latest_histogram > 0) & (histogram_trend > 0),
+                (latest_macd > latest_signal) & (latest_histogram > 0),
+                (latest_macd < latest_signal) & (latest_histogram < 0) & (histogram_trend < 0),
+                (latest_macd < latest_signal) & (latest_histogram < 0),
+                (latest_macd > latest_signal) & (histogram_trend > 0),
+                (latest_macd < latest_signal) & (histogram_trend < 0),
+            ],
+            [
+                "Insufficient data for MACD analysis",
+                "Bullish: MACD above signal line with increasing momentum",
+                "Bullish: MACD above signal line but momentum may be slowing",
+                "Bearish: MACD below signal line with increasing downward momentum",
+                "Bearish: MACD below signal line but downward momentum may be slowing",
+                "Bullish: MACD just crossed above signal line (bullish crossover)",
+                "Bearish: MACD just crossed below signal line (bearish crossover)",
+            ],
+            default="Neutral: No clear MACD signal at the moment"
+        )
+        
+        # === Bollinger Bands ===
+        latest_upper, latest_lower, latest_middle = upper[-1], lower[-1], ma20[-1]
+        band_range = latest_upper - latest_lower
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percent_b = np.where(band_range != 0, (latest_close - latest_lower) / band_range, 0.5)
+        
+        upper_breakout, _ = find_crossings(close[-lookback:], upper[-lookback:])
+        _, lower_breakout = find_crossings(close[-lookback:], lower[-lookback:])
+        breakout = latest_event(upper_breakout, lower_breakout, lookback)
+        
+        result['Bollinger Bands'] = np.select(
+            [
+                ~has_data,
+                breakout > 0,
+                breakout < 0,
+                latest_close > latest_upper,
+                latest_close < latest_lower,
+                (latest_close > latest_middle) & (percent_b > 0.8),
+                (latest_close < latest_middle) & (percent_b < 0.2),
+            ],
+            [
+                "Insufficient data for Bollinger Bands analysis",
+                "Bullish: Price breaking out above upper Bollinger Band",
+                "Bearish: Price breaking down below lower Bollinger Band",
+                "Overbought: Price above upper Bollinger Band",
+                "Oversold: Price below lower Bollinger Band",
+                "Bullish: Price in upper Bollinger Band range",
+                "Bearish: Price in lower Bollinger Band range",
+            ],
+            default="Neutral: Price within normal Bollinger Band range"
+        )
+        
+        return result
+
+def panel_signals_for(panel_signals, ticker):
+    """
+    Get one ticker's signals from get_panel_signals as a get_technical_signals dict
+    
+    Parameters:
+    -----------
+    panel_signals : pandas.DataFrame
+        Result of TechnicalAnalysis.get_panel_signals
+    ticker : str
+        Ticker symbol
+    
+    Returns:
+    --------
+    dict or None
+        Signal name to interpretation, or None if the ticker is not in the panel
+    """
+    if panel_signals is None or ticker not in panel_signals.index:
+        return None
+    row = panel_signals.loc[ticker]
+    if isinstance(row, pd.DataFrame):  # duplicated ticker column
+        row = row.iloc[0]
+    return {name: value for name, value in row.items() if isinstance(value, str)}
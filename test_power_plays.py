@@ -0,0 +1,53 @@
+"""
+An incremental scan must skip tickers whose scoring inputs have not changed
+Run with: python -m pytest test_power_plays.py
+"""
+import numpy as np
+import pandas as pd
+import power_plays
+from scan_store import ScanStore
+
+TICKERS = ["AAA", "BBB", "CCC"]
+
+def history_panel(tickers):
+    """One year of random-walk OHLCV bars per ticker, as from download_history_panel"""
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range('2025-01-01', periods=252)
+    frames = {}
+    for ticker in tickers:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+        frames[ticker] = pd.DataFrame({
+            'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close, 'Volume': 1000000
+        }, index=dates)
+    return pd.concat(frames, axis=1)
+
+def test_unchanged_tickers_are_skipped_on_rescan(monkeypatch, tmp_path):
+    infos = {
+        "AAA": {'shortName': "Alpha", 'trailingPE': 8.0, 'forwardPE': 20.0, 'recommendationMean': 1.5},
+        "BBB": {'shortName': "Beta", 'trailingPE': 30.0, 'forwardPE': 20.0, 'recommendationMean': 3.0},
+        "CCC": {'shortName': "Gamma", 'trailingPE': 40.0, 'forwardPE': 20.0, 'recommendationMean': 4.0},
+    }
+    analyzed = []
+    analyze_ticker = power_plays.analyze_ticker
+
+    def counting_analyze_ticker(ticker, **kwargs):
+        analyzed.append(ticker)
+        return analyze_ticker(ticker, **kwargs)
+
+    monkeypatch.setattr(power_plays, 'get_authentic_index_tickers', lambda index_name: TICKERS)
+    monkeypatch.setattr(power_plays, 'download_history_panel', lambda tickers, period: history_panel(tickers))
+    monkeypatch.setattr(power_plays, 'get_company_info', lambda ticker: dict(infos[ticker]))
+    monkeypatch.setattr(power_plays, 'analyze_ticker', counting_analyze_ticker)
+    store = ScanStore(str(tmp_path / "scans.sqlite3"))
+
+    first = power_plays.scan_index("Test", max_stocks=1, scan_mode='thread', store=store)
+    assert sorted(analyzed) == TICKERS
+    assert [stock['ticker'] for stock in first] == ["AAA"]
+
+    # Only CCC's inputs change; the stored winner is analyzed again for display
+    analyzed.clear()
+    infos["CCC"]['trailingPE'] = 12.0
+    second = power_plays.scan_index("Test", max_stocks=1, scan_mode='thread', store=store)
+    assert sorted(analyzed) == ["AAA", "CCC"]
+    assert [stock['ticker'] for stock in second] == ["AAA"]
+    assert second[0]['buy_rating'] == first[0]['buy_rating']
@@ -0,0 +1,84 @@
+"""
+The batch scorer must rate every ticker exactly as StockAnalyzer.calculate_buy_rating does
+Run with: python -m pytest test_scoring.py
+"""
+import random
+import pandas as pd
+from market_data import MarketDataProvider
+from stock_analyzer import StockAnalyzer
+from scoring import SCORING_FIELDS, scoring_inputs, score_universe, rescore_inputs
+
+# Values around every bucket boundary of the fundamental and sentiment ladders
+FIELD_VALUES = {
+    'trailingPE': [-5.0, 0.0, 6.9, 7.0, 9.9, 10.0, 12.9, 13.0, 14.0, 25.0, 80.0],
+    'forwardPE': [5.0, 10.0, 20.0, 30.0],
+    'profitMargins': [-0.1, 0.0, 0.03, 0.05, 0.1, 0.15, 0.2, 0.35],
+    'revenueGrowth': [-0.2, 0.0, 0.05, 0.1, 0.15, 0.25, 0.4],
+    'debtToEquity': [0.0, 49.9, 50.0, 99.0, 100.0, 150.0, 199.0, 200.0, 400.0],
+    'recommendationMean': [1.0, 1.5, 1.6, 2.5, 3.0, 3.5, 4.5, 4.6, 5.0],
+}
+
+SIGNAL_TEXTS = ["Bullish crossover", "Bearish divergence", "Neutral"]
+
+# Ways Yahoo reports a field without a usable value
+MISSING_VALUES = [None, float('nan')]
+
+def random_ticker_state(rng):
+    """Company info with some fields missing or empty, plus a set of technical signals"""
+    info = {}
+    for field, values in FIELD_VALUES.items():
+        draw = rng.random()
+        if draw < 0.7:
+            info[field] = rng.choice(values)
+        elif draw < 0.85:
+            info[field] = rng.choice(MISSING_VALUES)
+    signals = {f"Signal {i}": rng.choice(SIGNAL_TEXTS) for i in range(rng.randint(0, 6))}
+    return info, signals
+
+def analyzer_for(info):
+    """StockAnalyzer seeded with the given info and a short history, so nothing is fetched"""
+    provider = MarketDataProvider("TEST")
+    provider.seed_info(info)
+    provider.seed_history('1y', pd.DataFrame(
+        {'Open': 1.0, 'High': 1.0, 'Low': 1.0, 'Close': 1.0, 'Volume': 1},
+        index=pd.bdate_range('2025-01-01', periods=5)
+    ))
+    return StockAnalyzer("TEST", provider=provider)
+
+def test_score_universe_matches_calculate_buy_rating():
+    rng = random.Random(0)
+    states = [random_ticker_state(rng) for _ in range(500)]
+
+    frame = pd.DataFrame([scoring_inputs(info, signals) for info, signals in states])
+    scores = score_universe(frame)
+
+    for row, (info, signals) in zip(scores.itertuples(), states):
+        buy_rating, breakdown = analyzer_for(info).calculate_buy_rating(signals)
+        assert row.buy_rating == buy_rating
+        assert row.technical_score == breakdown['Technical Analysis']['score']
+        assert row.technical_reason == breakdown['Technical Analysis']['reason']
+        assert row.fundamental_score == breakdown['Fundamental Analysis']['score']
+        assert row.fundamental_reason == breakdown['Fundamental Analysis']['reason']
+        assert row.sentiment_score == breakdown['Market Sentiment']['score']
+        assert row.sentiment_reason == breakdown['Market Sentiment']['reason']
+
+def test_empty_forward_pe_defaults_to_twenty():
+    signals = {'RSI': "Bullish"}
+    expected, _ = analyzer_for({'trailingPE': 15.0}).calculate_buy_rating(signals)
+
+    for forward_pe in MISSING_VALUES:
+        info = {'trailingPE': 15.0, 'forwardPE': forward_pe}
+        buy_rating, _ = analyzer_for(info).calculate_buy_rating(signals)
+        frame = pd.DataFrame([scoring_inputs(info, signals)])
+        assert buy_rating == expected
+        assert score_universe(frame)['buy_rating'].iloc[0] == expected
+
+def test_rescore_inputs_reads_stored_rows():
+    info = {'trailingPE': 10.0, 'forwardPE': 20.0, 'recommendationMean': 2.0}
+    signals = {'RSI': "Bullish", 'MACD': "Bearish"}
+    buy_rating, _ = analyzer_for(info).calculate_buy_rating(signals)
+
+    # Stored rows come back from JSON with every field present, missing ones as None
+    row = scoring_inputs(info, signals)
+    assert set(SCORING_FIELDS) <= set(row)
+    assert rescore_inputs({'TEST': row}) == {'TEST': buy_rating}
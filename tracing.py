@@ -0,0 +1,395 @@
+"""
+Lightweight tracing for the fetch, compute and render hot paths
+Spans nest through a context variable into one timing tree per request, exportable as JSON or OpenTelemetry (OTLP/JSON)
+"""
+import os
+import json
+import time
+import secrets
+import threading
+import contextvars
+from functools import wraps
+from contextlib import contextmanager
+
+# Set TICKER_AI_TRACING=0 to turn every span into a no-op
+TRACING_ENABLED = os.environ.get("TICKER_AI_TRACING", "1") != "0"
+
+# Finished traces are appended to this JSON-lines file so other processes
+# (e.g., the admin app) can read them; an empty string keeps them in memory only
+TRACE_LOG_PATH = os.environ.get("TICKER_AI_TRACE_LOG", os.path.join(".cache", "traces.jsonl"))
+
+# The log is rotated to <path>.1 once it grows past this many bytes
+TRACE_LOG_MAX_BYTES = int(os.environ.get("TICKER_AI_TRACE_LOG_MAX_BYTES", str(5 * 2 ** 20)))
+
+# Number of finished traces kept in memory
+TRACE_HISTORY = int(os.environ.get("TICKER_AI_TRACE_HISTORY", "50"))
+
+# Spans recorded per trace; a scan of a large index stays bounded, later spans are only counted
+MAX_SPANS_PER_TRACE = int(os.environ.get("TICKER_AI_TRACE_MAX_SPANS", "5000"))
+
+# Service name reported in OpenTelemetry exports
+SERVICE_NAME = "ticker-ai"
+
+_current_span = contextvars.ContextVar("ticker_ai_span", default=None)
+
+class Span:
+    """One timed step; the root span of a request also holds its trace-wide bookkeeping"""
+
+    __slots__ = ('name', 'attributes', 'trace_id', 'span_id', 'parent', 'root', 'children',
+                 'start_time', 'duration', 'error', '_started', 'span_count', 'dropped_spans')
+
+    def __init__(self, name, attributes=None, parent=None):
+        self.name = name
+        self.attributes = attributes or {}
+        self.parent = parent
+        self.root = parent.root if parent is not None else self
+        self.trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.children = []
+        self.start_time = time.time()
+        self.duration = None
+        self.error = None
+        self._started = time.perf_counter()
+        self.span_count = 1
+        self.dropped_spans = 0
+
+    def set_attribute(self, key, value):
+        """Attach a value (e.g., a ticker or row count) to the span"""
+        self.attributes[key] = value
+
+    def to_dict(self):
+        """Nested dictionary of the span and its children"""
+        data = {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'start_time': self.start_time,
+            'duration_ms': None if self.duration is None else self.duration * 1000,
+            'attributes': self.attributes,
+            'children': [child.to_dict() for child in list(self.children)],
+        }
+        if self.error is not None:
+            data['error'] = self.error
+        if self.root is self and self.dropped_spans:
+            data['dropped_spans'] = self.dropped_spans
+        return data
+
+class _NoopSpan:
+    """Stand-in yielded when tracing is off or no trace is active"""
+
+    def set_attribute(self, key, value):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+@contextmanager
+def _run_span(span_object):
+    """Make a span current for the duration of a with-block and time it"""
+    token = _current_span.set(span_object)
+    try:
+        yield span_object
+    except Exception as e:
+        # Streamlit's rerun and stop signals derive from BaseException and are not errors
+        span_object.error = f"{type(e).__name__}: {str(e)}"
+        raise
+    finally:
+        span_object.duration = time.perf_counter() - span_object._started
+        _current_span.reset(token)
+        if span_object.root is span_object:
+            TRACE_RECORDER.record(span_object)
+
+@contextmanager
+def trace(name, **attributes):
+    """
+    Start a trace for one request (a page run, a scan), or a child span if a trace is already active
+
+    Parameters:
+    -----------
+    name : str
+        Name of the request or step
+    **attributes
+        Values attached to the span
+
+    Yields:
+    -------
+    Span
+    """
+    if not TRACING_ENABLED:
+        yield _NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    if parent is not None:
+        with span(name, **attributes) as child:
+            yield child
+        return
+
+    with _run_span(Span(name, attributes)) as root:
+        yield root
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Time one step as a child of the current span; a no-op outside a trace
+
+    Parameters:
+    -----------
+    name : str
+        Step name, dotted by kind (e.g., 'fetch.info', 'compute.indicators', 'render.chart')
+    **attributes
+        Values attached to the span
+
+    Yields:
+    -------
+    Span
+    """
+    parent = _current_span.get() if TRACING_ENABLED else None
+    if parent is None:
+        yield _NOOP_SPAN
+        return
+
+    child = Span(name, attributes, parent)
+    root = child.root
+    if root.span_count < MAX_SPANS_PER_TRACE:
+        root.span_count += 1
+        parent.children.append(child)
+    else:
+        # Still timed and still the parent of nested spans, just not kept in the tree
+        root.dropped_spans += 1
+
+    with _run_span(child) as current:
+        yield current
+
+def current_span():
+    """The active span, or None outside a trace"""
+    return _current_span.get()
+
+def propagate(function):
+    """
+    Bind a function to the caller's trace context, for running it on a worker thread
+
+    Threads do not inherit context variables, so work submitted to an executor
+    would otherwise start outside the trace. Wrap each submission separately.
+    """
+    if not TRACING_ENABLED or _current_span.get() is None:
+        return function
+    context = contextvars.copy_context()
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        return context.run(function, *args, **kwargs)
+    return wrapper
+
+class TraceRecorder:
+    """Keeps recent finished traces in memory and appends them to the trace log"""
+
+    def __init__(self, path=TRACE_LOG_PATH, history=TRACE_HISTORY, max_bytes=TRACE_LOG_MAX_BYTES):
+        self.path = path
+        self.history = history
+        self.max_bytes = max_bytes
+
+        self._traces = []
+        self._lock = threading.Lock()
+
+    def record(self, root):
+        """Store a finished trace"""
+        data = root.to_dict()
+        with self._lock:
+            self._traces.append(data)
+            del self._traces[:-self.history]
+
+            if not self.path:
+                return
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                if os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                    os.replace(self.path, self.path + ".1")
+                with open(self.path, 'a') as f:
+                    f.write(json.dumps(data, default=str) + "\n")
+            except Exception as e:
+                print(f"Error writing trace log: {str(e)}")
+
+    def recent(self, limit=None, include_log=True):
+        """
+        Finished traces, newest first
+
+        Parameters:
+        -----------
+        limit : int, optional
+            Maximum number of traces; defaults to the in-memory history size
+        include_log : bool
+            Read the trace log, which includes traces from other processes
+
+        Returns:
+        --------
+        list
+            Trace dictionaries as produced by Span.to_dict
+        """
+        limit = limit or self.history
+        if include_log and self.path and os.path.exists(self.path):
+            try:
+                return read_trace_log(self.path, limit)
+            except Exception as e:
+                print(f"Error reading trace log: {str(e)}")
+
+        with self._lock:
+            return list(reversed(self._traces[-limit:]))
+
+def read_trace_log(path, limit):
+    """Last `limit` traces from a JSON-lines trace log, newest first"""
+    with open(path, 'rb') as f:
+        # Read from the end so a large log is not parsed in full
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        block = min(size, 256 * 1024)
+        lines = []
+        while True:
+            f.seek(size - block)
+            lines = f.read(block).splitlines()
+            if block == size or len(lines) > limit:
+                break
+            block = min(size, block * 4)
+
+    if block < size:
+        # The first line may be cut off
+        lines = lines[1:]
+
+    traces = []
+    for line in reversed(lines):
+        if not line.strip():
+            continue
+        try:
+            traces.append(json.loads(line))
+        except ValueError:
+            continue
+        if len(traces) >= limit:
+            break
+    return traces
+
+# Process-wide recorder
+TRACE_RECORDER = TraceRecorder()
+
+def aggregate(trace_dict):
+    """
+    Merge sibling spans with the same name into one timing tree node
+
+    A scan runs the same steps once per ticker; merging them shows where the
+    time goes overall instead of listing hundreds of identical spans.
+
+    Parameters:
+    -----------
+    trace_dict : dict
+        Trace as produced by Span.to_dict
+
+    Returns:
+    --------
+    dict
+        Node with 'name', 'count', 'total_ms', 'max_ms', 'self_ms' and 'children'
+    """
+    def merge(spans):
+        nodes = {}
+        for item in spans:
+            node = nodes.setdefault(item['name'], {
+                'name': item['name'], 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'errors': 0, '_children': []
+            })
+            duration = item.get('duration_ms') or 0.0
+            node['count'] += 1
+            node['total_ms'] += duration
+            node['max_ms'] = max(node['max_ms'], duration)
+            node['errors'] += 1 if item.get('error') else 0
+            node['_children'].extend(item.get('children', []))
+
+        merged = []
+        for node in nodes.values():
+            node['children'] = merge(node.pop('_children'))
+            child_total = sum(child['total_ms'] for child in node['children'])
+            # Children running on worker threads can add up to more than their parent
+            node['self_ms'] = max(0.0, node['total_ms'] - child_total)
+            merged.append(node)
+        return sorted(merged, key=lambda node: -node['total_ms'])
+
+    return merge([trace_dict])[0]
+
+def timing_rows(trace_dict):
+    """
+    Flatten the aggregated timing tree into indented table rows
+
+    Returns:
+    --------
+    list
+        Dictionaries with 'Step', 'Calls', 'Total (ms)', 'Self (ms)' and 'Max (ms)'
+    """
+    rows = []
+
+    def walk(node, depth):
+        rows.append({
+            'Step': "\u2003" * depth + node['name'],  # em spaces survive table rendering
+            'Calls': node['count'],
+            'Total (ms)': round(node['total_ms'], 1),
+            'Self (ms)': round(node['self_ms'], 1),
+            'Max (ms)': round(node['max_ms'], 1),
+            'Errors': node['errors'],
+        })
+        for child in node['children']:
+            walk(child, depth + 1)
+
+    walk(aggregate(trace_dict), 0)
+    return rows
+
+def to_otlp(trace_dict):
+    """
+    Convert a trace to the OpenTelemetry OTLP/JSON format
+
+    The result can be posted to an OTLP/HTTP collector's /v1/traces endpoint
+    or loaded by any tool that reads OTLP JSON.
+
+    Parameters:
+    -----------
+    trace_dict : dict
+        Trace as produced by Span.to_dict
+
+    Returns:
+    --------
+    dict
+        ExportTraceServiceRequest with one resource and scope
+    """
+    spans = []
+
+    def attribute(key, value):
+        if isinstance(value, bool):
+            return {'key': key, 'value': {'boolValue': value}}
+        if isinstance(value, int):
+            return {'key': key, 'value': {'intValue': str(value)}}
+        if isinstance(value, float):
+            return {'key': key, 'value': {'doubleValue': value}}
+        return {'key': key, 'value': {'stringValue': str(value)}}
+
+    def walk(item, parent_id):
+        start = int(item['start_time'] * 1e9)
+        end = start + int((item.get('duration_ms') or 0) * 1e6)
+        otlp_span = {
+            'traceId': item['trace_id'],
+            'spanId': item['span_id'],
+            'name': item['name'],
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(start),
+            'endTimeUnixNano': str(end),
+            'attributes': [attribute(key, value) for key, value in item.get('attributes', {}).items()],
+            'status': {'code': 2, 'message': item['error']} if item.get('error') else {'code': 1},
+        }
+        if parent_id:
+            otlp_span['parentSpanId'] = parent_id
+        spans.append(otlp_span)
+        for child in item.get('children', []):
+            walk(child, item['span_id'])
+
+    walk(trace_dict, None)
+
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': [attribute('service.name', SERVICE_NAME)]},
+            'scopeSpans': [{'scope': {'name': 'ticker_ai.tracing'}, 'spans': spans}],
+        }]
+    }
@@ -1,9 +1,11 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import requests
 from bs4 import BeautifulSoup
+from info_cache import get_company_info
+from request_governor import get_governor
+from data_backend import get_backend
 
 def format_large_number(number):
     """
@@ -65,7 +67,7 @@ def get_earnings_calendar(ticker):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_governor('wallstreethorizon').get(url, endpoint='earnings_calendar', headers=headers, timeout=10)
         if response.status_code == 200:
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -119,10 +121,8 @@ def get_previous_earnings(ticker):
         List of previous earnings results
     """
     try:
-        stock = yf.Ticker(ticker)
-        
         # Get quarterly earnings data
-        quarterly_earnings = stock.quarterly_earnings
+        quarterly_earnings = get_backend().statement(ticker, 'quarterly_earnings')
         
         if quarterly_earnings is not None and not quarterly_earnings.empty:
             # Get the last 2 quarters
@@ -186,11 +186,10 @@ def get_stock_news(ticker, num_articles=5):
     """
     try:
         # Get news from Yahoo Finance
-        stock = yf.Ticker(ticker)
-        yahoo_news = stock.news
+        yahoo_news = get_backend().news(ticker)
         
         # Get company info for filtering
-        info = stock.info
+        info = get_company_info(ticker)
         company_name = info.get('longName', ticker).lower()
         
         # Format the news data with relevance filtering